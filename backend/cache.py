@@ -0,0 +1,305 @@
+"""
+결과 ZIP 캐시 (콘텐츠 주소 기반)
+- 키: 입력 ZIP, 업로드한 모든 파일, 출력에 영향을 주는 모든 파라미터의 해시
+- 디스크에 rebuilt_project.zip 저장, 바이트 예산을 넘으면 가장 오래 사용하지 않은 항목부터 삭제 (LRU)
+- 여러 서버 프로세스가 같은 디렉토리를 공유해도 안전 (원자적 rename + 파일 잠금)
+- 아이콘 렌디션 캐시도 같은 구현을 사용 (항목 확장자/예산만 다름)
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Mapping, Optional, Tuple
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:  # Windows: 프로세스 간 잠금 없이 동작 (단일 프로세스 전제)
+    FCNTL_AVAILABLE = False
+
+
+# 캐시 형식 버전 (파이프라인 출력이 바뀌면 올려서 기존 항목 무효화)
+CACHE_VERSION = 1
+
+# 결과에 영향을 주는 파라미터 (실행 모드/워커 수는 출력과 무관하므로 제외)
+CACHE_PARAM_KEYS = (
+    'new_package', 'new_app_name', 'new_base_url', 'include_log', 'zip_passthrough', 'icon_format'
+)
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    'RESULT_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'android_rebuild_cache')
+)
+# 캐시 바이트 예산 (0이면 캐시 비활성화)
+DEFAULT_CACHE_MAX_BYTES = int(os.environ.get('RESULT_CACHE_MAX_BYTES', str(1024 * 1024 * 1024)))
+
+ENTRY_SUFFIX = '.zip'
+LOCK_FILENAME = '.lock'
+
+
+def make_cache_key(upload_hashes: Mapping[str, str], params: Mapping) -> str:
+    """
+    캐시 키 계산
+
+    Args:
+        upload_hashes: 업로드 필드명 -> SHA-256 (프로젝트 ZIP 및 선택 파일)
+        params: 작업 파라미터 (CACHE_PARAM_KEYS만 사용)
+
+    Returns:
+        SHA-256 hex 문자열
+    """
+    material = {
+        'version': CACHE_VERSION,
+        'uploads': dict(sorted(upload_hashes.items())),
+        'params': {key: params.get(key) for key in CACHE_PARAM_KEYS},
+    }
+    encoded = json.dumps(material, sort_keys=True, ensure_ascii=False).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def _link_or_copy(source: str, dest: Path) -> None:
+    try:
+        os.link(source, dest)
+    except OSError:
+        shutil.copyfile(source, dest)
+
+
+class ResultCache:
+    """
+    디스크 기반 결과 ZIP 캐시
+
+    항목 파일의 mtime을 마지막 사용 시각으로 사용하며, 조회 시 갱신합니다.
+
+    Args:
+        cache_dir: 캐시 디렉토리 (여러 프로세스가 공유 가능)
+        max_bytes: 바이트 예산 (0 이하면 비활성화)
+        suffix: 항목 파일 확장자 (빈 문자열이면 확장자 없음)
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = DEFAULT_CACHE_DIR,
+        max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+        suffix: str = ENTRY_SUFFIX
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self._counter_lock = threading.Lock()
+        # 디렉토리 크기 추정치 (마지막 정리 때 스캔한 합계 + 이후 이 프로세스가 저장한 크기, None이면 아직 스캔 전)
+        self._bytes: Optional[int] = None
+        if self.enabled:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def entry_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}{self.suffix}"
+
+    def fetch(self, key: str, dest: str) -> bool:
+        """
+        캐시 항목을 dest로 가져오기 (하드 링크, 불가능하면 복사)
+
+        가져온 파일은 이후 항목이 제거되어도 유지됩니다.
+
+        Returns:
+            적중 여부
+        """
+        if not self.enabled:
+            return False
+
+        entry = self.entry_path(key)
+        with self._locked(exclusive=False):
+            try:
+                try:
+                    os.link(entry, dest)
+                except OSError:
+                    if not entry.exists():
+                        raise FileNotFoundError(entry)
+                    shutil.copyfile(entry, dest)
+                os.utime(entry)  # LRU 갱신
+                hit = True
+            except OSError:
+                hit = False
+
+        with self._counter_lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return hit
+
+    def read(self, key: str) -> Optional[bytes]:
+        """
+        캐시 항목 내용 읽기 (작은 항목용)
+
+        Returns:
+            항목 바이트 (없으면 None)
+        """
+        if not self.enabled:
+            return None
+
+        entry = self.entry_path(key)
+        with self._locked(exclusive=False):
+            try:
+                data = entry.read_bytes()
+                os.utime(entry)  # LRU 갱신
+            except OSError:
+                data = None
+
+        with self._counter_lock:
+            if data is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return data
+
+    def store(self, key: str, source: str) -> bool:
+        """
+        결과 ZIP을 캐시에 저장하고 예산을 넘으면 LRU 항목 삭제
+
+        결과 ZIP은 만든 뒤 수정되지 않으므로 하드 링크(불가능하면 복사)로 저장해 다시 기록하지 않습니다.
+
+        Returns:
+            저장 여부 (비활성화 또는 예산보다 큰 파일이면 False)
+        """
+        if not self.enabled:
+            return False
+        if os.path.getsize(source) > self.max_bytes:
+            return False
+        self._publish(key, lambda tmp_path: _link_or_copy(source, tmp_path))
+        return True
+
+    def write(self, key: str, data: bytes) -> bool:
+        """
+        바이트를 캐시에 저장하고 예산을 넘으면 LRU 항목 삭제
+
+        Returns:
+            저장 여부 (비활성화 또는 예산보다 크면 False)
+        """
+        if not self.enabled or len(data) > self.max_bytes:
+            return False
+        self._publish(key, lambda tmp_path: tmp_path.write_bytes(data))
+        return True
+
+    def _publish(self, key: str, write_to: Callable[[Path], object]) -> None:
+        """
+        같은 디렉토리의 임시 파일에 쓴 뒤 원자적으로 교체 (읽는 쪽은 항상 완전한 파일만 봄)
+
+        디렉토리 전체를 스캔하는 정리(evict)는 크기 추정치가 예산을 넘을 때만 실행합니다.
+        다른 프로세스가 저장한 항목은 다음 정리 때 추정치에 반영됩니다.
+        """
+        entry = self.entry_path(key)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = entry.parent / f".{key}.{uuid.uuid4().hex}.tmp"
+        try:
+            write_to(tmp_path)
+            size = tmp_path.stat().st_size
+            try:
+                replaced = entry.stat().st_size
+            except OSError:
+                replaced = 0
+            os.replace(tmp_path, entry)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+
+        with self._counter_lock:
+            self.stores += 1
+            if self._bytes is not None:
+                self._bytes += size - replaced
+            over_budget = self._bytes is None or self._bytes > self.max_bytes
+        if over_budget:
+            self.evict()
+
+    def evict(self) -> int:
+        """바이트 예산을 넘는 만큼 가장 오래 사용하지 않은 항목 삭제"""
+        removed = 0
+        with self._locked(exclusive=True):
+            entries = self._entries()
+            total = sum(size for _, size, _ in entries)
+            for path, size, _ in sorted(entries, key=lambda entry: entry[2]):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    path.unlink()
+                    total -= size
+                    removed += 1
+                except OSError:
+                    continue
+
+        with self._counter_lock:
+            self.evictions += removed
+            self._bytes = total
+        return removed
+
+    def clear(self) -> int:
+        """모든 항목 삭제"""
+        removed = 0
+        with self._locked(exclusive=True):
+            for path, _, _ in self._entries():
+                try:
+                    path.unlink()
+                    removed += 1
+                except OSError:
+                    continue
+        with self._counter_lock:
+            self._bytes = None
+        return removed
+
+    def stats(self) -> Dict:
+        """캐시 상태 및 적중/실패 카운터 (카운터는 프로세스별)"""
+        entries = self._entries() if self.enabled else []
+        lookups = self.hits + self.misses
+        return {
+            'enabled': self.enabled,
+            'entries': len(entries),
+            'bytes': sum(size for _, size, _ in entries),
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+            'stores': self.stores,
+            'evictions': self.evictions,
+        }
+
+    def _entries(self) -> List[Tuple[Path, int, float]]:
+        """(경로, 크기, 마지막 사용 시각) 목록"""
+        entries = []
+        if not self.cache_dir.exists():
+            return entries
+        for shard in os.scandir(self.cache_dir):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if not entry.name.endswith(self.suffix) or entry.name.startswith('.'):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((Path(entry.path), stat.st_size, stat.st_mtime))
+        return entries
+
+    @contextmanager
+    def _locked(self, exclusive: bool) -> Iterator[None]:
+        """프로세스 간 잠금 (조회는 공유, 삭제는 배타)"""
+        if not FCNTL_AVAILABLE:
+            yield
+            return
+        with open(self.cache_dir / LOCK_FILENAME, 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
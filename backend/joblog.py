@@ -0,0 +1,216 @@
+"""
+작업 로그 (구조화된 레코드, 크기 제한)
+- 레코드마다 레벨(debug/info/warning/error)과 태그('[PACKAGE]' 등)를 보관하고, 문자열은 읽을 때 포맷
+- 태그별 info/debug 레코드와 Traceback 수를 제한하고, 초과분은 개수만 세어 요약 한 줄로 표시
+- 전체 레코드 수도 제한 (단계 헤더 등 태그 없는 줄과 [ERROR] 줄은 항상 보관)
+- 기존 List[str] 로그처럼 append/extend/순회/인덱싱/슬라이싱 가능 (순회 시 문자열)
+"""
+import os
+import re
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+
+# 레벨
+LEVEL_DEBUG = 'debug'
+LEVEL_INFO = 'info'
+LEVEL_WARNING = 'warning'
+LEVEL_ERROR = 'error'
+
+# 태그별 info/debug 레코드 최대 수 (파일별 변경 로그 등, 초과분은 개수만 기록)
+LOG_MAX_LINES_PER_TAG = int(os.environ.get('LOG_MAX_LINES_PER_TAG', '1000'))
+# 작업 하나의 Traceback 레코드 최대 수
+LOG_MAX_TRACEBACKS = int(os.environ.get('LOG_MAX_TRACEBACKS', '20'))
+# 작업 하나의 전체 레코드 최대 수
+LOG_MAX_RECORDS = int(os.environ.get('LOG_MAX_RECORDS', '20000'))
+
+# 줄 앞의 태그 ('\n--- Step ...' 헤더나 구분선에는 없음)
+_TAG_PATTERN = re.compile(r'\s*(\[[A-Z_]+\])')
+# 제한과 무관하게 보관하는 태그
+_ALWAYS_KEPT_TAGS = ('[ERROR]',)
+
+
+def classify(message: str) -> str:
+    """로그 줄의 레벨 추정 (기존 문자열 로그 규칙: ❌/ERROR, ⚠️/WARNING, Traceback)"""
+    if 'Traceback:' in message:
+        return LEVEL_DEBUG
+    if '❌' in message or 'ERROR' in message:
+        return LEVEL_ERROR
+    if '⚠️' in message or 'WARNING' in message:
+        return LEVEL_WARNING
+    return LEVEL_INFO
+
+
+class RelativePath:
+    """포맷할 때 계산하는 프로젝트 기준 상대 경로 (로그를 읽지 않으면 relative_to를 호출하지 않음)"""
+
+    __slots__ = ('path', 'root')
+
+    def __init__(self, path: Path, root: Path):
+        self.path = path
+        self.root = root
+
+    def __str__(self) -> str:
+        return str(Path(self.path).relative_to(self.root))
+
+    def __format__(self, spec: str) -> str:
+        return format(str(self), spec)
+
+
+class LogRecord:
+    """
+    로그 레코드 하나
+
+    Args:
+        message: 메시지 (args가 있으면 str.format 템플릿, 읽을 때 포맷)
+        level: 레벨 (None이면 메시지로 추정)
+        args: 템플릿 인자
+    """
+
+    __slots__ = ('message', 'args', 'level', 'tag')
+
+    def __init__(self, message: str, level: Optional[str] = None, **args):
+        self.message = message
+        self.args = args
+        self.level = level or classify(message)
+        match = _TAG_PATTERN.match(message)
+        self.tag = match.group(1) if match else None
+
+    def __str__(self) -> str:
+        return self.message.format(**self.args) if self.args else self.message
+
+    def __repr__(self) -> str:
+        return f"LogRecord({self.level}, {str(self)!r})"
+
+
+class _OmittedRecord(LogRecord):
+    """제한을 넘어 생략된 레코드 수 요약 (생략될 때마다 개수만 증가)"""
+
+    __slots__ = ('count', 'reason')
+
+    def __init__(self, tag: str, reason: str):
+        super().__init__(tag, LEVEL_INFO)
+        self.count = 0
+        self.reason = reason
+
+    def __str__(self) -> str:
+        return f"{self.tag} ℹ️ {self.count} more lines omitted ({self.reason})"
+
+
+class JobLog:
+    """
+    크기가 제한된 작업 로그 (스레드 안전)
+
+    Args:
+        max_records: 전체 레코드 최대 수
+        max_per_tag: 태그별 info/debug 레코드 최대 수
+        max_tracebacks: Traceback 레코드 최대 수
+    """
+
+    def __init__(
+        self,
+        max_records: int = LOG_MAX_RECORDS,
+        max_per_tag: int = LOG_MAX_LINES_PER_TAG,
+        max_tracebacks: int = LOG_MAX_TRACEBACKS
+    ):
+        self.max_records = max_records
+        self.max_per_tag = max_per_tag
+        self.max_tracebacks = max_tracebacks
+        self._records: List[LogRecord] = []
+        self._kept_per_tag: Counter = Counter()
+        self._kept_tracebacks = 0
+        self._omitted_per_tag: Dict[str, _OmittedRecord] = {}
+        self._omitted_total: Optional[_OmittedRecord] = None
+        # 생략된 레코드 포함 레벨별/태그별 개수
+        self.levels: Counter = Counter()
+        self.tags: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def append(self, line: Union[str, LogRecord]) -> None:
+        record = line if isinstance(line, LogRecord) else LogRecord(line)
+        with self._lock:
+            self._add(record)
+
+    def extend(self, lines: Iterable[Union[str, LogRecord]]) -> None:
+        records = [line if isinstance(line, LogRecord) else LogRecord(line) for line in lines]
+        with self._lock:
+            for record in records:
+                self._add(record)
+
+    def _add(self, record: LogRecord) -> None:
+        self.levels[record.level] += 1
+        tag = record.tag
+        if tag is not None:
+            self.tags[tag] += 1
+        if tag is None or tag in _ALWAYS_KEPT_TAGS:
+            self._records.append(record)
+            return
+
+        if len(self._records) >= self.max_records:
+            if self._omitted_total is None:
+                self._omitted_total = _OmittedRecord('[LOG]', f"log limit: {self.max_records} lines")
+                self._records.append(self._omitted_total)
+            self._omitted_total.count += 1
+            return
+
+        if record.level in (LEVEL_INFO, LEVEL_DEBUG):
+            # Traceback은 앞선 오류 줄의 상세 내용이므로 태그별 제한 대신 작업 전체 Traceback 수로 제한
+            if record.level == LEVEL_DEBUG:
+                if self._kept_tracebacks >= self.max_tracebacks:
+                    self._omit(tag)
+                    return
+                self._kept_tracebacks += 1
+            else:
+                if self._kept_per_tag[tag] >= self.max_per_tag:
+                    self._omit(tag)
+                    return
+                self._kept_per_tag[tag] += 1
+        self._records.append(record)
+
+    def _omit(self, tag: str) -> None:
+        omitted = self._omitted_per_tag.get(tag)
+        if omitted is None:
+            reason = f"log limit: {self.max_per_tag} lines per tag, {self.max_tracebacks} tracebacks"
+            omitted = self._omitted_per_tag[tag] = _OmittedRecord(tag, reason)
+            self._records.append(omitted)
+        omitted.count += 1
+
+    def records(self) -> List[LogRecord]:
+        """보관된 레코드 (생략 요약 포함)"""
+        with self._lock:
+            return list(self._records)
+
+    def lines(self) -> List[str]:
+        return [str(record) for record in self.records()]
+
+    def summary(self) -> Dict:
+        """레코드 수, 생략된 수, 레벨별/태그별 개수"""
+        with self._lock:
+            omitted = sum(record.count for record in self._omitted_per_tag.values())
+            if self._omitted_total is not None:
+                omitted += self._omitted_total.count
+            return {
+                'records': len(self._records),
+                'omitted': omitted,
+                'levels': dict(self.levels),
+                'tags': dict(self.tags),
+            }
+
+    def __iter__(self) -> Iterator[str]:
+        return (str(record) for record in self.records())
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._records)
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def __getitem__(self, position: Union[int, slice]) -> Union[str, List[str]]:
+        with self._lock:
+            selected = self._records[position]
+        if isinstance(position, slice):
+            return [str(record) for record in selected]
+        return str(selected)
@@ -0,0 +1,511 @@
+"""
+비동기 리빌드 작업 관리
+- 작업 제출 즉시 job_id 반환, 처리는 이벤트 루프 밖의 제한된 워커 풀에서 실행
+- 작업 상태/단계 진행 상황 조회, 완료된 결과 ZIP 다운로드
+- 완료 후 일정 시간이 지난 작업은 임시 파일과 함께 자동 정리
+"""
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Collection, Dict, List, NamedTuple, Optional
+
+from backend import metrics
+from backend.cache import ResultCache, make_cache_key
+from backend.processor import STEP_TITLES, AndroidProjectProcessor
+from backend.utils.zip_tools import ZipStream
+from backend.workspaces import WorkspaceStore
+
+
+# 작업 상태
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_SUCCEEDED = 'succeeded'
+JOB_FAILED = 'failed'
+JOB_FINISHED_STATES = (JOB_SUCCEEDED, JOB_FAILED)
+
+# 결과 캐시 및 이전 빌드 재사용(증분 재적용) 대상 작업 종류 (배치는 변형별 결과가 여러 개라 제외)
+CACHEABLE_METHODS = ('process', 'process_prepared')
+# 같은 프로젝트인지 판단하는 입력 (업로드 필드명 또는 input_hashes 키)
+PROJECT_INPUT_KEYS = ('project_zip', 'template')
+
+# 동시에 처리할 작업 수 (환경 변수로 조정)
+DEFAULT_JOB_WORKERS = int(os.environ.get('JOB_WORKERS', '2'))
+# 대기 + 실행 중 작업 최대 수 (초과 시 제출 거부)
+DEFAULT_MAX_PENDING_JOBS = int(os.environ.get('MAX_PENDING_JOBS', '16'))
+# 완료된 작업 보관 시간 (초)
+DEFAULT_JOB_TTL_SECONDS = int(os.environ.get('JOB_TTL_SECONDS', '3600'))
+
+
+def estimate_remaining(
+    finished: Collection[int],
+    running: Dict[int, float],
+    now: float,
+    planned: Optional[Collection[int]] = None
+) -> Optional[float]:
+    """
+    남은 처리 시간 추정 (이 서버 프로세스에서 완료된 단계별 평균 시간 기준)
+
+    Args:
+        finished: 완료된 단계 번호
+        running: 실행 중인 단계 번호 -> 시작 시각
+        now: 현재 시각
+        planned: 앞으로 실행할 변형 단계 (증분 재적용 등, None이면 모든 단계)
+
+    Returns:
+        남은 시간(초) (평균 기록이 없는 단계가 남아 있으면 None)
+    """
+    remaining = 0.0
+    for number, title in enumerate(STEP_TITLES, start=1):
+        if number in finished or planned is not None and number not in planned:
+            continue
+        mean = metrics.STEP_DURATION.mean(step=number, title=title)
+        if mean is None:
+            return None
+        if number in running:
+            mean = max(0.0, mean - (now - running[number]))
+        remaining += mean
+    return round(remaining, 3)
+
+
+class UploadInfo(NamedTuple):
+    """스트리밍 저장된 업로드 파일 정보"""
+    path: str
+    size: int
+    sha256: str
+
+
+class JobQueueFullError(Exception):
+    """대기 중인 작업이 너무 많아 제출을 거부할 때 발생"""
+
+
+class Job:
+    """리빌드 작업 하나의 상태"""
+
+    def __init__(
+        self,
+        params: Dict,
+        temp_files: List[str],
+        uploads: Optional[Dict[str, UploadInfo]] = None,
+        method: str = 'process'
+    ):
+        self.id = uuid.uuid4().hex
+        self.params = params
+        # 실행할 AndroidProjectProcessor 메서드 ('process', 'process_prepared', 'process_batch')
+        self.method = method
+        self.temp_files = temp_files
+        # 업로드 필드명 -> UploadInfo (저장 중 계산된 SHA-256 포함)
+        self.uploads = dict(uploads or {})
+        self.status = JOB_QUEUED
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.processor = AndroidProjectProcessor()
+        self.result: Optional[Dict] = None
+        self.error: Optional[str] = None
+        self.future: Optional[Future] = None
+        # 결과 캐시 키 (캐시 대상 작업만) 및 캐시 적중 여부
+        self.cache_key: Optional[str] = None
+        self.cached = False
+        # 이전 빌드 보관 키 (프로젝트 입력 해시, 증분 재적용 대상 작업만)
+        self.workspace_key: Optional[str] = None
+        # 진행 상황 이벤트 (GET /jobs/{job_id}/events로 스트리밍, id는 1부터 순번)
+        self.events: List[Dict] = []
+        self._events_lock = threading.Lock()
+        self._finished_steps = set()
+        self._running_steps: Dict[int, float] = {}
+        self._planned_steps: Optional[List[int]] = None
+        self.processor.event_callback = self.add_event
+
+    def add_event(self, event: Dict) -> None:
+        """
+        진행 상황 이벤트 추가 (작업 스레드에서 호출)
+
+        단계 이벤트에는 경과 시간과 남은 시간 추정(eta_seconds, 추정할 수 없으면 None)을 붙입니다.
+        배치 작업의 변형별 단계 이벤트('variant' 포함)는 남은 시간을 추정하지 않습니다.
+        """
+        now = time.time()
+        with self._events_lock:
+            event = dict(event, id=len(self.events) + 1, time=now)
+            if self.started_at is not None:
+                event['elapsed'] = round(now - self.started_at, 3)
+            if event['event'] == 'steps_planned' and 'variant' not in event:
+                self._planned_steps = event['steps']
+            if 'step' in event and 'variant' not in event:
+                if event['event'] == 'step_started':
+                    self._running_steps[event['step']] = now
+                elif event['event'] == 'step_finished':
+                    self._running_steps.pop(event['step'], None)
+                    self._finished_steps.add(event['step'])
+                event['eta_seconds'] = estimate_remaining(
+                    self._finished_steps, self._running_steps, now, self._planned_steps
+                )
+            self.events.append(event)
+
+    def add_finished_event(self) -> None:
+        """작업 완료 이벤트 (스트림의 마지막 이벤트)"""
+        self.add_event({
+            'event': 'job_finished',
+            'status': self.status,
+            'error': self.error,
+            'cached': self.cached,
+            'download_ready': self.output_zip is not None,
+        })
+
+    def events_since(self, last_id: int) -> List[Dict]:
+        """last_id 이후의 이벤트"""
+        with self._events_lock:
+            return self.events[last_id:]
+
+    @property
+    def output_zip(self) -> Optional[str]:
+        if self.result and self.result.get('success'):
+            return self.result['output_zip']
+        return None
+
+    def variant_output_zip(self, position: int) -> Optional[str]:
+        """배치 작업의 변형별 결과 ZIP (없거나 실패하면 None)"""
+        variants = (self.result or {}).get('variants') or []
+        if 0 <= position < len(variants) and variants[position]['success']:
+            return variants[position]['output_zip']
+        return None
+
+    def variants(self) -> List[Dict]:
+        """배치 작업의 변형별 상태"""
+        results = (self.result or {}).get('variants') or []
+        states = []
+        for position, processor in enumerate(self.processor.variants):
+            state = {'index': position, 'current_step': processor.current_step}
+            if processor.track_memory:
+                state['memory'] = processor.memory_report()
+            if position < len(results):
+                state.update(
+                    name=results[position]['name'],
+                    success=results[position]['success'],
+                    error=results[position]['error']
+                )
+            states.append(state)
+        return states
+
+    def progress(self) -> Dict:
+        """단계별 진행 상황"""
+        current = self.processor.current_step
+        if self.status == JOB_SUCCEEDED:
+            current = len(STEP_TITLES) + 1
+
+        steps = []
+        for number, title in enumerate(STEP_TITLES, start=1):
+            if number < current:
+                state = 'done'
+            elif number == current:
+                state = 'failed' if self.status == JOB_FAILED else 'running'
+            else:
+                state = 'pending'
+            steps.append({'step': number, 'title': title, 'state': state})
+
+        completed = sum(1 for step in steps if step['state'] == 'done')
+        return {
+            'job_id': self.id,
+            'status': self.status,
+            'current_step': self.processor.current_step,
+            'total_steps': len(STEP_TITLES),
+            'percent': round(completed * 100 / len(STEP_TITLES)),
+            'steps': steps,
+        }
+
+    def to_dict(self) -> Dict:
+        """상태 조회 응답"""
+        current = self.processor.current_step
+        return {
+            'job_id': self.id,
+            'status': self.status,
+            'current_step': current,
+            'current_step_title': STEP_TITLES[current - 1] if current else None,
+            'total_steps': len(STEP_TITLES),
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'error': self.error,
+            'download_ready': self.output_zip is not None,
+            'cached': self.cached,
+            'incremental_steps': (self.result or {}).get('incremental_steps'),
+            'memory': self.processor.memory_report(),
+            'variants': self.variants(),
+            'uploads': {
+                field: {'size': info.size, 'sha256': info.sha256}
+                for field, info in self.uploads.items()
+            },
+        }
+
+
+class JobManager:
+    """
+    제한된 워커 풀에서 리빌드 작업 실행
+
+    Args:
+        max_workers: 동시에 실행할 작업 수
+        max_pending: 대기 + 실행 중 작업 최대 수
+        ttl_seconds: 완료된 작업 보관 시간
+        cache: 결과 캐시 (None이면 캐시 사용 안 함)
+        workspaces: 이전 빌드 보관소 (None이면 증분 재적용 안 함)
+    """
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_JOB_WORKERS,
+        max_pending: int = DEFAULT_MAX_PENDING_JOBS,
+        ttl_seconds: int = DEFAULT_JOB_TTL_SECONDS,
+        cache: Optional[ResultCache] = None,
+        workspaces: Optional[WorkspaceStore] = None
+    ):
+        self.max_workers = max(1, max_workers)
+        self.max_pending = max(1, max_pending)
+        self.ttl_seconds = ttl_seconds
+        self.cache = cache
+        self.workspaces = workspaces
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='rebuild-job')
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def pending_count(self) -> int:
+        """대기 + 실행 중 작업 수"""
+        with self._lock:
+            return sum(1 for job in self._jobs.values() if job.status not in JOB_FINISHED_STATES)
+
+    def stats(self) -> Dict:
+        """상태별 작업 수 (메트릭 수집용)"""
+        with self._lock:
+            statuses = [job.status for job in self._jobs.values()]
+        return {
+            'workers': self.max_workers,
+            'max_pending': self.max_pending,
+            'queued': statuses.count(JOB_QUEUED),
+            'running': statuses.count(JOB_RUNNING),
+            'finished': sum(1 for status in statuses if status in JOB_FINISHED_STATES),
+        }
+
+    def submit(
+        self,
+        params: Dict,
+        temp_files: Optional[List[str]] = None,
+        uploads: Optional[Dict[str, UploadInfo]] = None,
+        method: str = 'process',
+        input_hashes: Optional[Dict[str, str]] = None,
+        output_stream: Optional[ZipStream] = None
+    ) -> Job:
+        """
+        작업 제출
+
+        Args:
+            params: 실행할 AndroidProjectProcessor 메서드의 키워드 인자
+            temp_files: 작업 종료 후 삭제할 업로드 임시 파일
+            uploads: 업로드 필드명 -> UploadInfo
+            method: 'process' (단일), 'process_prepared' (템플릿), 'process_batch' (배치 변형)
+            input_hashes: 업로드 외 입력의 해시 (예: 템플릿 ZIP SHA-256, 캐시 키에 포함)
+            output_stream: 결과 ZIP을 압축하면서 바로 보낼 스트림 (캐시 적중 시 사용하지 않음,
+                캐시/증분 재적용 대상이면 결과 ZIP 파일에도 같이 기록)
+
+        Returns:
+            Job
+
+        Raises:
+            JobQueueFullError: 대기 중인 작업 수가 한도를 넘은 경우
+        """
+        self.purge_expired()
+        job = Job(params, list(temp_files or []), uploads, method)
+        for field, info in job.uploads.items():
+            metrics.UPLOAD_SIZE.observe(info.size, field=field)
+
+        # 단일/템플릿 작업은 입력 해시 + 파라미터로 캐시 조회 (적중 시 파이프라인 실행 없음)
+        # 드라이런은 결과 ZIP이 없으므로 캐시를 사용하지 않음
+        hashes = {field: info.sha256 for field, info in job.uploads.items()}
+        hashes.update(input_hashes or {})
+        cacheable = method in CACHEABLE_METHODS and not params.get('dry_run')
+        if self.cache is not None and self.cache.enabled and cacheable and hashes:
+            job.cache_key = make_cache_key(hashes, params)
+            if self._complete_from_cache(job):
+                with self._lock:
+                    self._jobs[job.id] = job
+                return job
+
+        # 같은 프로젝트의 이전 빌드가 있으면 입력이 바뀐 단계만 재적용
+        if self.workspaces is not None and self.workspaces.enabled and cacheable:
+            job.workspace_key = next((hashes[key] for key in PROJECT_INPUT_KEYS if key in hashes), None)
+
+        if output_stream is not None:
+            job.processor.output_stream = output_stream
+            job.processor.keep_output = job.cache_key is not None or job.workspace_key is not None
+
+        with self._lock:
+            pending = sum(1 for j in self._jobs.values() if j.status not in JOB_FINISHED_STATES)
+            if pending >= self.max_pending:
+                raise JobQueueFullError(f"Too many pending jobs ({pending})")
+            self._jobs[job.id] = job
+        job.future = self._executor.submit(self._run, job)
+        return job
+
+    def _complete_from_cache(self, job: Job) -> bool:
+        """캐시된 결과 ZIP으로 작업을 즉시 완료 (적중 여부 반환)"""
+        temp_dir = tempfile.mkdtemp(prefix='android_rebuild_')
+        output_zip = os.path.join(temp_dir, 'rebuilt_project.zip')
+        if not self.cache.fetch(job.cache_key, output_zip):
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            return False
+
+        # 결과 디렉토리는 프로세서 정리(cleanup) 대상으로 등록
+        job.processor.temp_dir = temp_dir
+        job.processor.logs.append(f"[CACHE] ✅ Cache hit: {job.cache_key[:16]} (processing skipped)")
+        job.cached = True
+        job.status = JOB_SUCCEEDED
+        job.started_at = job.finished_at = time.time()
+        job.result = {
+            'success': True,
+            'output_zip': output_zip,
+            'logs': job.processor.logs,
+            'cached': True,
+        }
+        self._remove_temp_files(job)
+        self._record_metrics(job)
+        job.add_finished_event()
+        job.future = Future()
+        job.future.set_result(job)
+        return True
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def remove(self, job_id: str) -> bool:
+        """
+        완료된 작업과 결과 파일 삭제
+
+        Returns:
+            삭제 여부 (없거나 아직 실행 중이면 False)
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.status not in JOB_FINISHED_STATES:
+                return False
+            del self._jobs[job_id]
+        job.processor.cleanup()
+        return True
+
+    def purge_expired(self) -> int:
+        """보관 시간이 지난 완료 작업 정리"""
+        now = time.time()
+        with self._lock:
+            expired = [
+                job_id for job_id, job in self._jobs.items()
+                if job.finished_at is not None and now - job.finished_at > self.ttl_seconds
+            ]
+        return sum(1 for job_id in expired if self.remove(job_id))
+
+    def shutdown(self) -> None:
+        """워커 풀 종료 및 모든 작업 정리"""
+        self._executor.shutdown(wait=True)
+        with self._lock:
+            job_ids = list(self._jobs)
+        for job_id in job_ids:
+            self.remove(job_id)
+        if self.workspaces is not None:
+            self.workspaces.clear()
+
+    def _run(self, job: Job) -> Job:
+        """워커 스레드에서 작업 실행"""
+        job.status = JOB_RUNNING
+        job.started_at = time.time()
+        job.add_event({'event': 'job_started', 'method': job.method})
+        try:
+            params = dict(job.params)
+            if job.workspace_key:
+                params['previous'] = self.workspaces.take(job.workspace_key)
+            job.result = getattr(job.processor, job.method)(**params)
+            if job.result['success']:
+                if job.cache_key:
+                    self._store_in_cache(job)
+                if job.workspace_key:
+                    self._keep_workspace(job)
+                job.status = JOB_SUCCEEDED
+            else:
+                job.error = job.result.get('error', 'Unknown error')
+                job.status = JOB_FAILED
+        except Exception as e:
+            job.error = str(e)
+            job.status = JOB_FAILED
+        finally:
+            job.finished_at = time.time()
+            # 결과 ZIP을 만들기 전에 실패했으면 스트림을 받는 쪽에 실패를 알림 (성공 시 이미 닫힘)
+            if job.processor.output_stream is not None:
+                job.processor.output_stream.close(job.error or 'Job failed')
+            self._remove_temp_files(job)
+            self._record_metrics(job)
+            job.add_finished_event()
+        return job
+
+    @staticmethod
+    def _record_metrics(job: Job) -> None:
+        """완료된 작업의 단계별 시간, 치환 처리량, 결과 크기 기록"""
+        status = 'cached' if job.cached else job.status
+        metrics.JOBS_FINISHED.inc(method=job.method, status=status)
+        if job.started_at is not None and job.finished_at is not None:
+            metrics.JOB_DURATION.observe(job.finished_at - job.started_at, method=job.method, status=status)
+
+        # 배치 작업은 준비 단계(부모)와 변형별 단계(변형 프로세서)로 나뉘어 기록됨
+        alloc_peak = None
+        for processor in [job.processor] + job.processor.variants:
+            for number, seconds in sorted(processor.step_durations.items()):
+                metrics.STEP_DURATION.observe(seconds, step=number, title=STEP_TITLES[number - 1])
+            for number, usage in sorted(processor.step_memory.items()):
+                title = STEP_TITLES[number - 1]
+                metrics.STEP_MEMORY_PEAK.observe(usage['alloc_peak'], step=number, title=title)
+                if usage['rss_delta'] is not None:
+                    metrics.STEP_RSS_GROWTH.observe(max(0, usage['rss_delta']), step=number, title=title)
+                alloc_peak = max(alloc_peak or 0, usage['alloc_peak'])
+            if processor.rewrite is not None:
+                metrics.FILES_SCANNED.inc(processor.rewrite.files_scanned)
+                metrics.FILES_REWRITTEN.inc(processor.rewrite.files_written)
+                metrics.BYTES_READ.inc(processor.rewrite.bytes_read)
+                metrics.BYTES_WRITTEN.inc(processor.rewrite.bytes_written)
+
+        if alloc_peak is not None:
+            metrics.JOB_MEMORY_PEAK.observe(alloc_peak, method=job.method)
+        if job.output_zip is not None:
+            try:
+                metrics.OUTPUT_SIZE.observe(os.path.getsize(job.output_zip), method=job.method)
+            except OSError:
+                pass
+        elif job.status == JOB_SUCCEEDED and job.processor.output_stream is not None:
+            metrics.OUTPUT_SIZE.observe(job.processor.output_stream.bytes_written, method=job.method)
+
+    def _store_in_cache(self, job: Job) -> None:
+        """성공한 결과 ZIP을 캐시에 저장 (실패해도 작업 결과에는 영향 없음)"""
+        try:
+            if self.cache.store(job.cache_key, job.result['output_zip']):
+                job.processor.logs.append(f"[CACHE] Stored result: {job.cache_key[:16]}")
+        except OSError as e:
+            job.processor.logs.append(f"[CACHE] ⚠️ Failed to store result: {str(e)}")
+
+    def _keep_workspace(self, job: Job) -> None:
+        """성공한 빌드의 작업 공간을 다음 작업의 증분 재적용용으로 보관 (실패해도 작업 결과에는 영향 없음)"""
+        directory = None
+        try:
+            directory = self.workspaces.allocate()
+            self.workspaces.put(job.workspace_key, job.processor.detach_build(directory))
+        except (OSError, ValueError) as e:
+            if directory is not None:
+                shutil.rmtree(directory, ignore_errors=True)
+            job.processor.logs.append(f"[INCREMENTAL] ⚠️ Failed to keep workspace: {str(e)}")
+
+    @staticmethod
+    def _remove_temp_files(job: Job) -> None:
+        """업로드 임시 파일 정리 (결과 ZIP은 다운로드/만료 시까지 유지)"""
+        for temp_file in job.temp_files:
+            try:
+                if Path(temp_file).exists():
+                    os.unlink(temp_file)
+            except OSError:
+                pass
@@ -1,22 +1,81 @@
 """
 FastAPI 메인 엔드포인트
 """
+import asyncio
+import hashlib
+import json
 import os
 import re
 import tempfile
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote
 from datetime import datetime
 
-from fastapi import FastAPI, File, UploadFile, Form, HTTPException
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi import Depends, FastAPI, File, UploadFile, Form, HTTPException, Request
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
-from backend.processor import AndroidProjectProcessor
+from starlette.background import BackgroundTask
+from starlette.datastructures import Headers
+from starlette.concurrency import run_in_threadpool
 
+from backend import metrics
+from backend.cache import ResultCache
+from backend.memory import current_rss, peak_rss
+from backend.templates import TemplateError, TemplateRegistry
+from backend.utils.icon_replace import ICON_FORMATS, get_rendition_cache
+from backend.jobs import JOB_FAILED, JOB_FINISHED_STATES, JOB_SUCCEEDED, Job, JobManager, JobQueueFullError, UploadInfo
+from backend.utils.rewrite_plan import EXECUTOR_MODES
+from backend.utils.zip_tools import ZipStream
+from backend.workspaces import WorkspaceStore
 
-app = FastAPI(title="Android Project Rebuilder")
+
+# 업로드 크기 제한 (환경 변수로 조정)
+MAX_UPLOAD_SIZE = int(os.environ.get('MAX_UPLOAD_SIZE', str(2 * 1024 * 1024 * 1024)))      # 프로젝트 ZIP
+MAX_ASSET_UPLOAD_SIZE = int(os.environ.get('MAX_ASSET_UPLOAD_SIZE', str(20 * 1024 * 1024)))  # json/이미지
+# 요청 전체 크기 제한 (프로젝트 ZIP + 선택 파일 3개 + multipart 오버헤드)
+MAX_REQUEST_SIZE = MAX_UPLOAD_SIZE + 3 * MAX_ASSET_UPLOAD_SIZE + 1024 * 1024
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# 진행 상황 스트림: 새 이벤트 확인 간격, keep-alive 주석 전송 간격 (초)
+EVENT_POLL_SECONDS = float(os.environ.get('EVENT_POLL_SECONDS', '0.25'))
+EVENT_KEEPALIVE_SECONDS = 15.0
+
+# 배치 요청당 최대 변형 수
+MAX_BATCH_VARIANTS = int(os.environ.get('MAX_BATCH_VARIANTS', '50'))
+# 배치 변형 스펙의 파일 필드 -> process 인자
+BATCH_ASSET_FIELDS = {
+    'google_services': 'google_services_path',
+    'app_icon': 'icon_path',
+    'splash_image': 'splash_path',
+}
+
+# 업로드를 받는 경로별 요청 크기 제한 (본문 파싱 전에 Content-Length로 조기 거부)
+UPLOAD_LIMITS = {
+    '/process': MAX_REQUEST_SIZE,
+    '/jobs': MAX_REQUEST_SIZE,
+    '/templates': MAX_REQUEST_SIZE,
+    '/batch': MAX_REQUEST_SIZE + MAX_BATCH_VARIANTS * 3 * MAX_ASSET_UPLOAD_SIZE,
+}
+
+# 결과 캐시, 증분 재적용용 이전 빌드 보관소 및 리빌드 작업 관리자 (이벤트 루프 밖의 제한된 워커 풀)
+result_cache = ResultCache()
+workspace_store = WorkspaceStore()
+job_manager = JobManager(cache=result_cache, workspaces=workspace_store)
+# 사전 준비된 템플릿 작업 공간
+template_registry = TemplateRegistry()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    job_manager.shutdown()
+
+
+app = FastAPI(title="Android Project Rebuilder", lifespan=lifespan)
 
 # CORS 설정 (로컬 개발용)
 app.add_middleware(
@@ -28,6 +87,53 @@ app.add_middleware(
 )
 
 
+def request_too_large_detail(limit: int) -> str:
+    return f"❌ 요청이 너무 큽니다 (최대 {limit // (1024 * 1024)}MB)"
+
+
+class UploadLimitMiddleware:
+    """
+    업로드 경로의 요청 크기 제한
+
+    Content-Length가 제한을 넘으면 본문을 받기 전에 413으로 거부하고,
+    Content-Length가 없거나(chunked) 실제 본문이 더 길면 받는 중에 제한을 넘는 순간 413으로 중단합니다.
+    (FastAPI는 본문 파싱 중 발생한 HTTPException을 그대로 응답으로 변환)
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        limit = None
+        if scope['type'] == 'http' and scope['method'] == 'POST':
+            limit = UPLOAD_LIMITS.get(scope['path'])
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        content_length = Headers(scope=scope).get('content-length')
+        if content_length and content_length.isdigit() and int(content_length) > limit:
+            response = JSONResponse(status_code=413, content={'detail': request_too_large_detail(limit)})
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message['type'] == 'http.request':
+                received += len(message.get('body', b''))
+                if received > limit:
+                    raise HTTPException(status_code=413, detail=request_too_large_detail(limit))
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+
+app.add_middleware(UploadLimitMiddleware)
+
+
 def validate_package_name(package_name: str) -> bool:
     """
     Android 패키지명 유효성 검사
@@ -39,122 +145,656 @@ def validate_package_name(package_name: str) -> bool:
     return bool(re.match(pattern, package_name))
 
 
-@app.post("/process")
-async def process_project(
-    project_zip: UploadFile = File(..., description="Android 프로젝트 ZIP 파일"),
-    new_package: str = Form(..., description="새 패키지명 (예: com.example.newapp)"),
-    new_app_name: str = Form(..., description="새 앱 이름 (예: MyNewApp)"),
-    google_services: Optional[UploadFile] = File(None, description="google-services.json (선택)"),
-    app_icon: Optional[UploadFile] = File(None, description="앱 아이콘 이미지 (선택)"),
-    splash_image: Optional[UploadFile] = File(None, description="스플래시 이미지 (선택)"),
-    new_base_url: Optional[str] = Form(None, description="새 BASE_URL (선택)"),
-    include_log: bool = Form(True, description="로그 파일 포함 여부")
-):
+class ProcessRequest:
+    """/process, /jobs 공통 요청 파라미터 (multipart/form-data)"""
+
+    def __init__(
+        self,
+        project_zip: Optional[UploadFile] = File(None, description="Android 프로젝트 ZIP 파일 (template_id가 없으면 필수)"),
+        new_package: str = Form(..., description="새 패키지명 (예: com.example.newapp)"),
+        new_app_name: str = Form(..., description="새 앱 이름 (예: MyNewApp)"),
+        template_id: Optional[str] = Form(None, description="등록된 템플릿 ID (project_zip 대신 사용)"),
+        google_services: Optional[UploadFile] = File(None, description="google-services.json (선택)"),
+        app_icon: Optional[UploadFile] = File(None, description="앱 아이콘 이미지 (선택)"),
+        splash_image: Optional[UploadFile] = File(None, description="스플래시 이미지 (선택)"),
+        new_base_url: Optional[str] = Form(None, description="새 BASE_URL (선택)"),
+        include_log: bool = Form(True, description="로그 파일 포함 여부"),
+        zip_passthrough: bool = Form(False, description="변경되지 않은 파일을 재압축 없이 복사"),
+        executor: str = Form("serial", description="텍스트 치환 실행 모드 (serial, thread, process)"),
+        workers: Optional[int] = Form(None, description="병렬 워커 수 (선택, 미지정 시 자동)"),
+        icon_format: str = Form("png", description="아이콘/스플래시 출력 형식 (png, optimized, webp)"),
+        dry_run: bool = Form(False, description="변경 계획만 반환 (파일 기록/ZIP 생성 없음)"),
+        stream: bool = Form(False, description="결과 ZIP을 압축하면서 바로 전송 (/process만 해당)")
+    ):
+        self.project_zip = project_zip
+        self.new_package = new_package
+        self.new_app_name = new_app_name
+        self.template_id = template_id
+        self.google_services = google_services
+        self.app_icon = app_icon
+        self.splash_image = splash_image
+        self.new_base_url = new_base_url
+        self.include_log = include_log
+        self.zip_passthrough = zip_passthrough
+        self.executor = executor
+        self.workers = workers
+        self.icon_format = icon_format
+        self.dry_run = dry_run
+        self.stream = stream
+
+
+async def save_upload(
+    upload: UploadFile,
+    suffix: str,
+    temp_files: List[str],
+    max_size: int = MAX_ASSET_UPLOAD_SIZE
+) -> UploadInfo:
     """
-    Android 프로젝트 리빌드 처리
+    업로드 파일을 청크 단위로 임시 파일에 저장 (전체를 메모리에 올리지 않음)
+
+    저장하면서 SHA-256을 계산하므로 이후 단계에서 파일을 다시 읽을 필요가 없습니다.
+    복사와 해시 계산은 이벤트 루프를 막지 않도록 스레드 풀에서 실행합니다.
+    (파트는 Starlette가 이미 받아 둔 상태이며, 요청 전체 크기는 UploadLimitMiddleware가 받는 중에 제한)
+
+    Args:
+        upload: 업로드 파일
+        suffix: 임시 파일 확장자
+        temp_files: 생성한 임시 파일 경로를 추가할 목록 (정리용)
+        max_size: 최대 크기 (바이트)
 
     Returns:
-        FileResponse: rebuilt_project.zip
+        UploadInfo (경로, 크기, SHA-256)
+
+    Raises:
+        HTTPException: 최대 크기 초과(413)
     """
-    # 패키지명 유효성 검사
-    if not validate_package_name(new_package):
+    name = upload.filename or 'upload'
+    # 받아 둔 파트 크기를 알 수 있으면 복사하지 않고 거부
+    if upload.size is not None and upload.size > max_size:
+        raise_upload_too_large(name, max_size)
+
+    tmp = tempfile.NamedTemporaryFile(delete=False, suffix=suffix)
+    temp_files.append(tmp.name)
+    with tmp:
+        size, sha256 = await run_in_threadpool(copy_upload, upload.file, tmp, name, max_size)
+    return UploadInfo(tmp.name, size, sha256)
+
+
+def copy_upload(source, dest, name: str, max_size: int) -> Tuple[int, str]:
+    """업로드 파일을 청크 단위로 복사하며 크기와 SHA-256 계산 (최대 크기 초과 시 413)"""
+    digest = hashlib.sha256()
+    size = 0
+    source.seek(0)
+    while True:
+        chunk = source.read(UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            break
+        size += len(chunk)
+        if size > max_size:
+            raise_upload_too_large(name, max_size)
+        digest.update(chunk)
+        dest.write(chunk)
+    return size, digest.hexdigest()
+
+
+def raise_upload_too_large(name: str, max_size: int) -> None:
+    raise HTTPException(
+        status_code=413,
+        detail=f"❌ 업로드 파일이 너무 큽니다: '{name}' (최대 {max_size // (1024 * 1024)}MB)"
+    )
+
+
+def check_package_name(package_name: str) -> None:
+    """패키지명 유효성 검사 (실패 시 400)"""
+    if not validate_package_name(package_name):
+        raise HTTPException(
+            status_code=400,
+            detail=f"❌ 잘못된 패키지명 형식: '{package_name}'\n\n올바른 형식: com.example.app\n- 영문 소문자로 시작\n- 점(.)으로 최소 2개 이상 구분\n- 영문 소문자, 숫자, 언더스코어(_)만 사용 가능"
+        )
+
+
+def check_executor(executor: str) -> None:
+    """실행 모드 유효성 검사 (실패 시 400)"""
+    if executor not in EXECUTOR_MODES:
         raise HTTPException(
             status_code=400,
-            detail=f"❌ 잘못된 패키지명 형식: '{new_package}'\n\n올바른 형식: com.example.app\n- 영문 소문자로 시작\n- 점(.)으로 최소 2개 이상 구분\n- 영문 소문자, 숫자, 언더스코어(_)만 사용 가능"
+            detail=f"❌ 잘못된 실행 모드: '{executor}' (가능한 값: {', '.join(EXECUTOR_MODES)})"
         )
 
-    processor = AndroidProjectProcessor()
-    temp_files = []
 
+def check_icon_format(icon_format: str) -> None:
+    """아이콘 출력 형식 유효성 검사 (실패 시 400)"""
+    if icon_format not in ICON_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"❌ 잘못된 아이콘 형식: '{icon_format}' (가능한 값: {', '.join(ICON_FORMATS)})"
+        )
+
+
+async def submit_job(request: ProcessRequest, output_stream: Optional[ZipStream] = None) -> Job:
+    """
+    요청 검증 및 업로드 저장 후 작업 제출
+
+    Args:
+        request: 요청 파라미터
+        output_stream: 결과 ZIP 스트리밍 출력 (JobManager.submit 참고)
+
+    Raises:
+        HTTPException: 잘못된 파라미터(400), 작업 대기열 초과(503)
+    """
+    check_package_name(request.new_package)
+    check_executor(request.executor)
+    check_icon_format(request.icon_format)
+
+    template = None
+    if request.template_id:
+        template = template_registry.get(request.template_id)
+        if template is None:
+            raise HTTPException(status_code=404, detail=f"❌ 등록되지 않은 템플릿: '{request.template_id}'")
+    elif request.project_zip is None:
+        raise HTTPException(status_code=400, detail="❌ project_zip 또는 template_id가 필요합니다")
+
+    temp_files: List[str] = []
     try:
-        # 1. 업로드 파일 임시 저장
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.zip') as tmp_zip:
-            content = await project_zip.read()
-            tmp_zip.write(content)
-            zip_path = tmp_zip.name
-            temp_files.append(zip_path)
-
-        # 2. 선택적 파일 저장
+        # 업로드 파일 임시 저장
+        uploads: Dict[str, UploadInfo] = {}
+        zip_path = None
+        if template is None:
+            uploads['project_zip'] = await save_upload(
+                request.project_zip, '.zip', temp_files, MAX_UPLOAD_SIZE
+            )
+            zip_path = uploads['project_zip'].path
+
         google_services_path = None
-        if google_services:
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.json') as tmp_gs:
-                content = await google_services.read()
-                tmp_gs.write(content)
-                google_services_path = tmp_gs.name
-                temp_files.append(google_services_path)
+        if request.google_services:
+            uploads['google_services'] = await save_upload(request.google_services, '.json', temp_files)
+            google_services_path = uploads['google_services'].path
 
         icon_path = None
-        if app_icon:
-            suffix = Path(app_icon.filename).suffix
-            with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_icon:
-                content = await app_icon.read()
-                tmp_icon.write(content)
-                icon_path = tmp_icon.name
-                temp_files.append(icon_path)
+        if request.app_icon:
+            suffix = Path(request.app_icon.filename).suffix
+            uploads['app_icon'] = await save_upload(request.app_icon, suffix, temp_files)
+            icon_path = uploads['app_icon'].path
 
         splash_path = None
-        if splash_image:
-            suffix = Path(splash_image.filename).suffix
-            with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_splash:
-                content = await splash_image.read()
-                tmp_splash.write(content)
-                splash_path = tmp_splash.name
-                temp_files.append(splash_path)
-
-        # 3. 프로세싱 실행
-        result = processor.process(
-            zip_path=zip_path,
-            new_package=new_package,
-            new_app_name=new_app_name,
-            google_services_path=google_services_path,
-            icon_path=icon_path,
-            splash_path=splash_path,
-            new_base_url=new_base_url,
-            include_log=include_log
+        if request.splash_image:
+            suffix = Path(request.splash_image.filename).suffix
+            uploads['splash_image'] = await save_upload(request.splash_image, suffix, temp_files)
+            splash_path = uploads['splash_image'].path
+
+        params = {
+            'new_package': request.new_package,
+            'new_app_name': request.new_app_name,
+            'google_services_path': google_services_path,
+            'icon_path': icon_path,
+            'splash_path': splash_path,
+            'new_base_url': request.new_base_url,
+            'include_log': request.include_log,
+            'executor': request.executor,
+            'workers': request.workers,
+            'icon_format': request.icon_format,
+            'dry_run': request.dry_run,
+        }
+        if template is not None:
+            # 준비된 작업 공간을 복사해 편집만 수행 (업로드/압축 해제/탐지 생략)
+            params['prepared'] = template.prepared()
+            return job_manager.submit(
+                params, temp_files, uploads, method='process_prepared',
+                input_hashes={'template': template.sha256}, output_stream=output_stream
+            )
+
+        params['zip_path'] = zip_path
+        params['zip_passthrough'] = request.zip_passthrough
+        return job_manager.submit(params, temp_files, uploads, output_stream=output_stream)
+
+    except JobQueueFullError as e:
+        remove_temp_files(temp_files)
+        raise HTTPException(status_code=503, detail=f"❌ 처리 대기 중인 작업이 너무 많습니다. 잠시 후 다시 시도하세요. ({e})")
+    except Exception:
+        remove_temp_files(temp_files)
+        raise
+
+
+def remove_temp_files(temp_files: List[str]) -> None:
+    """임시 파일 정리"""
+    for temp_file in temp_files:
+        try:
+            if Path(temp_file).exists():
+                os.unlink(temp_file)
+        except OSError:
+            pass
+
+
+def get_job_or_404(job_id: str) -> Job:
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    return job
+
+
+def output_filename(job: Job) -> str:
+    # ZIP 파일명 생성: package_changed_{앱이름}.zip (배치는 rebuilt_variants.zip)
+    # 한글 파일명은 HTTP 헤더에서 Latin-1 인코딩 에러를 일으키므로 헤더는 content_disposition()으로 생성
+    if job.method == 'process_batch':
+        return 'rebuilt_variants.zip'
+    return f"package_changed_{job.params['new_app_name']}.zip"
+
+
+def content_disposition(filename: str) -> str:
+    # FileResponse와 같은 방식: ASCII가 아닌 파일명은 RFC 5987 filename*= 형식으로 인코딩
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"attachment; filename*=utf-8''{quoted}"
+    return f'attachment; filename="{filename}"'
+
+
+def release_stream(job: Job, output_stream: ZipStream) -> None:
+    """
+    스트리밍 응답이 끝난 뒤 정리 (전송 완료, 연결 끊김, 응답 생성/전송 실패)
+
+    남은 압축을 중단하고 (다 보낸 경우 이미 닫혀 있음), 결과 캐시 저장 등 남은 처리가 끝나면 작업을 삭제합니다.
+    """
+    output_stream.cancel()
+    job.future.add_done_callback(lambda _: job_manager.remove(job.id))
+
+
+class JobStreamingResponse(StreamingResponse):
+    """
+    결과 ZIP 스트리밍 응답
+
+    전송이 중간에 실패하면 BackgroundTask가 실행되지 않으므로 직접 release_stream()을 호출합니다
+    (압축 스레드가 받는 쪽을 기다리며 워커를 붙잡지 않도록).
+    """
+
+    def __init__(self, job: Job, output_stream: ZipStream):
+        super().__init__(
+            output_stream.chunks(),
+            media_type='application/zip',
+            headers={'Content-Disposition': content_disposition(output_filename(job))},
+            background=BackgroundTask(release_stream, job, output_stream)
         )
+        self.job = job
+        self.output_stream = output_stream
 
-        # 4. 결과 반환
-        if result['success']:
-            output_zip = result['output_zip']
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        except BaseException:
+            release_stream(self.job, self.output_stream)
+            raise
 
-            # ZIP 파일명 생성: package_changed_{앱이름}.zip
-            # 한글 파일명은 HTTP 헤더에서 Latin-1 인코딩 에러를 일으키므로 ASCII만 사용
-            filename = f"package_changed_{new_app_name}.zip"
 
-            # FileResponse에 filename 직접 전달
-            response = FileResponse(
-                path=output_zip,
-                media_type='application/zip',
-                filename=filename
-            )
+@app.post("/process")
+async def process_project(request: ProcessRequest = Depends()):
+    """
+    Android 프로젝트 리빌드 처리 (동기 호환 엔드포인트)
 
-            return response
-        else:
-            raise HTTPException(
-                status_code=500,
-                detail={
-                    'error': result.get('error', 'Unknown error'),
-                    'logs': result['logs']
-                }
-            )
+    작업 API로 제출한 뒤 완료될 때까지 기다려 결과를 반환합니다.
+    처리는 워커 풀에서 실행되므로 대기 중에도 다른 요청이 처리됩니다.
+
+    stream이면 결과 ZIP 생성 단계가 시작되는 즉시 압축하면서 청크 단위로 전송합니다
+    (Content-Length 없음, 그 이후 실패하면 응답이 중간에 끊김).
 
-    except Exception as e:
+    Returns:
+        FileResponse: rebuilt_project.zip (stream이면 StreamingResponse, 캐시 적중 시 FileResponse)
+        dry_run이면 {'plan': Dict, 'logs': List[str]} (JSON)
+    """
+    output_stream = ZipStream() if request.stream and not request.dry_run else None
+    job = await submit_job(request, output_stream)
+    if output_stream is not None:
+        # 작업이 끝나거나 결과 ZIP의 첫 바이트가 기록될 때까지 대기 (그 전에 실패하면 아래에서 500 응답)
+        await asyncio.wait(
+            {asyncio.wrap_future(job.future), asyncio.wrap_future(output_stream.started)},
+            return_when=asyncio.FIRST_COMPLETED
+        )
+        if output_stream.started.done() and output_stream.started.result():
+            try:
+                return JobStreamingResponse(job, output_stream)
+            except Exception:
+                release_stream(job, output_stream)
+                raise
+    await asyncio.wrap_future(job.future)
+
+    if job.status != JOB_SUCCEEDED:
+        logs = job.processor.logs.lines()
+        job_manager.remove(job.id)
         raise HTTPException(
             status_code=500,
             detail={
-                'error': str(e),
-                'logs': processor.logs
+                'error': job.error or 'Unknown error',
+                'logs': logs
             }
         )
 
+    if request.dry_run:
+        result = job.result
+        job_manager.remove(job.id)
+        return {'plan': result['plan'], 'logs': list(result['logs'])}
+
+    # 응답 전송 후 작업 및 결과 파일 정리
+    return FileResponse(
+        path=job.output_zip,
+        media_type='application/zip',
+        filename=output_filename(job),
+        background=BackgroundTask(job_manager.remove, job.id)
+    )
+
+
+@app.post("/jobs", status_code=202)
+async def create_job(request: ProcessRequest = Depends()):
+    """
+    리빌드 작업 제출
+
+    Returns:
+        {'job_id': str, 'status': str}
+    """
+    job = await submit_job(request)
+    return {'job_id': job.id, 'status': job.status}
+
+
+@app.get("/jobs/{job_id}")
+async def job_status(job_id: str):
+    """작업 상태 조회"""
+    return get_job_or_404(job_id).to_dict()
+
+
+@app.get("/jobs/{job_id}/progress")
+async def job_progress(job_id: str):
+    """작업 단계별 진행 상황 조회"""
+    return get_job_or_404(job_id).progress()
+
+
+def format_event(event: Dict) -> str:
+    """Server-Sent Events 메시지 형식"""
+    return f"id: {event['id']}\nevent: {event['event']}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+
+
+@app.get("/jobs/{job_id}/events")
+async def job_events(job_id: str, request: Request):
+    """
+    작업 진행 상황 스트림 (Server-Sent Events)
+
+    이벤트: job_started, steps_planned(실행할 변형 단계), step_started, step_finished(duration, counters),
+    job_finished(status)
+    단계 이벤트에는 elapsed, eta_seconds(남은 시간 추정)가 포함되며 job_finished 이후 스트림이 끝납니다.
+    재연결 시 Last-Event-ID 헤더(또는 last_event_id 쿼리) 이후의 이벤트부터 다시 보냅니다.
+    """
+    job = get_job_or_404(job_id)
+    last_id = request.headers.get('last-event-id') or request.query_params.get('last_event_id') or ''
+    cursor = int(last_id) if last_id.isdigit() else 0
+
+    async def stream():
+        nonlocal cursor
+        waited = 0.0
+        while True:
+            for event in job.events_since(cursor):
+                cursor = event['id']
+                yield format_event(event)
+                if event['event'] == 'job_finished':
+                    return
+            if job.events and job.events[-1]['event'] == 'job_finished' and cursor >= len(job.events):
+                return
+            if await request.is_disconnected():
+                return
+            # 프록시가 유휴 연결을 끊지 않도록 주기적으로 주석 전송
+            if waited >= EVENT_KEEPALIVE_SECONDS:
+                waited = 0.0
+                yield ": keep-alive\n\n"
+            await asyncio.sleep(EVENT_POLL_SECONDS)
+            waited += EVENT_POLL_SECONDS
+
+    return StreamingResponse(
+        stream(),
+        media_type='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+
+@app.get("/jobs/{job_id}/logs")
+async def job_logs(job_id: str):
+    """작업 로그 조회"""
+    job = get_job_or_404(job_id)
+    return {
+        'job_id': job.id,
+        'status': job.status,
+        'logs': job.processor.logs.lines(),
+        'summary': job.processor.logs.summary()
+    }
+
+
+@app.get("/jobs/{job_id}/download")
+async def job_download(job_id: str):
+    """완료된 작업의 결과 ZIP 다운로드"""
+    job = get_job_or_404(job_id)
+    if job.status == JOB_FAILED:
+        raise HTTPException(status_code=409, detail={'error': job.error, 'status': job.status})
+    if job.params.get('dry_run'):
+        raise HTTPException(status_code=409, detail={'error': 'Dry run job has no ZIP (use /plan)', 'status': job.status})
+    if job.output_zip is None:
+        raise HTTPException(status_code=409, detail={'error': 'Job is not finished yet', 'status': job.status})
+
+    return FileResponse(
+        path=job.output_zip,
+        media_type='application/zip',
+        filename=output_filename(job)
+    )
+
+
+@app.get("/jobs/{job_id}/plan")
+async def job_plan(job_id: str):
+    """드라이런 작업의 변경 계획 조회"""
+    job = get_job_or_404(job_id)
+    if not job.params.get('dry_run'):
+        raise HTTPException(status_code=409, detail={'error': 'Job is not a dry run', 'status': job.status})
+    if job.status == JOB_FAILED:
+        raise HTTPException(status_code=409, detail={'error': job.error, 'status': job.status})
+    if job.status != JOB_SUCCEEDED:
+        raise HTTPException(status_code=409, detail={'error': 'Job is not finished yet', 'status': job.status})
+    return {'job_id': job.id, 'plan': job.result['plan']}
+
+
+@app.post("/batch", status_code=202)
+async def create_batch_job(
+    project_zip: UploadFile = File(..., description="Android 프로젝트 ZIP 파일"),
+    variants: str = Form(..., description="변형 스펙 JSON 배열"),
+    assets: List[UploadFile] = File([], description="변형 스펙에서 파일명으로 참조하는 json/이미지 파일"),
+    include_log: bool = Form(True, description="변형별 ZIP에 로그 파일 포함 여부"),
+    zip_passthrough: bool = Form(False, description="변경되지 않은 파일을 재압축 없이 복사"),
+    executor: str = Form("serial", description="텍스트 치환 실행 모드 (serial, thread, process)"),
+    workers: Optional[int] = Form(None, description="병렬 워커 수 (선택, 미지정 시 자동)"),
+    icon_format: str = Form("png", description="아이콘/스플래시 출력 형식 (png, optimized, webp)")
+):
+    """
+    배치 화이트라벨 작업 제출 (프로젝트 하나로 여러 변형 생성)
+
+    variants 예시:
+        [{"name": "brand_a", "new_package": "com.a.app", "new_app_name": "A",
+          "app_icon": "a.png", "splash_image": "a_splash.png",
+          "google_services": "a.json", "new_base_url": "https://a.example.com/"}]
+
+    파일 필드(app_icon, splash_image, google_services)는 assets로 업로드한 파일명을 참조합니다.
+
+    Returns:
+        {'job_id': str, 'status': str, 'variants': int}
+    """
+    try:
+        specs = json.loads(variants)
+    except json.JSONDecodeError as e:
+        raise HTTPException(status_code=400, detail=f"❌ variants JSON 파싱 실패: {e}")
+    if not isinstance(specs, list) or not specs or not all(isinstance(spec, dict) for spec in specs):
+        raise HTTPException(status_code=400, detail="❌ variants는 하나 이상의 객체를 담은 JSON 배열이어야 합니다")
+    if len(specs) > MAX_BATCH_VARIANTS:
+        raise HTTPException(status_code=400, detail=f"❌ 변형은 최대 {MAX_BATCH_VARIANTS}개까지 가능합니다")
+
+    assets_by_name = {asset.filename: asset for asset in assets}
+    for spec in specs:
+        if not spec.get('new_package') or not spec.get('new_app_name'):
+            raise HTTPException(status_code=400, detail="❌ 각 변형에는 new_package와 new_app_name이 필요합니다")
+        check_package_name(spec['new_package'])
+        for field in BATCH_ASSET_FIELDS:
+            if spec.get(field) and spec[field] not in assets_by_name:
+                raise HTTPException(status_code=400, detail=f"❌ assets에 없는 파일: '{spec[field]}' ({field})")
+    check_executor(executor)
+    check_icon_format(icon_format)
+
+    temp_files: List[str] = []
+    try:
+        uploads: Dict[str, UploadInfo] = {}
+        uploads['project_zip'] = await save_upload(project_zip, '.zip', temp_files, MAX_UPLOAD_SIZE)
+
+        # 같은 파일을 여러 변형이 참조해도 한 번만 저장
+        asset_paths: Dict[str, str] = {}
+        for name, asset in assets_by_name.items():
+            info = await save_upload(asset, Path(name).suffix, temp_files)
+            uploads[f"assets/{name}"] = info
+            asset_paths[name] = info.path
+
+        variant_params = []
+        for spec in specs:
+            params = {
+                'name': spec.get('name'),
+                'new_package': spec['new_package'],
+                'new_app_name': spec['new_app_name'],
+                'new_base_url': spec.get('new_base_url'),
+            }
+            for field, param in BATCH_ASSET_FIELDS.items():
+                params[param] = asset_paths.get(spec.get(field))
+            variant_params.append(params)
+
+        params = {
+            'zip_path': uploads['project_zip'].path,
+            'variants': variant_params,
+            'include_log': include_log,
+            'zip_passthrough': zip_passthrough,
+            'executor': executor,
+            'workers': workers,
+            'icon_format': icon_format,
+        }
+        job = job_manager.submit(params, temp_files, uploads, method='process_batch')
+
+    except JobQueueFullError as e:
+        remove_temp_files(temp_files)
+        raise HTTPException(status_code=503, detail=f"❌ 처리 대기 중인 작업이 너무 많습니다. 잠시 후 다시 시도하세요. ({e})")
+    except Exception:
+        remove_temp_files(temp_files)
+        raise
+
+    return {'job_id': job.id, 'status': job.status, 'variants': len(specs)}
+
+
+@app.get("/jobs/{job_id}/variants/{index}/download")
+async def job_variant_download(job_id: str, index: int):
+    """배치 작업의 변형별 결과 ZIP 다운로드"""
+    job = get_job_or_404(job_id)
+    if job.method != 'process_batch':
+        raise HTTPException(status_code=404, detail=f"Job is not a batch job: {job_id}")
+    if job.status not in JOB_FINISHED_STATES:
+        raise HTTPException(status_code=409, detail={'error': 'Job is not finished yet', 'status': job.status})
+
+    output_zip = job.variant_output_zip(index)
+    if output_zip is None:
+        raise HTTPException(status_code=404, detail=f"Variant output not available: {index}")
+
+    name = job.result['variants'][index]['name']
+    return FileResponse(
+        path=output_zip,
+        media_type='application/zip',
+        filename=f"package_changed_{name}.zip"
+    )
+
+
+@app.delete("/jobs/{job_id}")
+async def delete_job(job_id: str):
+    """완료된 작업 및 결과 파일 삭제"""
+    job = get_job_or_404(job_id)
+    if not job_manager.remove(job.id):
+        raise HTTPException(status_code=409, detail={'error': 'Job is still running', 'status': job.status})
+    return {'job_id': job.id, 'deleted': True}
+
+
+@app.post("/templates", status_code=201)
+async def register_template(
+    project_zip: UploadFile = File(..., description="템플릿 Android 프로젝트 ZIP 파일"),
+    name: Optional[str] = Form(None, description="템플릿 표시 이름 (선택)")
+):
+    """
+    템플릿 등록 (압축 해제, 빌드 아티팩트 정리, 모듈/패키지 탐지를 미리 실행)
+
+    같은 ZIP을 다시 등록하면 기존 템플릿을 반환합니다.
+
+    Returns:
+        템플릿 정보 (template_id, app_module, old_package 등)
+    """
+    temp_files: List[str] = []
+    try:
+        upload = await save_upload(project_zip, '.zip', temp_files, MAX_UPLOAD_SIZE)
+        template = await run_in_threadpool(
+            template_registry.register, upload.path, upload.sha256, upload.size, name
+        )
+    except TemplateError as e:
+        raise HTTPException(status_code=400, detail={'error': '❌ 템플릿 준비 실패', 'logs': str(e).splitlines()})
     finally:
-        # 임시 파일 정리
-        for temp_file in temp_files:
-            try:
-                if Path(temp_file).exists():
-                    os.unlink(temp_file)
-            except:
-                pass
+        remove_temp_files(temp_files)
+
+    return template.to_dict()
+
+
+@app.get("/templates")
+async def list_templates():
+    """등록된 템플릿 목록"""
+    return [template.to_dict() for template in template_registry.list()]
+
+
+@app.get("/templates/{template_id}")
+async def get_template(template_id: str):
+    """템플릿 정보 조회"""
+    template = template_registry.get(template_id)
+    if template is None:
+        raise HTTPException(status_code=404, detail=f"Template not found: {template_id}")
+    return template.to_dict()
+
+
+@app.delete("/templates/{template_id}")
+async def delete_template(template_id: str):
+    """템플릿 삭제 (보관된 작업 공간 포함)"""
+    if not template_registry.remove(template_id):
+        raise HTTPException(status_code=404, detail=f"Template not found: {template_id}")
+    return {'template_id': template_id, 'deleted': True}
+
+
+@app.get("/cache/stats")
+async def cache_stats():
+    """결과 캐시, 아이콘 렌디션 캐시, 이전 빌드 보관소 상태 및 적중/실패 카운터"""
+    return dict(
+        result_cache.stats(),
+        renditions=get_rendition_cache().stats(),
+        workspaces=workspace_store.stats()
+    )
+
+
+@app.get("/metrics")
+async def metrics_endpoint():
+    """Prometheus 메트릭 (단계별 소요 시간/메모리, 치환 처리량, 업로드/결과 크기, 작업 큐, 캐시 적중률)"""
+    jobs = job_manager.stats()
+    metrics.JOBS_QUEUED.set(jobs['queued'])
+    metrics.JOBS_RUNNING.set(jobs['running'])
+    metrics.JOB_WORKERS.set(jobs['workers'])
+    for gauge, value in ((metrics.PROCESS_RSS, current_rss()), (metrics.PROCESS_PEAK_RSS, peak_rss())):
+        if value is not None:
+            gauge.set(value)
+
+    caches = {
+        'result': result_cache.stats(),
+        'renditions': get_rendition_cache().stats(),
+        'workspaces': workspace_store.stats(),
+    }
+    for name, stats in caches.items():
+        metrics.CACHE_HITS.set_total(stats['hits'], cache=name)
+        metrics.CACHE_MISSES.set_total(stats['misses'], cache=name)
+        metrics.CACHE_HIT_RATIO.set(stats['hit_ratio'], cache=name)
+        metrics.CACHE_ENTRIES.set(stats['entries'], cache=name)
+
+    return Response(metrics.REGISTRY.render(), media_type=metrics.CONTENT_TYPE)
 
 
 @app.get("/health")
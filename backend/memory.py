@@ -0,0 +1,121 @@
+"""
+단계별 메모리 측정 (선택 기능, TRACK_MEMORY=1 또는 AndroidProjectProcessor(track_memory=True))
+- 할당 최고치: tracemalloc으로 측정한 구간 중 파이썬 할당량 최고치 (구간 시작 시점 대비)
+- RSS 변화: 구간 전후 프로세스 상주 메모리 차이 (Linux /proc/self/statm)
+- tracemalloc은 측정 중인 구간이 있을 때만 켜고, 모두 끝나면 끔 (이미 켜져 있었으면 그대로 둠)
+- 할당량과 RSS는 프로세스 전체 값이므로 동시에 실행되는 단계/작업이 있으면 그만큼 함께 포함됨 (상한값)
+"""
+import os
+import sys
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+try:
+    import resource
+    RESOURCE_AVAILABLE = True
+except ImportError:
+    RESOURCE_AVAILABLE = False
+
+
+# 기본 측정 여부 (tracemalloc은 할당마다 추적 비용이 있으므로 기본은 끔)
+DEFAULT_TRACK_MEMORY = os.environ.get('TRACK_MEMORY', '').lower() in ('1', 'true', 'yes')
+
+_PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+_lock = threading.Lock()
+_sections: List['_Section'] = []
+_started_tracing = False
+
+
+class _Section:
+    """측정 중인 구간 (시작 시점 할당량과 구간 중 최고치)"""
+
+    def __init__(self, start: int):
+        self.start = start
+        self.peak = start
+
+
+def current_rss() -> Optional[int]:
+    """현재 프로세스 RSS (바이트, 확인할 수 없으면 None)"""
+    try:
+        with open('/proc/self/statm', encoding='ascii') as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def peak_rss() -> Optional[int]:
+    """프로세스 시작 이후 최고 RSS (바이트, 확인할 수 없으면 None)"""
+    if not RESOURCE_AVAILABLE:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS는 바이트, 나머지는 KB 단위 (단위 차이로 현재 RSS보다 작게 보이지 않도록 보정)
+    peak = peak if sys.platform == 'darwin' else peak * 1024
+    return max(peak, current_rss() or 0)
+
+
+def _fold_peak() -> None:
+    """마지막 최고치 초기화 이후의 최고치를 측정 중인 모든 구간에 반영 (_lock 보유 상태에서 호출)"""
+    _, peak = tracemalloc.get_traced_memory()
+    for section in _sections:
+        section.peak = max(section.peak, peak)
+
+
+def _enter() -> _Section:
+    global _started_tracing
+    with _lock:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _started_tracing = True
+        # 다른 구간의 최고치를 먼저 반영한 뒤 초기화해 이 구간 시작 전 최고치가 섞이지 않도록 함
+        _fold_peak()
+        tracemalloc.reset_peak()
+        section = _Section(tracemalloc.get_traced_memory()[0])
+        _sections.append(section)
+        return section
+
+
+def _exit(section: _Section) -> None:
+    global _started_tracing
+    with _lock:
+        if tracemalloc.is_tracing():
+            _fold_peak()
+        _sections.remove(section)
+        if not _sections and _started_tracing:
+            tracemalloc.stop()
+            _started_tracing = False
+
+
+@contextmanager
+def measure() -> Iterator[Dict[str, Optional[int]]]:
+    """
+    구간 메모리 측정 (구간이 끝나면 넘겨준 dict가 채워짐)
+
+    Yields:
+        {
+            'alloc_peak': int,            # 구간 중 파이썬 할당량 최고치 - 시작 시점 할당량 (바이트)
+            'rss_delta': Optional[int],   # 구간 후 RSS - 구간 전 RSS (바이트, 음수 가능)
+        }
+    """
+    usage: Dict[str, Optional[int]] = {}
+    rss_before = current_rss()
+    section = _enter()
+    try:
+        yield usage
+    finally:
+        _exit(section)
+        rss_after = current_rss()
+        usage['alloc_peak'] = max(0, section.peak - section.start)
+        usage['rss_delta'] = rss_after - rss_before if rss_before is not None and rss_after is not None else None
+
+
+def merge_usage(existing: Optional[Dict], usage: Dict) -> Dict:
+    """같은 단계의 여러 구간 합치기 (할당 최고치는 최댓값, RSS 변화는 합계)"""
+    if existing is None:
+        return dict(usage)
+    rss_delta = existing['rss_delta']
+    if usage['rss_delta'] is not None:
+        rss_delta = usage['rss_delta'] + (rss_delta or 0)
+    return {'alloc_peak': max(existing['alloc_peak'], usage['alloc_peak']), 'rss_delta': rss_delta}
@@ -0,0 +1,257 @@
+"""
+Prometheus 텍스트 형식 메트릭 (외부 의존성 없는 최소 구현)
+- Counter / Gauge / Histogram, 레이블 지원
+- 값은 프로세스별 메모리에 보관 (여러 서버 프로세스는 각각 수집)
+- GET /metrics에서 REGISTRY.render() 결과를 그대로 반환
+"""
+import math
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+# Prometheus 텍스트 노출 형식
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# 단계/작업 소요 시간 버킷 (초)
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+# 업로드/결과 크기 버킷 (1KB ~ 1GB, 4배 간격)
+SIZE_BUCKETS = tuple(float(1024 * 4 ** power) for power in range(11))
+
+Sample = Tuple[str, Dict[str, str], float]
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + '}'
+
+
+class Metric:
+    """
+    레이블별 값을 보관하는 메트릭 (하위 클래스가 종류별 값/샘플 정의)
+
+    Args:
+        name: 메트릭 이름 (rebuild_ 접두사)
+        documentation: HELP 설명
+        labelnames: 레이블 이름 (값을 기록할 때 모두 지정해야 함)
+    """
+
+    kind = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key: Tuple[str, ...]) -> Dict[str, str]:
+        return dict(zip(self.labelnames, key))
+
+    def samples(self) -> List[Sample]:
+        """(이름 접미사, 레이블, 값) 목록"""
+        with self._lock:
+            return [('', self._labels(key), value) for key, value in sorted(self._values.items())]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, labels, value in self.samples():
+            lines.append(f"{self.name}{suffix}{_format_labels(labels)} {_format_value(value)}")
+        return lines
+
+
+class Counter(Metric):
+    """누적값 (감소하지 않음)"""
+
+    kind = 'counter'
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        if amount < 0:
+            raise ValueError(f"{self.name}: counters can only increase")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def set_total(self, value: float, **labels) -> None:
+        """다른 곳에서 관리하는 누적값 반영 (캐시 적중 카운터 등, 수집 시점에 호출)"""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Gauge(Metric):
+    """현재값"""
+
+    kind = 'gauge'
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(Metric):
+    """
+    버킷별 누적 관측 수 + 합계/개수
+
+    Args:
+        buckets: 버킷 상한 (오름차순, +Inf는 자동 추가)
+    """
+
+    kind = 'histogram'
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DURATION_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            counts = state[0]
+            for position, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[position] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+
+    def mean(self, **labels) -> Optional[float]:
+        """관측값 평균 (관측이 없으면 None)"""
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None or not state[2]:
+                return None
+            return state[1] / state[2]
+
+    def samples(self) -> List[Sample]:
+        samples: List[Sample] = []
+        with self._lock:
+            items = sorted((key, (list(state[0]), state[1], state[2])) for key, state in self._values.items())
+        for key, (counts, total, count) in items:
+            labels = self._labels(key)
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                samples.append(('_bucket', dict(labels, le=_format_value(bound)), cumulative))
+            samples.append(('_sum', labels, total))
+            samples.append(('_count', labels, count))
+        return samples
+
+
+class Registry:
+    """메트릭 모음 (이름 중복 불가)"""
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: Metric) -> Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric already registered: {metric.name}")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def get(self, name: str) -> Optional[Metric]:
+        with self._lock:
+            return self._metrics.get(name)
+
+    def render(self) -> str:
+        """Prometheus 텍스트 형식"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+# 프로세스 공용 레지스트리
+REGISTRY = Registry()
+
+
+def counter(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+    return REGISTRY.register(Counter(name, documentation, labelnames))
+
+
+def gauge(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+    return REGISTRY.register(Gauge(name, documentation, labelnames))
+
+
+def histogram(
+    name: str,
+    documentation: str,
+    labelnames: Sequence[str] = (),
+    buckets: Sequence[float] = DURATION_BUCKETS
+) -> Histogram:
+    return REGISTRY.register(Histogram(name, documentation, labelnames, buckets))
+
+
+# 파이프라인 처리 (작업 완료 시 JobManager가 기록)
+STEP_DURATION = histogram(
+    'rebuild_step_duration_seconds', 'Pipeline step duration (completed steps only)', ('step', 'title')
+)
+JOB_DURATION = histogram(
+    'rebuild_job_duration_seconds', 'Job duration from start to finish', ('method', 'status')
+)
+JOBS_FINISHED = counter('rebuild_jobs_finished_total', 'Finished jobs', ('method', 'status'))
+FILES_SCANNED = counter('rebuild_files_scanned_total', 'Text files scanned by the single-pass rewrite')
+FILES_REWRITTEN = counter('rebuild_files_rewritten_total', 'Text files rewritten by the single-pass rewrite')
+BYTES_READ = counter('rebuild_rewrite_bytes_read_total', 'Bytes of text files scanned by the single-pass rewrite')
+BYTES_WRITTEN = counter('rebuild_rewrite_bytes_written_total', 'Bytes of text files written by the single-pass rewrite')
+STEP_MEMORY_PEAK = histogram(
+    'rebuild_step_memory_peak_bytes', 'Peak Python allocations during a step (TRACK_MEMORY only)',
+    ('step', 'title'), SIZE_BUCKETS
+)
+STEP_RSS_GROWTH = histogram(
+    'rebuild_step_rss_growth_bytes', 'Process RSS growth during a step (TRACK_MEMORY only)',
+    ('step', 'title'), SIZE_BUCKETS
+)
+JOB_MEMORY_PEAK = histogram(
+    'rebuild_job_memory_peak_bytes', 'Largest step allocation peak per job (TRACK_MEMORY only)',
+    ('method',), SIZE_BUCKETS
+)
+UPLOAD_SIZE = histogram('rebuild_upload_size_bytes', 'Uploaded file size', ('field',), SIZE_BUCKETS)
+OUTPUT_SIZE = histogram('rebuild_output_size_bytes', 'Output ZIP size', ('method',), SIZE_BUCKETS)
+
+# 작업 큐 / 캐시 상태 (GET /metrics 수집 시점에 갱신)
+JOBS_QUEUED = gauge('rebuild_jobs_queued', 'Jobs waiting for a worker')
+JOBS_RUNNING = gauge('rebuild_jobs_in_flight', 'Jobs currently running')
+JOB_WORKERS = gauge('rebuild_job_workers', 'Configured job worker threads')
+PROCESS_RSS = gauge('rebuild_process_resident_memory_bytes', 'Current process resident memory')
+PROCESS_PEAK_RSS = gauge('rebuild_process_peak_resident_memory_bytes', 'Peak process resident memory since start')
+CACHE_HITS = counter('rebuild_cache_hits_total', 'Cache lookups that hit', ('cache',))
+CACHE_MISSES = counter('rebuild_cache_misses_total', 'Cache lookups that missed', ('cache',))
+CACHE_HIT_RATIO = gauge('rebuild_cache_hit_ratio', 'Cache hit ratio since process start', ('cache',))
+CACHE_ENTRIES = gauge('rebuild_cache_entries', 'Cache entries', ('cache',))
@@ -1,31 +1,371 @@
 """
 Android 프로젝트 리빌드 전체 파이프라인
 """
+import hashlib
+import os
+import re
 import tempfile
 import shutil
+import threading
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, List
+from typing import Callable, Collection, Dict, Iterator, List, Optional, Tuple
 
-from backend.utils.zip_tools import extract_zip, create_zip, get_app_module_path
+from backend import memory
+from backend.joblog import JobLog
+from backend.scheduler import Step, run_steps
+from backend.utils.zip_tools import ZipStream, extract_zip, create_zip, get_app_module_path
 from backend.utils.cleanup import clean_build_artifacts
 from backend.utils.file_replace import (
     detect_old_package_name,
+    plan_package_directory_moves,
     replace_package_name,
     replace_app_name,
     reset_version
 )
 from backend.utils.firebase import replace_google_services
-from backend.utils.icon_replace import replace_app_icon
-from backend.utils.baseurl_replace import replace_base_url
+from backend.utils.icon_replace import (
+    ICON_FORMAT_PNG,
+    SPLASH_FILENAME,
+    can_replace_icon,
+    can_replace_splash,
+    plan_icon_targets,
+    render_images,
+    replace_app_icon,
+    resolve_output_format
+)
+from backend.utils.baseurl_replace import detect_old_base_urls, replace_base_url
+from backend.utils.project_index import ROLE_TEXT, ProjectIndex, needs_extraction
+from backend.utils.rewrite_plan import (
+    EXECUTOR_SERIAL,
+    STEP_APP_NAME,
+    STEP_BASE_URL,
+    STEP_ICON,
+    STEP_PACKAGE,
+    STEP_PACKAGE_BULK,
+    STEP_SPLASH,
+    STEP_VERSION,
+    RewritePlan,
+    build_rewrite_plan
+)
+
+
+# 파이프라인 단계 제목 (로그 헤더 및 진행 상황 보고에 사용)
+STEP_TITLES = [
+    'Extract ZIP',
+    'Clean Build Artifacts',
+    'Detect App Module',
+    'Detect Old Package',
+    'Replace Package Name',
+    'Replace App Name',
+    'Reset Version',
+    'Replace Firebase Config',
+    'Replace App Icon & Splash',
+    'Replace BASE_URL',
+    'Create Output ZIP',
+]
+
+# 준비 단계 수 (1~4단계는 변형과 무관하여 배치/템플릿에서 한 번만 실행)
+PREPARE_STEPS = 4
+
+# 변형 단계(5~11단계)별 입력 파라미터
+# 증분 재적용에서는 입력이 바뀐 단계만 다시 실행 (파일 경로 파라미터는 경로가 아니라 내용 해시로 비교)
+STEP_INPUTS = {
+    5: ('new_package',),
+    6: ('new_app_name',),
+    7: (),
+    8: ('google_services_path', 'new_package'),
+    9: ('icon_path', 'splash_path', 'icon_format'),
+    10: ('new_base_url',),
+    11: ('new_app_name', 'include_log'),
+}
+# 변형 이름에 허용하지 않는 문자 (ZIP 멤버명/다운로드 파일명에 그대로 쓰임)
+VARIANT_NAME_UNSAFE = re.compile(r'[^A-Za-z0-9._-]+')
+# 내용 해시로 비교하는 파일 입력
+FILE_INPUTS = ('google_services_path', 'icon_path', 'splash_path')
+# 값이 없어지면 이미 적용된 결과를 원본으로 되돌릴 수 없는 입력 (전체 재빌드 필요)
+IRREVERSIBLE_INPUTS = ('google_services_path', 'icon_path', 'splash_path', 'new_base_url')
+# 단계별 텍스트 치환 규칙 (RewriteRule.step)
+STEP_RULES = {
+    5: (STEP_PACKAGE, STEP_PACKAGE_BULK),
+    6: (STEP_APP_NAME,),
+    7: (STEP_VERSION,),
+    9: (STEP_ICON, STEP_SPLASH),
+    10: (STEP_BASE_URL,),
+}
+
+# 배치 변형 스펙에서 허용하는 키 (process 인자와 동일한 이름)
+VARIANT_KEYS = (
+    'new_package', 'new_app_name', 'google_services_path', 'icon_path',
+    'splash_path', 'new_base_url'
+)
+
+
+class PreparedProject:
+    """
+    준비 단계(압축 해제, 정리, 모듈/패키지 탐지)가 끝난 작업 공간
+
+    여러 변형이 공유하며, 각 변형은 clone()으로 얻은 복사본에서 편집합니다.
+    """
+
+    def __init__(
+        self,
+        workspace: str,
+        project_root: Path,
+        index: ProjectIndex,
+        app_module: Path,
+        old_package: Optional[str],
+        logs: List[str]
+    ):
+        self.workspace = workspace
+        self.project_root = Path(project_root)
+        self.index = index
+        self.app_module = Path(app_module)
+        self.old_package = old_package
+        self.logs = list(logs)  # 준비 단계(1~4단계) 로그
+
+    def clone(self, temp_dir: str):
+        """
+        작업 공간을 temp_dir 아래로 복사
+
+        Returns:
+            (project_root, index, app_module) - 복사본 기준
+        """
+        # 원본 작업 공간은 읽기 전용으로 취급하므로 여러 변형이 동시에 복사해도 안전
+        project_root = Path(temp_dir) / self.project_root.name
+        shutil.copytree(self.project_root, project_root)
+        index = self.index.clone(project_root)
+        app_module = project_root / self.app_module.relative_to(self.project_root)
+        return project_root, index, app_module
+
+    def cleanup(self) -> None:
+        """작업 공간 삭제"""
+        shutil.rmtree(self.workspace, ignore_errors=True)
+
+
+class BuildRecord:
+    """
+    증분 재적용을 위해 보관하는 이전 빌드 (작업 공간 + 단계 입력 기록 + 결과 ZIP)
+
+    directory 아래의 작업 공간과 결과 ZIP은 이 레코드가 소유하며,
+    process()/process_prepared()의 previous로 넘기면 해당 프로세서로 소유권이 넘어갑니다.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        project_root: Path,
+        index: ProjectIndex,
+        app_module: Path,
+        old_package: Optional[str],
+        inputs: Dict,
+        snapshot: Dict[str, Tuple],
+        output_zip: str,
+        folder_name: str
+    ):
+        self.directory = directory
+        self.project_root = Path(project_root)
+        self.index = index
+        self.app_module = Path(app_module)
+        self.old_package = old_package
+        self.inputs = inputs            # fingerprint_inputs() 결과
+        self.snapshot = snapshot        # snapshot_files() 결과 (결과 ZIP 생성 시점)
+        self.output_zip = output_zip
+        self.folder_name = folder_name  # 결과 ZIP 내부 루트 폴더명
+
+    def cleanup(self) -> None:
+        """작업 공간 및 결과 ZIP 삭제"""
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+def fingerprint_inputs(params: Dict) -> Dict:
+    """
+    단계 입력 기록 (파일 입력은 내용 SHA-256, 없으면 None)
+
+    Args:
+        params: 변형 파라미터 (STEP_INPUTS의 키)
+    """
+    inputs = {}
+    for key in sorted({key for keys in STEP_INPUTS.values() for key in keys}):
+        value = params.get(key)
+        if key in FILE_INPUTS and value:
+            digest = hashlib.sha256()
+            with open(value, 'rb') as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                    digest.update(chunk)
+            value = digest.hexdigest()
+        inputs[key] = value or None
+    return inputs
+
+
+def incremental_steps(previous: Dict, current: Dict) -> Tuple[Optional[List[int]], str]:
+    """
+    이전 빌드의 입력 기록과 비교해 다시 실행할 단계 결정
+
+    Returns:
+        (다시 실행할 단계 번호 목록 또는 None(전체 재빌드 필요), 사유)
+    """
+    changed = [key for key in current if current[key] != previous.get(key)]
+    if 'new_package' in changed:
+        return None, 'new_package changed'
+    for key in IRREVERSIBLE_INPUTS:
+        if previous.get(key) and not current.get(key):
+            return None, f"{key} removed"
+
+    # 결과 ZIP 생성(11단계)은 항상 실행 (로그 파일 갱신, 바뀐 항목만 다시 압축)
+    steps = [number for number, keys in sorted(STEP_INPUTS.items())
+             if number == 11 or any(key in changed for key in keys)]
+    return steps, (f"changed {', '.join(changed)}" if changed else 'no inputs changed')
+
+
+def snapshot_files(index: ProjectIndex) -> Dict[str, Tuple]:
+    """
+    파일별 상태 (크기, 수정 시각) - 증분 재적용에서 바뀐 파일 판단에 사용
+
+    패스스루 파일은 디스크에 없으므로 원본 멤버명으로 기록합니다.
+    """
+    snapshot = {}
+    for rel, record in index.records():
+        if record.source is not None:
+            snapshot[rel] = ('archive', record.source)
+            continue
+        try:
+            stat = os.stat(index.path(rel))
+        except OSError:
+            continue
+        snapshot[rel] = (stat.st_size, stat.st_mtime_ns)
+    return snapshot
 
 
 class AndroidProjectProcessor:
     """Android 프로젝트 리빌드 프로세서"""
 
-    def __init__(self):
-        self.logs: List[str] = []
+    def __init__(self, track_memory: bool = memory.DEFAULT_TRACK_MEMORY):
+        # 작업 로그 (크기 제한, List[str]처럼 사용)
+        self.logs = JobLog()
         self.temp_dir = None
         self.project_root = None
+        self.index = None
+        self.rewrite = None
+        self.current_step = 0
+        # 끝난 단계별 실행 시간(초) (메트릭용, 단일 패스 치환은 첫 변형 단계에 포함)
+        self.step_durations: Dict[int, float] = {}
+        # 단계별 메모리 사용량 (track_memory일 때만, backend.memory.measure() 참고)
+        self.track_memory = track_memory
+        self.step_memory: Dict[int, Dict[str, Optional[int]]] = {}
+        self._memory_lock = threading.Lock()
+        # 배치 처리 시 변형별 프로세서
+        self.variants: List['AndroidProjectProcessor'] = []
+        # 단계 시작 시 호출되는 콜백 (step_number, step_title)
+        self.progress_callback: Optional[Callable[[int, str], None]] = None
+        # 단계 시작/완료 이벤트 콜백 (진행 상황 스트림용, 동시에 실행되는 단계의 작업 스레드에서 호출될 수 있음)
+        self.event_callback: Optional[Callable[[Dict], None]] = None
+        self._started_steps = set()
+        self._event_lock = threading.Lock()
+        # 결과 ZIP 스트리밍 출력 (있으면 압축하면서 바로 전송, keep_output이면 같은 바이트를 결과 ZIP 파일에도 기록)
+        self.output_stream: Optional[ZipStream] = None
+        self.keep_output = True
+        # 증분 재적용용 빌드 정보 (detach_build()에서 사용)
+        self.app_module: Optional[Path] = None
+        self.old_package: Optional[str] = None
+        self.inputs: Optional[Dict] = None
+        self.output_zip: Optional[str] = None
+        self.folder_name: Optional[str] = None
+
+    def _begin_step(self, number: int) -> None:
+        """단계 헤더 로그 기록 및 진행 상황 갱신"""
+        title = STEP_TITLES[number - 1]
+        self.logs.append(f"\n--- Step {number}: {title} ---")
+        self.current_step = number
+        if self.progress_callback:
+            self.progress_callback(number, title)
+        self._step_started(number)
+
+    def _emit(self, event: str, **fields) -> None:
+        if self.event_callback:
+            self.event_callback(dict(fields, event=event))
+
+    def _step_started(self, number: int) -> None:
+        """단계 시작 이벤트 (단계마다 한 번)"""
+        with self._event_lock:
+            if number in self._started_steps:
+                return
+            self._started_steps.add(number)
+        self._emit('step_started', step=number, title=STEP_TITLES[number - 1])
+
+    def _step_finished(self, number: int, seconds: float) -> None:
+        """단계 완료 이벤트 (실행 시간과 현재 파일 카운터 포함)"""
+        self._emit(
+            'step_finished', step=number, title=STEP_TITLES[number - 1],
+            duration=round(seconds, 6), counters=self.counters()
+        )
+
+    def counters(self) -> Dict[str, int]:
+        """진행 상황 파일 카운터 (인덱스 파일 수, 단일 패스 치환 처리량)"""
+        counters = {}
+        if self.index is not None:
+            counters['files'] = len(self.index)
+        if self.rewrite is not None:
+            counters.update(
+                files_scanned=self.rewrite.files_scanned,
+                files_rewritten=self.rewrite.files_written,
+                bytes_read=self.rewrite.bytes_read,
+                bytes_written=self.rewrite.bytes_written
+            )
+        return counters
+
+    @contextmanager
+    def _timed(self, number: int) -> Iterator[None]:
+        """단계 실행 시간과 메모리 사용량 기록 (예외로 끝난 단계는 기록하지 않음)"""
+        started_at = time.perf_counter()
+        with self._measured(number):
+            yield
+        seconds = time.perf_counter() - started_at
+        self._add_duration(number, seconds)
+        self._step_finished(number, seconds)
+
+    @contextmanager
+    def _measured(self, number: int) -> Iterator[None]:
+        """단계 메모리 사용량 기록 (track_memory일 때만, 예외로 끝난 단계는 기록하지 않음)"""
+        if not self.track_memory:
+            yield
+            return
+        with memory.measure() as usage:
+            yield
+        self._add_memory(number, usage)
+
+    def _add_duration(self, number: int, seconds: float) -> None:
+        self.step_durations[number] = self.step_durations.get(number, 0.0) + seconds
+
+    def _add_memory(self, number: int, usage: Dict[str, Optional[int]]) -> None:
+        with self._memory_lock:
+            self.step_memory[number] = memory.merge_usage(self.step_memory.get(number), usage)
+
+    def memory_report(self) -> Optional[Dict]:
+        """
+        단계별 메모리 사용량 (track_memory가 아니면 None)
+
+        Returns:
+            {
+                'steps': List[Dict],       # step, title, alloc_peak, rss_delta (바이트)
+                'alloc_peak': int,         # 단계 중 가장 큰 할당 최고치
+                'peak_rss': Optional[int]  # 프로세스 최고 RSS (다른 작업 포함)
+            }
+        """
+        if not self.track_memory:
+            return None
+        steps = [
+            dict(usage, step=number, title=STEP_TITLES[number - 1])
+            for number, usage in sorted(self.step_memory.items())
+        ]
+        return {
+            'steps': steps,
+            'alloc_peak': max((usage['alloc_peak'] for usage in steps), default=0),
+            'peak_rss': memory.peak_rss(),
+        }
 
     def process(
         self,
@@ -36,7 +376,13 @@ class AndroidProjectProcessor:
         icon_path: str = None,
         splash_path: str = None,
         new_base_url: str = None,
-        include_log: bool = True
+        include_log: bool = True,
+        zip_passthrough: bool = False,
+        executor: str = EXECUTOR_SERIAL,
+        workers: Optional[int] = None,
+        icon_format: str = ICON_FORMAT_PNG,
+        dry_run: bool = False,
+        previous: Optional[BuildRecord] = None
     ) -> Dict:
         """
         전체 리빌드 프로세스 실행
@@ -50,12 +396,30 @@ class AndroidProjectProcessor:
             splash_path: 스플래시 이미지 경로 (선택)
             new_base_url: 새 BASE_URL (선택)
             include_log: 로그 파일 포함 여부 (기본: True)
+            zip_passthrough: 패스스루 모드 (기본: False)
+                - 단계에서 읽거나 수정하는 텍스트 파일만 압축 해제
+                - 나머지 파일(jar, 이미지 등)은 원본 ZIP의 압축된 바이트를 그대로 복사
+            executor: 파일 단위 텍스트 치환 실행 모드 ('serial', 'thread', 'process')
+            workers: 병렬 워커 수 (None이면 CPU 수와 파일 수로 자동 결정)
+            icon_format: 아이콘/스플래시 출력 형식 ('png', 'optimized', 'webp')
+                - optimized: 최적화 PNG (색상이 256개 이하면 무손실 팔레트 PNG)
+                - webp: 무손실 WebP (minSdk 18 미만이거나 확인 불가하면 optimized로 대체)
+            dry_run: 변경 계획만 계산 (기본: False)
+                - 탐지와 모든 치환 규칙은 실행하지만 파일을 기록하지 않고 결과 ZIP도 만들지 않음
+                - 텍스트 파일만 압축 해제 (패스스루와 같은 방식)
+            previous: 같은 프로젝트의 이전 빌드 (detach_build()로 보관한 BuildRecord, 소유권이 넘어옴)
+                - 입력이 바뀐 단계만 이전 작업 공간에 다시 실행하고, 바뀐 파일만 다시 압축
+                - 재적용할 수 없으면(패키지명 변경 등) 이전 작업 공간을 삭제하고 전체 빌드
 
         Returns:
             {
                 'success': bool,
-                'output_zip': str,
-                'logs': List[str]
+                'output_zip': str,               # 드라이런이거나 output_stream으로만 보낸 경우(keep_output=False) None
+                'logs': List[str],
+                'changes': Dict[str, List[str]], # 파일별 적용된 치환 규칙
+                'dry_run': bool,                 # 드라이런일 때만
+                'plan': Dict,                    # 드라이런일 때만 (_plan_variant 참고)
+                'incremental_steps': List[int]   # 증분 재적용일 때만 (다시 실행한 단계)
             }
         """
         try:
@@ -67,107 +431,908 @@ class AndroidProjectProcessor:
             self.temp_dir = tempfile.mkdtemp(prefix='android_rebuild_')
             self.logs.append(f"[INIT] Created temp directory: {self.temp_dir}")
 
-            # 2. ZIP 압축 해제
-            self.logs.append("\n--- Step 1: Extract ZIP ---")
-            self.project_root, extract_logs = extract_zip(zip_path, self.temp_dir)
+            if previous is not None:
+                result = self._reuse_or_discard(
+                    previous, dry_run, executor, workers,
+                    new_package=new_package,
+                    new_app_name=new_app_name,
+                    google_services_path=google_services_path,
+                    icon_path=icon_path,
+                    splash_path=splash_path,
+                    new_base_url=new_base_url,
+                    include_log=include_log,
+                    icon_format=icon_format
+                )
+                if result is not None:
+                    return result
+
+            # 드라이런은 텍스트 파일만 있으면 되므로 나머지는 압축 해제하지 않음
+            app_module, old_package = self._prepare_steps(zip_path, zip_passthrough or dry_run)
+
+            if dry_run:
+                return self._plan_variant(
+                    app_module,
+                    old_package,
+                    new_package,
+                    new_app_name,
+                    icon_path,
+                    splash_path,
+                    new_base_url,
+                    executor,
+                    workers,
+                    icon_format
+                )
+
+            return self._apply_variant(
+                app_module,
+                old_package,
+                new_package,
+                new_app_name,
+                google_services_path,
+                icon_path,
+                splash_path,
+                new_base_url,
+                include_log,
+                executor,
+                workers,
+                icon_format
+            )
+
+        except Exception as e:
+            error_msg = f"[ERROR] Processing failed: {str(e)}"
+            self.logs.append(error_msg)
+            return {
+                'success': False,
+                'output_zip': None,
+                'logs': self.logs,
+                'error': str(e)
+            }
+
+    def prepare(
+        self,
+        zip_path: str,
+        zip_passthrough: bool = False,
+        workspace: Optional[str] = None
+    ) -> PreparedProject:
+        """
+        준비 단계만 실행하여 여러 변형이 공유할 작업 공간 생성
+
+        Args:
+            zip_path: 프로젝트 ZIP 경로 (패스스루 모드면 작업 공간을 쓰는 동안 유지해야 함)
+            zip_passthrough: 패스스루 모드
+            workspace: 작업 공간 디렉토리 (None이면 임시 디렉토리 생성)
+
+        Returns:
+            PreparedProject (작업 공간은 이 프로세서의 temp_dir)
+
+        Raises:
+            Exception: 준비 단계 실패 시
+        """
+        self.logs.append("=" * 60)
+        self.logs.append("Android Project Rebuilder - Preparing Project")
+        self.logs.append("=" * 60)
+
+        if workspace:
+            Path(workspace).mkdir(parents=True, exist_ok=True)
+            self.temp_dir = str(workspace)
+        else:
+            self.temp_dir = tempfile.mkdtemp(prefix='android_prepare_')
+        self.logs.append(f"[INIT] Created temp directory: {self.temp_dir}")
+
+        start = len(self.logs)
+        app_module, old_package = self._prepare_steps(zip_path, zip_passthrough)
+        return PreparedProject(
+            self.temp_dir, self.project_root, self.index, app_module, old_package, self.logs[start:]
+        )
+
+    def process_prepared(
+        self,
+        prepared: PreparedProject,
+        new_package: str,
+        new_app_name: str,
+        google_services_path: str = None,
+        icon_path: str = None,
+        splash_path: str = None,
+        new_base_url: str = None,
+        include_log: bool = True,
+        executor: str = EXECUTOR_SERIAL,
+        workers: Optional[int] = None,
+        icon_format: str = ICON_FORMAT_PNG,
+        dry_run: bool = False,
+        previous: Optional[BuildRecord] = None
+    ) -> Dict:
+        """
+        준비된 작업 공간의 복사본에 변형 적용 (5~11단계만 실행)
+
+        Args:
+            prepared: prepare()로 만든 작업 공간 (변경되지 않음)
+            dry_run: 변경 계획만 계산 (작업 공간을 복사하지 않고 읽기만 함)
+            previous: 같은 템플릿의 이전 빌드 (재적용할 수 있으면 복사 대신 사용)
+            나머지: process()와 동일
+
+        Returns:
+            process()와 동일
+        """
+        try:
+            self.logs.append("=" * 60)
+            self.logs.append("Android Project Rebuilder - Processing Started")
+            self.logs.append("=" * 60)
+
+            self.temp_dir = tempfile.mkdtemp(prefix='android_rebuild_')
+            self.logs.append(f"[INIT] Created temp directory: {self.temp_dir}")
+
+            if previous is not None:
+                result = self._reuse_or_discard(
+                    previous, dry_run, executor, workers,
+                    new_package=new_package,
+                    new_app_name=new_app_name,
+                    google_services_path=google_services_path,
+                    icon_path=icon_path,
+                    splash_path=splash_path,
+                    new_base_url=new_base_url,
+                    include_log=include_log,
+                    icon_format=icon_format
+                )
+                if result is not None:
+                    return result
+
+            # 준비 단계 로그를 그대로 이어 붙여 단일 처리와 같은 로그 구성 유지
+            self.logs.extend(prepared.logs)
+            self.current_step = PREPARE_STEPS
+
+            if dry_run:
+                # 계획 계산은 파일을 쓰지 않으므로 준비된 작업 공간을 그대로 읽음
+                self.project_root, self.index = prepared.project_root, prepared.index
+                return self._plan_variant(
+                    prepared.app_module,
+                    prepared.old_package,
+                    new_package,
+                    new_app_name,
+                    icon_path,
+                    splash_path,
+                    new_base_url,
+                    executor,
+                    workers,
+                    icon_format
+                )
+
+            self.project_root, self.index, app_module = prepared.clone(self.temp_dir)
+            self.logs.append(f"[PREPARED] Cloned prepared workspace ({len(self.index)} files)")
+
+            return self._apply_variant(
+                app_module,
+                prepared.old_package,
+                new_package,
+                new_app_name,
+                google_services_path,
+                icon_path,
+                splash_path,
+                new_base_url,
+                include_log,
+                executor,
+                workers,
+                icon_format
+            )
+
+        except Exception as e:
+            error_msg = f"[ERROR] Processing failed: {str(e)}"
+            self.logs.append(error_msg)
+            return {
+                'success': False,
+                'output_zip': None,
+                'logs': self.logs,
+                'error': str(e)
+            }
+
+    def process_batch(
+        self,
+        zip_path: str,
+        variants: List[Dict],
+        include_log: bool = True,
+        zip_passthrough: bool = False,
+        executor: str = EXECUTOR_SERIAL,
+        workers: Optional[int] = None,
+        max_parallel: Optional[int] = None,
+        icon_format: str = ICON_FORMAT_PNG
+    ) -> Dict:
+        """
+        하나의 프로젝트로 여러 화이트라벨 변형을 생성
+
+        압축 해제/정리/탐지는 한 번만 실행하고, 변형은 작업 공간 복사본에서 동시에 처리합니다.
+
+        Args:
+            zip_path: 업로드된 프로젝트 ZIP 경로
+            variants: 변형 스펙 목록 (VARIANT_KEYS + 선택적 'name')
+            include_log: 변형별 ZIP에 로그 파일 포함 여부
+            zip_passthrough: 패스스루 모드
+            executor: 변형별 텍스트 치환 실행 모드
+            workers: 변형별 병렬 워커 수
+            max_parallel: 동시에 처리할 변형 수 (None이면 min(변형 수, 4))
+            icon_format: 모든 변형에 적용할 아이콘/스플래시 출력 형식
+
+        Returns:
+            {
+                'success': bool,                # 모든 변형 성공 여부
+                'output_zip': str,              # 성공한 변형 ZIP을 묶은 아카이브
+                'logs': List[str],
+                'variants': List[Dict]          # 변형별 name, success, output_zip, error
+            }
+        """
+        try:
+            if not variants:
+                raise ValueError("No variants given")
+
+            prepared = self.prepare(zip_path, zip_passthrough)
+            names = _unique_variant_names(variants)
+
+            self.logs.append("\n--- Batch: Build Variants ---")
+            self.logs.append(f"[BATCH] Building {len(variants)} variants from one prepared workspace")
+
+            def build(position: int) -> Dict:
+                spec = {key: variants[position].get(key) for key in VARIANT_KEYS}
+                return self.variants[position].process_prepared(
+                    prepared, include_log=include_log, executor=executor, workers=workers,
+                    icon_format=icon_format, **spec
+                )
+
+            self.variants = [AndroidProjectProcessor(self.track_memory) for _ in variants]
+            for position, variant in enumerate(self.variants):
+                variant.event_callback = self._variant_event_callback(position)
+            parallel = max_parallel or min(len(variants), 4)
+            with ThreadPoolExecutor(max_workers=parallel, thread_name_prefix='rebuild-variant') as pool:
+                results = list(pool.map(build, range(len(variants))))
+
+            variant_results = []
+            for name, spec, result in zip(names, variants, results):
+                if result['success']:
+                    self.logs.append(f"[BATCH] ✅ {name} ({spec.get('new_package')})")
+                else:
+                    self.logs.append(f"[BATCH] ❌ {name} ({spec.get('new_package')}): {result.get('error')}")
+                variant_results.append({
+                    'name': name,
+                    'success': result['success'],
+                    'output_zip': result['output_zip'],
+                    'error': result.get('error'),
+                })
+
+            # 변형 ZIP은 이미 압축되어 있으므로 무압축으로 묶음
+            output_zip = Path(self.temp_dir) / 'rebuilt_variants.zip'
+            with zipfile.ZipFile(output_zip, 'w', zipfile.ZIP_STORED) as zipf:
+                for variant in variant_results:
+                    if variant['success']:
+                        zipf.write(variant['output_zip'], f"package_changed_{variant['name']}.zip")
+
+            succeeded = sum(1 for variant in variant_results if variant['success'])
+            self.logs.append(f"[BATCH] {succeeded}/{len(variant_results)} variants built: {output_zip.name}")
+
+            return {
+                'success': succeeded == len(variant_results),
+                'output_zip': str(output_zip),
+                'logs': self.logs,
+                'variants': variant_results,
+            }
+
+        except Exception as e:
+            error_msg = f"[ERROR] Batch processing failed: {str(e)}"
+            self.logs.append(error_msg)
+            return {
+                'success': False,
+                'output_zip': None,
+                'logs': self.logs,
+                'variants': [],
+                'error': str(e)
+            }
+
+    def _variant_event_callback(self, position: int) -> Callable[[Dict], None]:
+        """변형 프로세서의 단계 이벤트를 변형 번호를 붙여 이 프로세서의 이벤트로 전달"""
+        def forward(event: Dict) -> None:
+            if self.event_callback:
+                self.event_callback(dict(event, variant=position))
+        return forward
+
+    def _prepare_steps(self, zip_path: str, zip_passthrough: bool):
+        """
+        변형과 무관한 준비 단계 (1~4단계: 압축 해제, 정리, 모듈/패키지 탐지)
+
+        Returns:
+            (app_module 경로, 기존 패키지명 또는 None)
+        """
+        # 2. ZIP 압축 해제
+        self._begin_step(1)
+        with self._timed(1):
+            deferred = [] if zip_passthrough else None
+            self.project_root, extract_logs = extract_zip(
+                zip_path,
+                self.temp_dir,
+                member_filter=needs_extraction if zip_passthrough else None,
+                deferred=deferred
+            )
             self.logs.extend(extract_logs)
 
-            # 3. 빌드 아티팩트 정리
-            self.logs.append("\n--- Step 2: Clean Build Artifacts ---")
-            cleanup_logs = clean_build_artifacts(self.project_root)
+            # 프로젝트 인덱스 생성 (이후 모든 단계가 공유)
+            self.index = ProjectIndex.build(self.project_root)
+            if deferred:
+                self.index.add_archive_members(zip_path, deferred)
+            self.logs.append(f"[INDEX] Indexed {len(self.index)} files")
+
+        # 3. 빌드 아티팩트 정리
+        self._begin_step(2)
+        with self._timed(2):
+            cleanup_logs = clean_build_artifacts(self.project_root, self.index)
             self.logs.extend(cleanup_logs)
 
-            # 4. app 모듈 탐지
-            self.logs.append("\n--- Step 3: Detect App Module ---")
-            app_module, detect_logs = get_app_module_path(self.project_root)
+        # 4. app 모듈 탐지
+        self._begin_step(3)
+        with self._timed(3):
+            app_module, detect_logs = get_app_module_path(self.project_root, self.index)
             self.logs.extend(detect_logs)
 
-            # 5. 기존 패키지명 탐지
-            self.logs.append("\n--- Step 4: Detect Old Package ---")
+        # 5. 기존 패키지명 탐지
+        self._begin_step(4)
+        with self._timed(4):
             old_package, pkg_detect_logs = detect_old_package_name(app_module)
             self.logs.extend(pkg_detect_logs)
 
+        return app_module, old_package
+
+    def _build_plan(
+        self,
+        old_package: Optional[str],
+        new_package: str,
+        new_app_name: str,
+        icon_path: Optional[str],
+        splash_path: Optional[str],
+        new_base_url: Optional[str],
+        steps: Optional[Collection[int]] = None,
+        logs: Optional[List[str]] = None
+    ) -> RewritePlan:
+        """
+        변형 파라미터로 단일 패스 치환 계획 생성
+
+        Args:
+            steps: 증분 재적용 시 다시 실행할 단계 (해당 단계의 규칙만 포함, 패키지 규칙은 제외)
+            logs: 탐지 로그를 기록할 리스트 (None이면 self.logs)
+        """
+        update_icon_refs = can_replace_icon(icon_path, self.index)
+        splash_name = None
+        if update_icon_refs and can_replace_splash(splash_path):
+            splash_name = Path(SPLASH_FILENAME).stem
+        # 기존 BASE_URL은 BASE_URL 단계에서 모든 텍스트 파일의 리터럴로도 교체 (정의 외의 참조까지)
+        old_base_urls: List[str] = []
+        if new_base_url and (steps is None or 10 in steps):
+            old_base_urls, detect_logs = detect_old_base_urls(self.index)
+            (self.logs if logs is None else logs).extend(detect_logs)
+        if steps is None:
+            return build_rewrite_plan(
+                old_package,
+                new_package,
+                new_app_name,
+                new_base_url,
+                update_icon_references=update_icon_refs,
+                splash_name=splash_name,
+                old_base_urls=old_base_urls
+            )
+
+        # 패키지명은 이미 바뀌었으므로 패키지 규칙 없이 만들고 다시 실행할 단계의 규칙만 남김
+        # (이전 빌드의 BASE_URL은 작업 공간에서 다시 탐지되어 리터럴로 교체됨)
+        plan = build_rewrite_plan(
+            None,
+            new_package,
+            new_app_name,
+            new_base_url,
+            update_icon_references=update_icon_refs,
+            splash_name=splash_name,
+            old_base_urls=old_base_urls
+        )
+        rule_steps = {rule_step for number in steps for rule_step in STEP_RULES.get(number, ())}
+        return RewritePlan([rule for rule in plan.rules if rule.step in rule_steps])
+
+    def _plan_variant(
+        self,
+        app_module: Path,
+        old_package: Optional[str],
+        new_package: str,
+        new_app_name: str,
+        icon_path: Optional[str],
+        splash_path: Optional[str],
+        new_base_url: Optional[str],
+        executor: str,
+        workers: Optional[int],
+        icon_format: str = ICON_FORMAT_PNG
+    ) -> Dict:
+        """
+        드라이런: 변형을 적용했을 때의 변경 계획 계산 (파일 기록, 디렉토리 이동, ZIP 생성 없음)
+
+        Returns:
+            {
+                'success': True,
+                'dry_run': True,
+                'output_zip': None,
+                'logs': List[str],
+                'changes': Dict[str, List[str]],
+                'plan': {
+                    'app_module': str,
+                    'old_package': str,
+                    'new_package': str,
+                    'files': {경로: {'output_path': str, 'rules': {규칙: [[시작 줄, 끝 줄], ...]}}},
+                    'skipped': {경로: {'reason': str, 'rules': List[str]}},
+                    'directory_moves': [{'from': str, 'to': str, 'replaces_existing': bool}],
+                    'icon_targets': plan_icon_targets() 결과,
+                    'stats': {'files_scanned', 'files_matched', 'files_changed'}
+                }
+            }
+        """
+        self.logs.append("\n--- Dry Run: Plan Changes ---")
+        plan = self._build_plan(old_package, new_package, new_app_name, icon_path, splash_path, new_base_url)
+        self.rewrite = plan.apply(
+            self.index, write=False, executor=executor, workers=workers, collect_lines=True
+        )
+
+        moves = []
+        if old_package:
+            for _, old_path, new_path in plan_package_directory_moves(old_package, new_package, self.index):
+                moves.append({
+                    'from': self.index.rel(old_path),
+                    'to': self.index.rel(new_path),
+                    'replaces_existing': self.index.exists(new_path),
+                })
+
+        def output_path(rel: str) -> str:
+            for move in moves:
+                if rel.startswith(move['from'] + '/'):
+                    return move['to'] + rel[len(move['from']):]
+            return rel
+
+        line_ranges = self.rewrite.line_ranges
+        files = {
+            rel: {
+                'output_path': output_path(rel),
+                'rules': {name: [list(lines) for lines in line_ranges.get(rel, {}).get(name, [])]
+                          for name in rule_names},
+            }
+            for rel, rule_names in self.rewrite.changes.items()
+        }
+        skipped = {rel: {'reason': reason, 'rules': rule_names}
+                   for rel, (reason, rule_names) in self.rewrite.skipped.items()}
+        icon_targets = plan_icon_targets(self.project_root, icon_path, splash_path, self.index, icon_format)
+
+        self.logs.append(
+            f"[PLAN] {len(files)} files would change "
+            f"({self.rewrite.files_scanned} scanned, {self.rewrite.files_matched} matched)"
+        )
+        for move in moves:
+            self.logs.append(f"[PLAN] Directory move: {move['from']} -> {move['to']}")
+        if icon_targets:
+            self.logs.append(
+                f"[PLAN] {len(icon_targets['icons'])} icon and {len(icon_targets['splash'])} splash files "
+                f"({icon_targets['format']})"
+            )
+        self.logs.append("[PLAN] Dry run: no files were written and no ZIP was created")
+
+        return {
+            'success': True,
+            'dry_run': True,
+            'output_zip': None,
+            'logs': self.logs,
+            'changes': self.rewrite.changes,
+            'plan': {
+                'app_module': self.index.rel(app_module),
+                'old_package': old_package,
+                'new_package': new_package,
+                'files': files,
+                'skipped': skipped,
+                'directory_moves': moves,
+                'icon_targets': icon_targets,
+                'stats': {
+                    'files_scanned': self.rewrite.files_scanned,
+                    'files_matched': self.rewrite.files_matched,
+                    'files_changed': len(files),
+                },
+            },
+        }
+
+    def _apply_variant(
+        self,
+        app_module: Path,
+        old_package: Optional[str],
+        new_package: str,
+        new_app_name: str,
+        google_services_path: Optional[str],
+        icon_path: Optional[str],
+        splash_path: Optional[str],
+        new_base_url: Optional[str],
+        include_log: bool,
+        executor: str,
+        workers: Optional[int],
+        icon_format: str = ICON_FORMAT_PNG
+    ) -> Dict:
+        """변형별 단계 (5~11단계: 치환, 리소스 교체, 결과 ZIP 생성)"""
+        params = {
+            'new_package': new_package,
+            'new_app_name': new_app_name,
+            'google_services_path': google_services_path,
+            'icon_path': icon_path,
+            'splash_path': splash_path,
+            'new_base_url': new_base_url,
+            'include_log': include_log,
+            'icon_format': icon_format,
+        }
+        self.app_module = app_module
+        self.old_package = old_package
+        self.inputs = fingerprint_inputs(params)
+        return self._run_variant_steps(sorted(STEP_INPUTS), params, executor, workers)
+
+    def _measured_step(self, number: int, run: Callable[[List[str]], None]) -> Callable[[List[str]], None]:
+        """스케줄러 단계 실행 함수에 메모리 측정 추가 (단계는 작업 스레드에서 동시에 실행됨)"""
+        def measured(logs: List[str]) -> None:
+            with self._measured(number):
+                run(logs)
+        return measured
+
+    def _reuse_or_discard(
+        self,
+        previous: BuildRecord,
+        dry_run: bool,
+        executor: str,
+        workers: Optional[int],
+        **params
+    ) -> Optional[Dict]:
+        """
+        이전 빌드의 작업 공간에 입력이 바뀐 단계만 재적용
+
+        재적용할 수 없으면(드라이런 포함) 이전 작업 공간을 삭제하고 None 반환 (호출한 쪽에서 전체 빌드 실행)
+        """
+        try:
+            if dry_run:
+                return None
+            inputs = fingerprint_inputs(params)
+            steps, reason = incremental_steps(previous.inputs, inputs)
+            if steps is None:
+                self.logs.append(f"[INCREMENTAL] Full rebuild required: {reason}")
+                return None
+
+            self.logs.append("\n--- Incremental: Reuse Previous Build ---")
+            # 이전 작업 공간과 결과 ZIP을 이 프로세서의 임시 디렉토리로 이동 (이후 정리/보관은 일반 빌드와 동일)
+            self.project_root = Path(self.temp_dir) / previous.project_root.name
+            shutil.move(str(previous.project_root), str(self.project_root))
+            previous_zip = Path(self.temp_dir) / 'previous_output.zip'
+            shutil.move(str(previous.output_zip), str(previous_zip))
+            self.index = previous.index.clone(self.project_root)
+            self.app_module = self.project_root / previous.app_module.relative_to(previous.project_root)
+            self.old_package = previous.old_package
+            self.inputs = inputs
+        finally:
+            # 옮기지 않은 이전 작업 공간은 삭제 (옮긴 뒤에는 빈 디렉토리만 남음)
+            previous.cleanup()
+
+        skipped = [number for number in sorted(STEP_INPUTS) if number not in steps]
+        self.logs.append(f"[INCREMENTAL] Reusing previous workspace ({len(self.index)} files): {reason}")
+        self.logs.append(f"[INCREMENTAL] Re-running steps {', '.join(str(number) for number in steps)}")
+        if skipped:
+            self.logs.append(
+                "[INCREMENTAL] Skipped unchanged steps: "
+                + ', '.join(f"{number} ({STEP_TITLES[number - 1]})" for number in skipped)
+            )
+        self.current_step = PREPARE_STEPS
+
+        return self._run_variant_steps(
+            steps, params, executor, workers, previous=previous, previous_zip=previous_zip
+        )
+
+    def _run_variant_steps(
+        self,
+        steps: List[int],
+        params: Dict,
+        executor: str,
+        workers: Optional[int],
+        previous: Optional[BuildRecord] = None,
+        previous_zip: Optional[Path] = None
+    ) -> Dict:
+        """
+        변형 단계 중 steps에 포함된 단계만 실행
+
+        텍스트 치환은 실행할 단계의 규칙만 모아 첫 단계에서 한 번의 패스로 적용합니다.
+        아이콘/스플래시 리사이징만 텍스트 치환과 동시에 실행되고, 나머지 단계는 치환이 끝난 뒤
+        단계 번호 순서대로 실행됩니다. 로그는 단계 번호 순서대로 기록됩니다.
+
+        Args:
+            steps: 실행할 단계 번호 (5~11, 오름차순)
+            params: 변형 파라미터 (STEP_INPUTS의 키)
+            previous: 증분 재적용 시 이전 빌드 (스냅샷과 비교해 바뀐 파일만 다시 압축)
+            previous_zip: 이전 결과 ZIP (변경되지 않은 항목의 압축된 바이트를 그대로 복사)
+        """
+        old_package = self.old_package
+        new_package = params['new_package']
+        new_app_name = params['new_app_name']
+        icon_path = params['icon_path']
+        splash_path = params['splash_path']
+        new_base_url = params['new_base_url']
+        rendered = {}
+
+        def rewrite(logs: List[str]) -> None:
+            # 패키지/앱 이름/버전/아이콘 참조/BASE_URL 텍스트 치환을 한 번의 패스로 적용
+            # (각 단계는 결과만 보고하고, 디렉토리 이동/파일 생성은 단계별로 수행)
+            plan = self._build_plan(
+                old_package, new_package, new_app_name, icon_path, splash_path, new_base_url,
+                steps=steps if previous is not None else None, logs=logs
+            )
+            self.rewrite = plan.apply(self.index, executor=executor, workers=workers)
+            if not len(plan):
+                return
+            logs.append(
+                f"[REWRITE] Applied {len(plan)} rules in one pass: "
+                f"{self.rewrite.files_scanned} files scanned, {self.rewrite.files_matched} matched, "
+                f"{self.rewrite.files_written} rewritten"
+            )
+            if self.rewrite.workers > 1:
+                logs.append(f"[REWRITE] Parallel mode: {executor} pool with {self.rewrite.workers} workers")
+
+        def render(logs: List[str]) -> None:
+            # 아이콘/스플래시 리사이징은 프로젝트 파일과 무관하므로 텍스트 치환과 겹쳐 실행
+            rendered.update(render_images(icon_path, splash_path, icon_format))
+
+        def package(logs: List[str]) -> None:
             # 6. 패키지명 교체
-            self.logs.append("\n--- Step 5: Replace Package Name ---")
             if old_package:
-                pkg_logs, pkg_changes = replace_package_name(self.project_root, old_package, new_package)
-                self.logs.extend(pkg_logs)
+                pkg_logs, pkg_changes = replace_package_name(
+                    self.project_root, old_package, new_package, self.index, self.rewrite
+                )
+                logs.extend(pkg_logs)
                 if pkg_changes == 0:
-                    self.logs.append("[PACKAGE] ⚠️ WARNING: No changes were made!")
+                    logs.append("[PACKAGE] ⚠️ WARNING: No changes were made!")
             else:
-                self.logs.append("[PACKAGE] Skipped (old package not detected)")
+                logs.append("[PACKAGE] Skipped (old package not detected)")
 
+        def app_name(logs: List[str]) -> None:
             # 7. 앱 이름 교체
-            self.logs.append("\n--- Step 6: Replace App Name ---")
-            app_name_logs, app_name_changes = replace_app_name(self.project_root, new_app_name)
-            self.logs.extend(app_name_logs)
+            app_name_logs, app_name_changes = replace_app_name(
+                self.project_root, new_app_name, self.index, self.rewrite
+            )
+            logs.extend(app_name_logs)
             if app_name_changes == 0:
-                self.logs.append("[APP_NAME] ⚠️ WARNING: No changes were made!")
+                logs.append("[APP_NAME] ⚠️ WARNING: No changes were made!")
 
+        def version(logs: List[str]) -> None:
             # 8. 버전 초기화
-            self.logs.append("\n--- Step 7: Reset Version ---")
-            version_logs, version_changes = reset_version(self.project_root)
-            self.logs.extend(version_logs)
+            version_logs, version_changes = reset_version(self.project_root, self.index, self.rewrite)
+            logs.extend(version_logs)
             if version_changes == 0:
-                self.logs.append("[VERSION] ⚠️ WARNING: No changes were made!")
+                logs.append("[VERSION] ⚠️ WARNING: No changes were made!")
 
+        def firebase(logs: List[str]) -> None:
             # 9. Firebase 설정 교체
-            self.logs.append("\n--- Step 8: Replace Firebase Config ---")
-            firebase_logs = replace_google_services(
+            logs.extend(replace_google_services(
                 self.project_root,
-                google_services_path,
+                params['google_services_path'],
                 old_package,
-                new_package
-            )
-            self.logs.extend(firebase_logs)
+                new_package,
+                self.index
+            ))
 
-            # 10. 앱 아이콘 및 스플래시 이미지 교체
-            self.logs.append("\n--- Step 9: Replace App Icon & Splash ---")
-            icon_logs = replace_app_icon(self.project_root, icon_path, splash_path)
-            self.logs.extend(icon_logs)
+        def icon(logs: List[str]) -> None:
+            # 10. 앱 아이콘 및 스플래시 이미지 교체 (미리 만든 렌디션 사용)
+            logs.extend(replace_app_icon(
+                self.project_root, icon_path, splash_path, self.index, self.rewrite,
+                output_format=params['icon_format'], prerendered=rendered
+            ))
 
+        def base_url(logs: List[str]) -> None:
             # 11. BASE_URL 교체
-            self.logs.append("\n--- Step 10: Replace BASE_URL ---")
-            baseurl_logs = replace_base_url(self.project_root, None, new_base_url)
-            self.logs.extend(baseurl_logs)
+            if previous is not None:
+                literal_files = sum(1 for rules in self.rewrite.changes.values() if 'base_url.bulk' in rules)
+                if literal_files:
+                    logs.append(f"[BASE_URL] Replaced previous BASE_URL literals in {literal_files} files")
+            logs.extend(replace_base_url(
+                self.project_root, None, new_base_url, self.index, self.rewrite
+            ))
+
+        # 단계 그래프: 선언 순서 = 로그 순서
+        # 이미지 리사이징만 텍스트 치환과 겹쳐 실행되고, 이후 단계는 단계 번호 순서대로 하나씩 실행
+        # (치환 결과 보고와 디렉토리 이동/파일 생성은 가벼워서 동시에 실행해도 이득이 없음)
+        # 치환 단계는 규칙이 있는 첫 단계 번호로 기록 (규칙이 없으면 번호 없이 실행: 로그 헤더/진행 상황 없음)
+        rewrite_number = next((number for number in steps if number in STEP_RULES), None)
+        graph = [Step('rewrite', rewrite, reads=ROLE_TEXT, writes=ROLE_TEXT, number=rewrite_number)]
+        if 9 in steps:
+            # 출력 형식은 minSdk로 결정 (텍스트 치환은 minSdk를 바꾸지 않으므로 미리 결정)
+            icon_format, _ = resolve_output_format(params['icon_format'], self.index)
+            graph.append(Step('render', render))
+        variant_steps = {
+            5: ('package', package),
+            6: ('app_name', app_name),
+            7: ('version', version),
+            8: ('firebase', firebase),
+            9: ('icon', icon),
+            10: ('base_url', base_url),
+        }
+        previous_step = 'rewrite'
+        for number in steps:
+            if number not in variant_steps:
+                continue
+            name, run = variant_steps[number]
+            depends = (previous_step, 'render') if name == 'icon' else (previous_step,)
+            graph.append(Step(name, run, depends, number=number))
+            previous_step = name
+
+        # 렌디션 생성 시간/메모리는 아이콘 단계에 포함
+        numbers = dict({step.name: step.number for step in graph if step.number is not None}, render=9)
+        # 단계 번호별로 남은 그래프 단계 수와 누적 실행 시간 (모두 끝나면 완료 이벤트)
+        pending = {number: 0 for number in numbers.values()}
+        for step in graph:
+            if step.name in numbers:
+                pending[numbers[step.name]] += 1
+        spent = dict.fromkeys(pending, 0.0)
+
+        announced = set()
+        progress_lock = threading.Lock()
+
+        def on_start(step: Step) -> None:
+            if step.name not in numbers:
+                return
+            self._step_started(numbers[step.name])
+            if step.number is None:
+                return
+            with progress_lock:
+                if step.number > self.current_step:
+                    self.current_step = step.number
+                    if self.progress_callback:
+                        self.progress_callback(step.number, STEP_TITLES[step.number - 1])
+
+        def on_finish(step: Step, seconds: float) -> None:
+            number = numbers.get(step.name)
+            if number is None:
+                return
+            with progress_lock:
+                pending[number] -= 1
+                spent[number] += seconds
+                finished = pending[number] == 0
+            if finished:
+                self._step_finished(number, spent[number])
+
+        def on_logs(step: Step, logs: List[str]) -> None:
+            if step.number is not None and step.number not in announced:
+                announced.add(step.number)
+                self.logs.append(f"\n--- Step {step.number}: {STEP_TITLES[step.number - 1]} ---")
+            self.logs.extend(logs)
 
-            # 12. 결과 ZIP 생성
-            self.logs.append("\n--- Step 11: Create Output ZIP ---")
+        if self.track_memory:
+            for step in graph:
+                if step.name in numbers:
+                    step.run = self._measured_step(numbers[step.name], step.run)
+
+        self._emit('steps_planned', steps=sorted(set(steps) | {11}))
+        durations = run_steps(graph, on_start, on_logs, on_finish=on_finish)
+        for name, seconds in durations.items():
+            if name in numbers:
+                self._add_duration(numbers[name], seconds)
+
+        # 12. 결과 ZIP 생성 (모든 단계의 파일과 로그가 필요하므로 그래프가 끝난 뒤 실행)
+        if 11 not in announced:
+            self._begin_step(11)
+        with self._timed(11):
             output_zip = Path(self.temp_dir) / 'rebuilt_project.zip'
 
-            # 로그 파일 포함 여부에 따라 log_content 설정
-            log_content = '\n'.join(self.logs) if include_log else None
+            # 로그 파일 포함 여부에 따라 log_content 설정 (한 문자열로 합치지 않고 줄 단위로 ZIP에 기록)
+            include_log = params['include_log']
+            log_content = self.logs if include_log else None
             if not include_log:
                 self.logs.append("[ZIP] Log file will not be included in output")
 
-            zip_logs = create_zip(self.project_root, str(output_zip), log_content, new_app_name)
+            # 증분 재적용: 이전 빌드 이후 바뀌지 않은 파일은 이전 결과 ZIP에서 그대로 복사
+            # (수정 시각 해상도가 낮은 파일 시스템에서도 크기가 같은 수정을 놓치지 않도록
+            #  이번 실행에서 기록한 파일은 상태가 같아도 다시 압축)
+            reuse = None
+            if previous is not None:
+                current = snapshot_files(self.index)
+                written = self.index.modified()
+                reuse = {rel for rel, state in current.items()
+                         if previous.snapshot.get(rel) == state and rel not in written}
+
+            # 스트리밍 출력: 결과 ZIP 파일은 keep_output일 때만 같이 기록
+            target = str(output_zip)
+            if self.output_stream is not None:
+                target = self.output_stream
+                if self.keep_output:
+                    self.output_stream.tee(str(output_zip))
+                else:
+                    output_zip = None
+
+            zip_logs = create_zip(
+                self.project_root, target, log_content, new_app_name, self.index,
+                reuse_zip=str(previous_zip) if previous_zip else None,
+                reuse=reuse,
+                reuse_folder_name=previous.folder_name if previous is not None else None
+            )
             self.logs.extend(zip_logs)
+            if self.output_stream is not None:
+                self.output_stream.close()
+            if previous_zip is not None:
+                previous_zip.unlink()
 
-            self.logs.append("\n" + "=" * 60)
-            self.logs.append("Processing Completed Successfully")
-            self.logs.append("=" * 60)
+        self.folder_name = new_app_name
+        self.output_zip = str(output_zip) if output_zip is not None else None
 
-            return {
-                'success': True,
-                'output_zip': str(output_zip),
-                'logs': self.logs
-            }
+        self.logs.append("\n" + "=" * 60)
+        self.logs.append("Processing Completed Successfully")
+        self.logs.append("=" * 60)
 
-        except Exception as e:
-            error_msg = f"[ERROR] Processing failed: {str(e)}"
-            self.logs.append(error_msg)
-            return {
-                'success': False,
-                'output_zip': None,
-                'logs': self.logs,
-                'error': str(e)
-            }
+        result = {
+            'success': True,
+            'output_zip': self.output_zip,
+            'logs': self.logs,
+            'changes': self.rewrite.changes
+        }
+        if previous is not None:
+            result['incremental_steps'] = list(steps)
+        return result
+
+    def detach_build(self, directory: str) -> BuildRecord:
+        """
+        성공한 빌드의 작업 공간을 directory로 옮겨 증분 재적용용 BuildRecord로 보관
+
+        작업 공간은 이동(rename)하고 결과 ZIP은 하드 링크(불가능하면 복사)하므로,
+        이 프로세서의 결과 ZIP은 그대로 다운로드할 수 있습니다.
+
+        Args:
+            directory: 보관 디렉토리 (레코드가 소유, 비어 있어야 함)
+
+        Returns:
+            BuildRecord
+        """
+        if self.inputs is None or self.output_zip is None:
+            raise ValueError("No completed build to keep")
+
+        directory = Path(directory)
+        project_root = directory / Path(self.project_root).name
+        shutil.move(str(self.project_root), str(project_root))
+        output_zip = directory / 'output.zip'
+        try:
+            os.link(self.output_zip, output_zip)
+        except OSError:
+            shutil.copyfile(self.output_zip, output_zip)
+
+        index = self.index.clone(project_root)
+        # 원본 ZIP(업로드 임시 파일)은 작업 후 삭제되므로, 패스스루 파일은 이후 이전 결과 ZIP에서 복사
+        index.source_zip = None
+        record = BuildRecord(
+            str(directory),
+            project_root,
+            index,
+            project_root / Path(self.app_module).relative_to(self.project_root),
+            self.old_package,
+            self.inputs,
+            snapshot_files(index),
+            str(output_zip),
+            self.folder_name
+        )
+        return record
 
     def cleanup(self):
-        """임시 디렉토리 정리"""
+        """임시 디렉토리 정리 (배치 변형 포함)"""
+        for variant in self.variants:
+            variant.cleanup()
         if self.temp_dir and Path(self.temp_dir).exists():
             try:
                 shutil.rmtree(self.temp_dir)
                 self.logs.append(f"[CLEANUP] Removed temp directory: {self.temp_dir}")
             except Exception as e:
                 self.logs.append(f"[CLEANUP] Failed to remove temp directory: {str(e)}")
+
+
+def _unique_variant_names(variants: List[Dict]) -> List[str]:
+    """
+    변형 이름 목록 (미지정 시 앱 이름, 중복이면 순번 추가)
+
+    이름은 ZIP 멤버명/다운로드 파일명에 쓰이므로 [A-Za-z0-9._-] 밖의 문자는 '_'로 바꿉니다.
+    """
+    names = []
+    used = set()
+    for variant in variants:
+        raw = str(variant.get('name') or variant.get('new_app_name') or '')
+        base = VARIANT_NAME_UNSAFE.sub('_', raw).strip('._') or 'variant'
+        name, count = base, 1
+        while name in used:
+            count += 1
+            name = f"{base}_{count}"
+        used.add(name)
+        names.append(name)
+    return names
@@ -0,0 +1,154 @@
+"""
+파이프라인 단계 스케줄러 (의존성 그래프)
+- 각 단계는 선행 단계(depends)와 읽고/쓰는 파일 집합(ROLE_* 플래그)을 선언
+- 선행 단계가 끝났고, 앞서 선언된 미완료 단계와 파일 집합이 겹치지 않으면 동시에 실행
+  (파일 집합이 겹치는 단계끼리는 선언 순서대로 실행되므로 결과는 순차 실행과 같음)
+- 파일 집합은 역할 단위로 비교하므로 보수적임 (ROLE_TEXT는 모든 텍스트 역할과 겹침)
+- 리빌드 파이프라인에서는 이미지 리사이징만 텍스트 치환과 겹쳐 실행되고, 나머지 단계는
+  depends로 단계 번호 순서대로 연결됨 (AndroidProjectProcessor._run_variant_steps)
+- 단계 로그는 단계별 버퍼에 모았다가 선언 순서대로 전달 (실행 순서와 무관하게 결정적)
+"""
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional, Sequence
+
+from backend.utils.project_index import ROLE_DEFAULT_STRINGS, ROLE_STRINGS, ROLE_TEXT, TEXT_ROLES
+
+
+# 동시에 실행할 단계 수 (1이면 선언 순서대로 하나씩 실행)
+DEFAULT_MAX_PARALLEL_STEPS = int(os.environ.get('MAX_PARALLEL_STEPS', '4'))
+
+
+class Step:
+    """
+    스케줄러에서 실행할 단계
+
+    Args:
+        name: 단계 이름 (depends에서 참조)
+        run: 실행 함수 (로그 버퍼를 받아 로그를 추가)
+        depends: 먼저 끝나야 하는 단계 이름 (파일 외의 결과를 사용하는 경우)
+        reads: 읽는 파일 역할 (ROLE_* 조합)
+        writes: 생성/수정/이동/삭제하는 파일 역할
+        number: 파이프라인 단계 번호 (STEP_TITLES 기준, 진행 상황/로그 헤더용)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        run: Callable[[List[str]], None],
+        depends: Sequence[str] = (),
+        reads: int = 0,
+        writes: int = 0,
+        number: Optional[int] = None
+    ):
+        self.name = name
+        self.run = run
+        self.depends = tuple(depends)
+        self.reads = reads
+        self.writes = writes
+        self.number = number
+
+    def __repr__(self):
+        return f"Step({self.name!r}, number={self.number})"
+
+
+def _expand(roles: int) -> int:
+    """같은 파일에 함께 붙을 수 있는 역할까지 포함 (텍스트 역할 ↔ ROLE_TEXT, 기본 strings ↔ strings)"""
+    expanded = roles
+    if roles & ROLE_TEXT:
+        expanded |= TEXT_ROLES
+    if roles & TEXT_ROLES:
+        expanded |= ROLE_TEXT
+    if roles & (ROLE_STRINGS | ROLE_DEFAULT_STRINGS):
+        expanded |= ROLE_STRINGS | ROLE_DEFAULT_STRINGS
+    return expanded
+
+
+def conflicts(a: Step, b: Step) -> bool:
+    """두 단계의 파일 집합이 겹치는지 (한쪽이 쓰는 파일을 다른 쪽이 읽거나 쓰면 충돌)"""
+    return bool(a.writes & _expand(b.reads | b.writes) or b.writes & _expand(a.reads))
+
+
+def run_steps(
+    steps: List[Step],
+    on_start: Optional[Callable[[Step], None]] = None,
+    on_logs: Optional[Callable[[Step, List[str]], None]] = None,
+    max_parallel: int = DEFAULT_MAX_PARALLEL_STEPS,
+    on_finish: Optional[Callable[[Step, float], None]] = None
+) -> Dict[str, float]:
+    """
+    단계 그래프 실행
+
+    Args:
+        steps: 실행할 단계 (선언 순서 = 로그 순서, depends는 앞서 선언된 단계만 참조)
+        on_start: 단계 시작 시 호출 (작업 스레드에서 호출됨)
+        on_logs: 단계 로그 전달 (호출한 스레드에서 선언 순서대로 호출됨)
+        max_parallel: 동시에 실행할 단계 수
+        on_finish: 단계가 성공적으로 끝났을 때 실행 시간(초)과 함께 호출 (작업 스레드에서 호출됨)
+
+    Returns:
+        단계 이름 -> 실행 시간(초) (끝난 단계만)
+
+    Raises:
+        Exception: 단계에서 발생한 첫 예외 (선언 순서 기준, 실행 중인 단계가 끝난 뒤 다시 발생)
+    """
+    positions = {step.name: position for position, step in enumerate(steps)}
+    for position, step in enumerate(steps):
+        for dependency in step.depends:
+            if positions.get(dependency, position) >= position:
+                raise ValueError(f"Step {step.name!r} depends on unknown or later step {dependency!r}")
+
+    buffers: List[List[str]] = [[] for _ in steps]
+    done = [False] * len(steps)
+    started = [False] * len(steps)
+    errors: Dict[int, BaseException] = {}
+    durations: Dict[str, float] = {}
+    flushed = 0
+
+    def ready(position: int) -> bool:
+        step = steps[position]
+        if any(not done[positions[dependency]] for dependency in step.depends):
+            return False
+        return not any(not done[earlier] and conflicts(steps[earlier], step) for earlier in range(position))
+
+    def execute(position: int) -> None:
+        if on_start is not None:
+            on_start(steps[position])
+        started_at = time.perf_counter()
+        steps[position].run(buffers[position])
+        seconds = durations[steps[position].name] = time.perf_counter() - started_at
+        if on_finish is not None:
+            on_finish(steps[position], seconds)
+
+    with ThreadPoolExecutor(max_workers=max(1, max_parallel), thread_name_prefix='pipeline-step') as pool:
+        running = {}
+        while True:
+            # 실패한 단계가 있으면 새 단계는 시작하지 않음
+            if not errors:
+                for position in range(len(steps)):
+                    if len(running) >= max_parallel:
+                        break
+                    if not started[position] and ready(position):
+                        started[position] = True
+                        running[pool.submit(execute, position)] = position
+            if not running:
+                break
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                position = running.pop(future)
+                done[position] = True
+                error = future.exception()
+                if error is not None:
+                    errors[position] = error
+
+            # 앞선 단계가 모두 끝난 단계의 로그를 선언 순서대로 전달
+            while flushed < len(steps) and done[flushed]:
+                if on_logs is not None:
+                    on_logs(steps[flushed], buffers[flushed])
+                flushed += 1
+
+    if errors:
+        raise errors[min(errors)]
+    return durations
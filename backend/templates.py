@@ -0,0 +1,237 @@
+"""
+템플릿 레지스트리
+- 템플릿 ZIP을 한 번 등록하면 압축 해제, 빌드 아티팩트 정리, 모듈/패키지 탐지를 미리 실행
+- 준비된 작업 공간과 분석 결과를 디스크에 보관 (서버 재시작 후에도 유지)
+- 작업은 업로드 대신 template_id로 준비된 작업 공간을 복사해 편집만 수행
+"""
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from backend.processor import AndroidProjectProcessor, PreparedProject
+from backend.utils.project_index import ProjectIndex
+
+
+DEFAULT_TEMPLATE_DIR = os.environ.get(
+    'TEMPLATE_DIR', os.path.join(tempfile.gettempdir(), 'android_rebuild_templates')
+)
+
+METADATA_FILENAME = 'template.json'
+WORKSPACE_DIRNAME = 'workspace'
+# 템플릿 ID 길이 (ZIP SHA-256 앞부분)
+TEMPLATE_ID_LENGTH = 16
+
+
+class TemplateError(Exception):
+    """템플릿 등록 실패"""
+
+
+class Template:
+    """등록된 템플릿 (준비된 작업 공간 + 분석 결과)"""
+
+    def __init__(
+        self,
+        template_id: str,
+        name: str,
+        sha256: str,
+        size: int,
+        created_at: float,
+        directory: Path,
+        project_root: str,
+        app_module: str,
+        old_package: Optional[str],
+        logs: List[str]
+    ):
+        self.id = template_id
+        self.name = name
+        self.sha256 = sha256
+        self.size = size
+        self.created_at = created_at
+        self.directory = Path(directory)
+        self.project_root = project_root    # 작업 공간 기준 상대 경로
+        self.app_module = app_module        # 프로젝트 루트 기준 상대 경로
+        self.old_package = old_package
+        self.logs = logs
+        self._prepared: Optional[PreparedProject] = None
+        self._lock = threading.Lock()
+
+    @property
+    def workspace(self) -> Path:
+        return self.directory / WORKSPACE_DIRNAME
+
+    def prepared(self) -> PreparedProject:
+        """준비된 작업 공간 (인덱스는 처음 사용할 때 한 번만 생성)"""
+        with self._lock:
+            if self._prepared is None:
+                project_root = self.workspace / self.project_root
+                self._prepared = PreparedProject(
+                    str(self.workspace),
+                    project_root,
+                    ProjectIndex.build(project_root),
+                    project_root / self.app_module,
+                    self.old_package,
+                    self.logs
+                )
+            return self._prepared
+
+    def to_dict(self) -> Dict:
+        return {
+            'template_id': self.id,
+            'name': self.name,
+            'sha256': self.sha256,
+            'size': self.size,
+            'created_at': self.created_at,
+            'app_module': self.app_module,
+            'old_package': self.old_package,
+        }
+
+    def save(self) -> None:
+        metadata = dict(self.to_dict(), project_root=self.project_root, logs=self.logs)
+        tmp_path = self.directory / f".{METADATA_FILENAME}.tmp"
+        tmp_path.write_text(json.dumps(metadata, ensure_ascii=False, indent=2), encoding='utf-8')
+        os.replace(tmp_path, self.directory / METADATA_FILENAME)
+
+    @classmethod
+    def load(cls, directory: Path) -> 'Template':
+        metadata = json.loads((directory / METADATA_FILENAME).read_text(encoding='utf-8'))
+        return cls(
+            metadata['template_id'],
+            metadata['name'],
+            metadata['sha256'],
+            metadata['size'],
+            metadata['created_at'],
+            directory,
+            metadata['project_root'],
+            metadata['app_module'],
+            metadata['old_package'],
+            metadata['logs']
+        )
+
+
+class TemplateRegistry:
+    """
+    템플릿 등록/조회/삭제
+
+    템플릿 ID는 ZIP 내용의 SHA-256에서 만들어지므로 같은 ZIP을 다시 등록하면 기존 템플릿을 반환합니다.
+
+    Args:
+        root_dir: 템플릿 저장 디렉토리
+    """
+
+    def __init__(self, root_dir: str = DEFAULT_TEMPLATE_DIR):
+        self.root_dir = Path(root_dir)
+        self._templates: Dict[str, Template] = {}
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self) -> int:
+        """디스크에 보관된 템플릿 불러오기"""
+        if not self.root_dir.exists():
+            return 0
+        loaded = 0
+        for directory in sorted(self.root_dir.iterdir()):
+            if not (directory / METADATA_FILENAME).is_file():
+                continue
+            try:
+                template = Template.load(directory)
+            except (OSError, ValueError, KeyError):
+                continue
+            with self._lock:
+                self._templates[template.id] = template
+            loaded += 1
+        return loaded
+
+    def register(self, zip_path: str, sha256: str, size: int, name: Optional[str] = None) -> Template:
+        """
+        템플릿 ZIP 등록 (준비 단계 실행 후 작업 공간 보관)
+
+        Args:
+            zip_path: 템플릿 ZIP 경로
+            sha256: ZIP SHA-256 (업로드 시 계산된 값)
+            size: ZIP 크기
+            name: 표시 이름 (선택)
+
+        Returns:
+            Template
+
+        Raises:
+            TemplateError: 준비 단계 실패 시
+        """
+        template_id = sha256[:TEMPLATE_ID_LENGTH]
+        existing = self.get(template_id)
+        if existing is not None:
+            return existing
+
+        self.root_dir.mkdir(parents=True, exist_ok=True)
+        # 준비가 끝난 뒤 최종 위치로 rename (다른 프로세스는 완성된 템플릿만 봄)
+        staging = Path(tempfile.mkdtemp(prefix=f".{template_id}.", dir=self.root_dir))
+        try:
+            processor = AndroidProjectProcessor()
+            try:
+                prepared = processor.prepare(zip_path, workspace=str(staging / WORKSPACE_DIRNAME))
+            except Exception as e:
+                raise TemplateError(f"{e}\n" + '\n'.join(processor.logs)) from e
+
+            template = Template(
+                template_id,
+                name or template_id,
+                sha256,
+                size,
+                time.time(),
+                self.root_dir / template_id,
+                prepared.project_root.relative_to(prepared.workspace).as_posix(),
+                prepared.app_module.relative_to(prepared.project_root).as_posix(),
+                prepared.old_package,
+                prepared.logs
+            )
+            template.directory = staging
+            template.save()
+
+            final_dir = self.root_dir / template_id
+            try:
+                os.rename(staging, final_dir)
+            except OSError:
+                # 다른 프로세스가 먼저 등록한 경우
+                if (final_dir / METADATA_FILENAME).is_file():
+                    return self._remember(Template.load(final_dir))
+                raise
+            template.directory = final_dir
+            return self._remember(template)
+        finally:
+            if staging.exists():
+                shutil.rmtree(staging, ignore_errors=True)
+
+    def get(self, template_id: str) -> Optional[Template]:
+        with self._lock:
+            template = self._templates.get(template_id)
+        if template is None:
+            # 다른 서버 프로세스가 등록한 템플릿
+            directory = self.root_dir / template_id
+            if (directory / METADATA_FILENAME).is_file():
+                try:
+                    template = self._remember(Template.load(directory))
+                except (OSError, ValueError, KeyError):
+                    return None
+        return template
+
+    def list(self) -> List[Template]:
+        with self._lock:
+            return sorted(self._templates.values(), key=lambda template: template.created_at)
+
+    def remove(self, template_id: str) -> bool:
+        """템플릿 삭제 (작업 공간 포함)"""
+        with self._lock:
+            template = self._templates.pop(template_id, None)
+        if template is None:
+            return False
+        shutil.rmtree(template.directory, ignore_errors=True)
+        return True
+
+    def _remember(self, template: Template) -> Template:
+        with self._lock:
+            return self._templates.setdefault(template.id, template)
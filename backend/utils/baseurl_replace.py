@@ -2,11 +2,50 @@
 BASE_URL 문자열 교체
 """
 import re
-from pathlib import Path
-from typing import List
+from typing import List, Optional, Tuple
 
+from backend.utils.project_index import ProjectIndex, ROLE_DEFAULT_STRINGS, ROLE_GRADLE, ROLE_SOURCE
+from backend.utils.rewrite_plan import RewritePlan, RewriteResult, STEP_BASE_URL, base_url_rules
 
-def replace_base_url(project_root: str, old_url: str, new_url: str) -> List[str]:
+
+# BASE_URL 정의(buildConfigField, 상수, strings.xml)에서 기존 URL 값 추출
+# buildConfigField의 이스케이프된 따옴표(\"https://...\")도 허용
+OLD_URL_PATTERN = re.compile(r'(?:BASE_URL|base_url)\b[^\n]*?["\'>](?:\\")?(https?://[^"\'\\<\s]+)')
+
+
+def detect_old_base_urls(index: ProjectIndex) -> Tuple[List[str], List[str]]:
+    """
+    BASE_URL 치환 대상 파일에서 기존 BASE_URL 값 탐지
+
+    Args:
+        index: 프로젝트 인덱스
+
+    Returns:
+        (기존 URL 목록 (중복 제거, 정렬), 로그 메시지 리스트)
+    """
+    logs = []
+    urls = set()
+    for file_path in index.files(ROLE_GRADLE | ROLE_SOURCE | ROLE_DEFAULT_STRINGS):
+        try:
+            data = file_path.read_bytes()
+        except OSError:
+            continue
+        if b'BASE_URL' not in data and b'base_url' not in data:
+            continue
+        urls.update(OLD_URL_PATTERN.findall(data.decode('utf-8', errors='ignore')))
+
+    for url in sorted(urls):
+        logs.append(f"[BASE_URL] 🔍 Detected old BASE_URL: {url}")
+    return sorted(urls), logs
+
+
+def replace_base_url(
+    project_root: str,
+    old_url: str,
+    new_url: str,
+    index: Optional[ProjectIndex] = None,
+    rewrite: Optional[RewriteResult] = None
+) -> List[str]:
     """
     프로젝트 전체에서 BASE_URL 관련 문자열 교체
     - build.gradle(.kts)의 buildConfigField "BASE_URL"
@@ -17,6 +56,8 @@ def replace_base_url(project_root: str, old_url: str, new_url: str) -> List[str]
         project_root: 프로젝트 루트
         old_url: 기존 URL (선택, 탐지용)
         new_url: 새 URL
+        index: 프로젝트 인덱스 (없으면 새로 생성)
+        rewrite: 단일 패스 치환 결과 (있으면 결과만 기록)
 
     Returns:
         로그 메시지 리스트
@@ -27,97 +68,39 @@ def replace_base_url(project_root: str, old_url: str, new_url: str) -> List[str]
         logs.append("[BASE_URL] No new BASE_URL provided, skipping")
         return logs
 
-    project_path = Path(project_root)
+    if index is None:
+        index = ProjectIndex.build(project_root)
+    if rewrite is None:
+        rewrite = RewritePlan(base_url_rules(new_url)).apply(index)
     replaced_count = 0
-
-    # 1. build.gradle(.kts) 수정
-    for gradle_file in project_path.rglob('build.gradle*'):
-        try:
-            content = gradle_file.read_text(encoding='utf-8', errors='ignore')
-            original_content = content
-
-            # buildConfigField "BASE_URL", "..." 형태 찾아서 교체
-            new_content = re.sub(
-                r'(buildConfigField\s*\(\s*["\']String["\']\s*,\s*["\']BASE_URL["\']\s*,\s*["\'])[^"\']+(["\'])',
-                r'\1' + new_url + r'\2',
-                content
-            )
-            # Groovy 스타일: buildConfigField "String", "BASE_URL", "..."
-            new_content = re.sub(
-                r'(buildConfigField\s+["\']String["\']\s*,\s*["\']BASE_URL["\']\s*,\s*["\'])[^"\']+(["\'])',
-                r'\1' + new_url + r'\2',
-                new_content
-            )
-
-            if new_content != original_content:
-                gradle_file.write_text(new_content, encoding='utf-8')
-                logs.append(f"[BASE_URL] Updated buildConfigField in {gradle_file.relative_to(project_path)}")
-                replaced_count += 1
-        except Exception as e:
-            logs.append(f"[BASE_URL] ERROR updating {gradle_file}: {str(e)}")
-
-    # 2. Kotlin/Java 소스 파일 수정
-    source_files = list(project_path.rglob('*.kt')) + list(project_path.rglob('*.java'))
-    for source_file in source_files:
-        if 'build' in source_file.parts:
-            continue
-        try:
-            content = source_file.read_text(encoding='utf-8', errors='ignore')
-            original_content = content
-
-            # Kotlin: const val BASE_URL = "..."
-            new_content = re.sub(
-                r'(const\s+val\s+BASE_URL\s*=\s*["\'])[^"\']+(["\'])',
-                r'\1' + new_url + r'\2',
-                content
-            )
-            # Java: static final String BASE_URL = "...";
-            new_content = re.sub(
-                r'(static\s+final\s+String\s+BASE_URL\s*=\s*["\'])[^"\']+(["\'])',
-                r'\1' + new_url + r'\2',
-                new_content
-            )
-            # 일반 변수: val BASE_URL = "..."
-            new_content = re.sub(
-                r'(val\s+BASE_URL\s*=\s*["\'])[^"\']+(["\'])',
-                r'\1' + new_url + r'\2',
-                new_content
-            )
-
-            if new_content != original_content:
-                source_file.write_text(new_content, encoding='utf-8')
-                logs.append(f"[BASE_URL] Updated constant in {source_file.relative_to(project_path)}")
-                replaced_count += 1
-        except Exception as e:
-            logs.append(f"[BASE_URL] ERROR updating {source_file}: {str(e)}")
-
-    # 3. strings.xml 수정
-    for strings_xml in project_path.rglob('strings.xml'):
-        if 'values' not in strings_xml.parts:
-            continue
-        try:
-            content = strings_xml.read_text(encoding='utf-8', errors='ignore')
-            original_content = content
-
-            # <string name="base_url">...</string>
-            new_content = re.sub(
-                r'(<string\s+name="base_url">)[^<]+(</string>)',
-                r'\1' + new_url + r'\2',
-                content
-            )
-            # <string name="BASE_URL">...</string>
-            new_content = re.sub(
-                r'(<string\s+name="BASE_URL">)[^<]+(</string>)',
-                r'\1' + new_url + r'\2',
-                new_content
-            )
-
-            if new_content != original_content:
-                strings_xml.write_text(new_content, encoding='utf-8')
-                logs.append(f"[BASE_URL] Updated base_url in {strings_xml.relative_to(project_path)}")
-                replaced_count += 1
-        except Exception as e:
-            logs.append(f"[BASE_URL] ERROR updating {strings_xml}: {str(e)}")
+    error_message = "[BASE_URL] ERROR updating {file}: {error}"
+
+    # 1. build.gradle(.kts)의 buildConfigField "BASE_URL"
+    for gradle_file in index.files(ROLE_GRADLE):
+        replaced_count += rewrite.report(
+            logs, gradle_file, STEP_BASE_URL,
+            "[BASE_URL] Updated buildConfigField in {path}", error_message
+        )
+
+    # 2. Kotlin/Java 소스 파일의 BASE_URL 상수
+    for source_file in index.files(ROLE_SOURCE):
+        replaced_count += rewrite.report(
+            logs, source_file, STEP_BASE_URL,
+            "[BASE_URL] Updated constant in {path}", error_message
+        )
+
+    # 3. 기본 로케일(values/)의 strings.xml
+    for strings_xml in index.files(ROLE_DEFAULT_STRINGS):
+        replaced_count += rewrite.report(
+            logs, strings_xml, STEP_BASE_URL,
+            "[BASE_URL] Updated base_url in {path}", error_message
+        )
+
+    # 4. 그 밖의 텍스트 파일에 남은 기존 BASE_URL 참조 (리터럴 일괄 치환)
+    reported = set(index.files(ROLE_GRADLE | ROLE_SOURCE | ROLE_DEFAULT_STRINGS))
+    for text_file in rewrite.changed_files(STEP_BASE_URL):
+        if text_file not in reported:
+            replaced_count += rewrite.report(logs, text_file, STEP_BASE_URL, "[BASE_URL] Updated reference in {path}")
 
     if replaced_count == 0:
         logs.append("[BASE_URL] WARNING: No BASE_URL definitions found")
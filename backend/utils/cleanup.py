@@ -3,21 +3,27 @@
 """
 import shutil
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
+from backend.joblog import LogRecord, RelativePath
+from backend.utils.project_index import ProjectIndex
 
-def clean_build_artifacts(project_root: str) -> List[str]:
+
+def clean_build_artifacts(project_root: str, index: Optional[ProjectIndex] = None) -> List[str]:
     """
     build/, .gradle/, .idea/, outputs/ 등 불필요한 폴더 삭제
 
     Args:
         project_root: 프로젝트 루트 디렉토리
+        index: 프로젝트 인덱스 (없으면 새로 생성, 삭제 결과가 반영됨)
 
     Returns:
         로그 메시지 리스트
     """
     logs = []
     project_path = Path(project_root)
+    if index is None:
+        index = ProjectIndex.build(project_root)
 
     # 삭제할 폴더 패턴
     CLEANUP_TARGETS = [
@@ -34,15 +40,22 @@ def clean_build_artifacts(project_root: str) -> List[str]:
     deleted_count = 0
 
     for target in CLEANUP_TARGETS:
-        for item in project_path.rglob(target):
+        for item in index.find_named(target):
+            # 앞서 삭제된 폴더의 하위 항목은 건너뜀
+            if not index.exists(item):
+                continue
             try:
                 if item.is_dir():
                     shutil.rmtree(item)
-                    logs.append(f"[CLEANUP] Deleted directory: {item.relative_to(project_path)}")
+                    index.remove(item)
+                    logs.append(LogRecord("[CLEANUP] Deleted directory: {path}", path=RelativePath(item, project_path)))
                     deleted_count += 1
-                elif item.is_file():
-                    item.unlink()
-                    logs.append(f"[CLEANUP] Deleted file: {item.relative_to(project_path)}")
+                elif index.is_file(item):
+                    # 패스스루 파일은 디스크에 없으므로 인덱스에서만 제거
+                    if item.is_file():
+                        item.unlink()
+                    index.remove(item)
+                    logs.append(LogRecord("[CLEANUP] Deleted file: {path}", path=RelativePath(item, project_path)))
                     deleted_count += 1
             except Exception as e:
                 logs.append(f"[CLEANUP] Failed to delete {item}: {str(e)}")
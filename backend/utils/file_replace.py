@@ -5,7 +5,30 @@ import re
 import os
 import shutil
 from pathlib import Path
-from typing import List, Tuple
+from typing import List, Optional, Tuple
+
+from backend.utils.project_index import (
+    ProjectIndex,
+    ROLE_GRADLE,
+    ROLE_MANIFEST,
+    ROLE_SETTINGS,
+    ROLE_SOURCE,
+    ROLE_STRINGS,
+    ROLE_TEXT,
+)
+from backend.utils.rewrite_plan import (
+    RewritePlan,
+    RewriteResult,
+    STEP_APP_NAME,
+    STEP_PACKAGE,
+    STEP_PACKAGE_BULK,
+    STEP_VERSION,
+    SKIP_BINARY,
+    app_name_rules,
+    bulk_package_rules,
+    package_rules,
+    version_rules,
+)
 
 
 def detect_old_package_name(app_module: str) -> Tuple[str, List[str]]:
@@ -65,7 +88,13 @@ def detect_old_package_name(app_module: str) -> Tuple[str, List[str]]:
         return None, logs
 
 
-def replace_package_name(project_root: str, old_package: str, new_package: str) -> Tuple[List[str], int]:
+def replace_package_name(
+    project_root: str,
+    old_package: str,
+    new_package: str,
+    index: Optional[ProjectIndex] = None,
+    rewrite: Optional[RewriteResult] = None
+) -> Tuple[List[str], int]:
     """
     프로젝트 전체에서 패키지명 교체
     - build.gradle(.kts)의 applicationId
@@ -77,6 +106,8 @@ def replace_package_name(project_root: str, old_package: str, new_package: str)
         project_root: 프로젝트 루트
         old_package: 기존 패키지명
         new_package: 새 패키지명
+        index: 프로젝트 인덱스 (없으면 새로 생성, 디렉토리 이동이 반영됨)
+        rewrite: 단일 패스 치환 결과 (있으면 텍스트는 이미 치환된 것으로 보고 결과만 기록)
 
     Returns:
         (로그 메시지 리스트, 변경된 파일 수)
@@ -92,96 +123,37 @@ def replace_package_name(project_root: str, old_package: str, new_package: str)
     logs.append(f"[PACKAGE]    Old: {old_package}")
     logs.append(f"[PACKAGE]    New: {new_package}")
 
-    project_path = Path(project_root)
+    if index is None:
+        index = ProjectIndex.build(project_root)
+
+    # 패키지 규칙 + 일괄 치환 규칙을 한 번의 패스로 적용
+    if rewrite is None:
+        plan = RewritePlan(package_rules(old_package, new_package) + bulk_package_rules(old_package, new_package))
+        rewrite = plan.apply(index)
+
+    error_message = "[PACKAGE] ❌ ERROR updating {file}: {error}"
+    updated_message = "[PACKAGE] ✅ Updated package in {path}"
 
     # 1. build.gradle(.kts) 파일 수정
-    for gradle_file in project_path.rglob('build.gradle*'):
-        try:
-            content = gradle_file.read_text(encoding='utf-8', errors='ignore')
-            original_content = content
-
-            # applicationId "..." (Groovy)
-            content = re.sub(
-                r'(applicationId\s+["\'])' + re.escape(old_package) + r'(["\'])',
-                r'\1' + new_package + r'\2',
-                content
-            )
-
-            # applicationId = "..." (Kotlin DSL)
-            content = re.sub(
-                r'(applicationId\s*=\s*["\'])' + re.escape(old_package) + r'(["\'])',
-                r'\1' + new_package + r'\2',
-                content
-            )
-
-            # namespace = "..." (AGP 7.0+)
-            content = re.sub(
-                r'(namespace\s*=\s*["\'])' + re.escape(old_package) + r'(["\'])',
-                r'\1' + new_package + r'\2',
-                content
-            )
-
-            if content != original_content:
-                gradle_file.write_text(content, encoding='utf-8')
-                logs.append(f"[PACKAGE] ✅ Updated package in {gradle_file.relative_to(project_path)}")
-                change_count += 1
-        except Exception as e:
-            import traceback
-            logs.append(f"[PACKAGE] ❌ ERROR updating {gradle_file}: {str(e)}")
-            logs.append(f"[PACKAGE] Traceback: {traceback.format_exc()}")
+    for gradle_file in index.files(ROLE_GRADLE):
+        change_count += rewrite.report(logs, gradle_file, STEP_PACKAGE, updated_message, error_message, '[PACKAGE]')
 
     # 2. AndroidManifest.xml 파일 수정
-    for manifest in project_path.rglob('AndroidManifest.xml'):
-        try:
-            content = manifest.read_text(encoding='utf-8', errors='ignore')
-            new_content = re.sub(
-                r'(package\s*=\s*["\'])' + re.escape(old_package) + r'(["\'])',
-                r'\1' + new_package + r'\2',
-                content
-            )
-            if new_content != content:
-                manifest.write_text(new_content, encoding='utf-8')
-                logs.append(f"[PACKAGE] ✅ Updated package in {manifest.relative_to(project_path)}")
-                change_count += 1
-        except Exception as e:
-            import traceback
-            logs.append(f"[PACKAGE] ❌ ERROR updating {manifest}: {str(e)}")
-            logs.append(f"[PACKAGE] Traceback: {traceback.format_exc()}")
+    for manifest in index.files(ROLE_MANIFEST):
+        change_count += rewrite.report(logs, manifest, STEP_PACKAGE, updated_message, error_message, '[PACKAGE]')
 
     # 3. 소스 파일(.kt/.java) package 선언 수정
-    source_files = list(project_path.rglob('*.kt')) + list(project_path.rglob('*.java'))
-    for source_file in source_files:
-        # build 폴더 제외
-        if 'build' in source_file.parts:
-            continue
-        try:
-            content = source_file.read_text(encoding='utf-8', errors='ignore')
-            original_content = content
-
-            # 패턴: package 선언 (서브패키지 포함, 세미콜론 선택적)
-            new_content = re.sub(
-                r'^package\s+' + re.escape(old_package) + r'(\.[a-zA-Z_][a-zA-Z0-9_.]*)?\s*;?\s*$',
-                f'package {new_package}\\1',
-                content,
-                flags=re.MULTILINE
-            )
-
-            if new_content != original_content:
-                source_file.write_text(new_content, encoding='utf-8')
-                logs.append(f"[PACKAGE] ✅ Updated package in {source_file.relative_to(project_path)}")
-                change_count += 1
-        except Exception as e:
-            import traceback
-            logs.append(f"[PACKAGE] ❌ ERROR updating {source_file}: {str(e)}")
-            logs.append(f"[PACKAGE] Traceback: {traceback.format_exc()}")
+    # (build 폴더는 인덱스 분류 단계에서 제외됨)
+    for source_file in index.files(ROLE_SOURCE):
+        change_count += rewrite.report(logs, source_file, STEP_PACKAGE, updated_message, error_message, '[PACKAGE]')
 
     # 4. 모든 텍스트 파일에서 패키지명 일괄 변경
-    bulk_logs, bulk_changes = _replace_package_in_all_files(project_root, old_package, new_package)
+    bulk_logs, bulk_changes = _replace_package_in_all_files(project_root, old_package, new_package, index, rewrite)
     logs.extend(bulk_logs)
     change_count += bulk_changes
 
     # 5. 디렉토리 구조 변경
-    dir_logs, dir_changes = _rename_package_directories(project_root, old_package, new_package)
+    dir_logs, dir_changes = _rename_package_directories(project_root, old_package, new_package, index)
     logs.extend(dir_logs)
     change_count += dir_changes
 
@@ -189,7 +161,13 @@ def replace_package_name(project_root: str, old_package: str, new_package: str)
     return logs, change_count
 
 
-def _replace_package_in_all_files(project_root: str, old_package: str, new_package: str) -> Tuple[List[str], int]:
+def _replace_package_in_all_files(
+    project_root: str,
+    old_package: str,
+    new_package: str,
+    index: Optional[ProjectIndex] = None,
+    rewrite: Optional[RewriteResult] = None
+) -> Tuple[List[str], int]:
     """
     프로젝트 내 모든 텍스트 파일에서 이전 패키지명을 새 패키지명으로 일괄 변경
 
@@ -197,62 +175,93 @@ def _replace_package_in_all_files(project_root: str, old_package: str, new_packa
         project_root: 프로젝트 루트
         old_package: 이전 패키지명
         new_package: 새 패키지명
+        index: 프로젝트 인덱스 (없으면 새로 생성)
+        rewrite: 단일 패스 치환 결과 (있으면 결과만 기록)
 
     Returns:
         (로그 메시지 리스트, 변경된 파일 수)
     """
     logs = []
     change_count = 0
-    project_path = Path(project_root)
-
-    # 텍스트 파일 확장자 (변경 대상)
-    TEXT_EXTENSIONS = {
-        '.xml', '.kt', '.java', '.gradle', '.kts', '.properties',
-        '.json', '.txt', '.md', '.pro', '.cfg', '.config'
-    }
-
-    # 제외할 폴더
-    EXCLUDE_DIRS = {'build', '.gradle', '.idea', 'outputs', '__pycache__', '.git'}
+    if index is None:
+        index = ProjectIndex.build(project_root)
 
     logs.append(f"[PACKAGE] 🔍 Scanning all text files for package name replacement...")
 
-    for file_path in project_path.rglob('*'):
-        # 제외 조건 확인
-        if any(excluded in file_path.parts for excluded in EXCLUDE_DIRS):
-            continue
-
-        if not file_path.is_file():
-            continue
-
-        if file_path.suffix.lower() not in TEXT_EXTENSIONS:
-            continue
-
-        try:
-            # 파일 읽기
-            content = file_path.read_text(encoding='utf-8', errors='ignore')
-            original_content = content
-
-            # 패키지명 일괄 치환
-            content = content.replace(old_package, new_package)
-
-            if content != original_content:
-                file_path.write_text(content, encoding='utf-8')
-                logs.append(f"[PACKAGE] ✅ Bulk replaced in {file_path.relative_to(project_path)}")
-                change_count += 1
+    # 텍스트 확장자 / 제외 폴더 조건은 인덱스의 ROLE_TEXT 분류에 반영되어 있음
+    if rewrite is None:
+        rewrite = RewritePlan(bulk_package_rules(old_package, new_package)).apply(index)
 
-        except Exception as e:
-            # 오류는 조용히 스킵 (바이너리 파일 등)
-            continue
+    # 오류는 조용히 스킵 (바이너리 파일 등)
+    for file_path in index.files(ROLE_TEXT):
+        change_count += rewrite.report(logs, file_path, STEP_PACKAGE_BULK, "[PACKAGE] ✅ Bulk replaced in {path}")
 
     if change_count > 0:
         logs.append(f"[PACKAGE] 📊 Bulk replacement: {change_count} files updated")
     else:
         logs.append(f"[PACKAGE] ℹ️ No additional files needed bulk replacement")
 
+    logs.extend(_skipped_file_report(rewrite, index))
     return logs, change_count
 
 
-def _rename_package_directories(project_root: str, old_package: str, new_package: str) -> Tuple[List[str], int]:
+def _skipped_file_report(rewrite: RewriteResult, index: ProjectIndex) -> List[str]:
+    """일괄 치환에서 건너뛴 바이너리 파일 / 스트리밍으로 처리한 대용량 파일 보고"""
+    logs = []
+    binary_count = 0
+    streamed_count = 0
+    for rel, (reason, skipped_rules) in rewrite.skipped.items():
+        record = index.record(rel)
+        if record is None or not record.roles & ROLE_TEXT:
+            continue
+        if reason == SKIP_BINARY:
+            binary_count += 1
+            logs.append(f"[PACKAGE] ⏭️ Skipped binary content: {rel}")
+            continue
+        streamed_count += 1
+        message = f"[PACKAGE] 🌊 Streamed large file ({record.size / (1024 * 1024):.1f} MB): {rel}"
+        if skipped_rules:
+            message += f" (not applied: {', '.join(skipped_rules)})"
+        logs.append(message)
+
+    if binary_count or streamed_count:
+        logs.append(
+            f"[PACKAGE] 📊 Skipped {binary_count} binary files, "
+            f"streamed {streamed_count} files over the size limit"
+        )
+    return logs
+
+
+def plan_package_directory_moves(
+    old_package: str,
+    new_package: str,
+    index: ProjectIndex
+) -> List[Tuple[Path, Path, Path]]:
+    """
+    패키지 디렉토리 이동 목록 계산 (파일 시스템은 변경하지 않음)
+
+    Returns:
+        (소스 디렉토리, 기존 패키지 경로, 새 패키지 경로) 목록
+    """
+    old_parts = old_package.split('.')
+    new_parts = new_package.split('.')
+    moves = []
+
+    # src/main/* 하위의 모든 소스 디렉토리 탐색 (java, kotlin, etc.)
+    for src_main_dir in index.dirs_matching('src/main'):
+        for src_dir in index.subdirs(src_main_dir):
+            old_package_path = src_dir / Path(*old_parts)
+            if index.is_dir(old_package_path):
+                moves.append((src_dir, old_package_path, src_dir / Path(*new_parts)))
+    return moves
+
+
+def _rename_package_directories(
+    project_root: str,
+    old_package: str,
+    new_package: str,
+    index: Optional[ProjectIndex] = None
+) -> Tuple[List[str], int]:
     """
     패키지 디렉토리 구조 변경
     src/main/java/com/example/old -> src/main/java/com/example/new
@@ -260,43 +269,33 @@ def _rename_package_directories(project_root: str, old_package: str, new_package
     logs = []
     change_count = 0
     project_path = Path(project_root)
+    if index is None:
+        index = ProjectIndex.build(project_root)
 
-    old_parts = old_package.split('.')
-    new_parts = new_package.split('.')
-
-    # src/main/* 하위의 모든 소스 디렉토리 탐색
-    for src_main_dir in project_path.rglob('src/main'):
-        if not src_main_dir.is_dir():
-            continue
-
-        # src/main 하위의 모든 디렉토리 탐색 (java, kotlin, etc.)
-        for src_dir in src_main_dir.iterdir():
-            if not src_dir.is_dir():
-                continue
-
-            old_package_path = src_dir / Path(*old_parts)
-            if old_package_path.exists() and old_package_path.is_dir():
-                new_package_path = src_dir / Path(*new_parts)
-                try:
-                    # 새 패키지 부모 디렉토리 생성
-                    new_package_path.parent.mkdir(parents=True, exist_ok=True)
-
-                    # 🔥 중요: 대상 경로가 이미 존재하면 제거!
-                    if new_package_path.exists():
-                        shutil.rmtree(new_package_path)
-                        logs.append(f"[PACKAGE] 🗑️ Removed existing: {new_package_path.relative_to(project_path)}")
-
-                    # 이동
-                    shutil.move(str(old_package_path), str(new_package_path))
-                    logs.append(f"[PACKAGE] ✅ Moved directory: {old_package_path.relative_to(project_path)} -> {new_package_path.relative_to(project_path)}")
-                    change_count += 1
-
-                    # 빈 부모 디렉토리 정리
-                    _cleanup_empty_dirs(src_dir)
-                except Exception as e:
-                    import traceback
-                    logs.append(f"[PACKAGE] ❌ ERROR moving directory {old_package_path}: {str(e)}")
-                    logs.append(f"[PACKAGE] Traceback: {traceback.format_exc()}")
+    for src_dir, old_package_path, new_package_path in plan_package_directory_moves(old_package, new_package, index):
+        try:
+            # 새 패키지 부모 디렉토리 생성
+            new_package_path.parent.mkdir(parents=True, exist_ok=True)
+
+            # 🔥 중요: 대상 경로가 이미 존재하면 제거!
+            if new_package_path.exists():
+                shutil.rmtree(new_package_path)
+                index.remove(new_package_path)
+                logs.append(f"[PACKAGE] 🗑️ Removed existing: {new_package_path.relative_to(project_path)}")
+
+            # 이동
+            shutil.move(str(old_package_path), str(new_package_path))
+            index.move_tree(old_package_path, new_package_path)
+            logs.append(f"[PACKAGE] ✅ Moved directory: {old_package_path.relative_to(project_path)} -> {new_package_path.relative_to(project_path)}")
+            change_count += 1
+
+            # 빈 부모 디렉토리 정리
+            _cleanup_empty_dirs(src_dir)
+            index.prune_empty_dirs(src_dir)
+        except Exception as e:
+            import traceback
+            logs.append(f"[PACKAGE] ❌ ERROR moving directory {old_package_path}: {str(e)}")
+            logs.append(f"[PACKAGE] Traceback: {traceback.format_exc()}")
 
     return logs, change_count
 
@@ -314,7 +313,12 @@ def _cleanup_empty_dirs(start_dir: Path):
                 pass
 
 
-def replace_app_name(project_root: str, new_app_name: str) -> Tuple[List[str], int]:
+def replace_app_name(
+    project_root: str,
+    new_app_name: str,
+    index: Optional[ProjectIndex] = None,
+    rewrite: Optional[RewriteResult] = None
+) -> Tuple[List[str], int]:
     """
     앱 이름 교체
     - res/values*/strings.xml의 <string name="app_name">
@@ -324,83 +328,55 @@ def replace_app_name(project_root: str, new_app_name: str) -> Tuple[List[str], i
     Args:
         project_root: 프로젝트 루트
         new_app_name: 새 앱 이름
+        index: 프로젝트 인덱스 (없으면 새로 생성)
+        rewrite: 단일 패스 치환 결과 (있으면 결과만 기록)
 
     Returns:
         (로그 메시지 리스트, 변경된 파일 수)
     """
     logs = []
     change_count = 0
-    project_path = Path(project_root)
+    if index is None:
+        index = ProjectIndex.build(project_root)
 
     logs.append(f"[APP_NAME] 🔄 Changing app name to: {new_app_name}")
 
-    # 1. strings.xml 수정
-    for strings_xml in project_path.rglob('strings.xml'):
-        # More flexible check for values directory
-        if not any(part.startswith('values') for part in strings_xml.parts):
-            continue
-        try:
-            content = strings_xml.read_text(encoding='utf-8', errors='ignore')
-            new_content = re.sub(
-                r'(<string\s+name="app_name">)[^<]+(</string>)',
-                r'\1' + new_app_name + r'\2',
-                content
-            )
-            if new_content != content:
-                strings_xml.write_text(new_content, encoding='utf-8')
-                logs.append(f"[APP_NAME] ✅ Updated app_name in {strings_xml.relative_to(project_path)}")
-                change_count += 1
-        except Exception as e:
-            import traceback
-            logs.append(f"[APP_NAME] ❌ ERROR updating {strings_xml}: {str(e)}")
-            logs.append(f"[APP_NAME] Traceback: {traceback.format_exc()}")
+    if rewrite is None:
+        rewrite = RewritePlan(app_name_rules(new_app_name)).apply(index)
 
-    # 2. AndroidManifest.xml 정규화
-    for manifest in project_path.rglob('AndroidManifest.xml'):
-        try:
-            content = manifest.read_text(encoding='utf-8', errors='ignore')
-            # android:label을 @string/app_name으로 교체
-            new_content = re.sub(
-                r'android:label="[^"]*"',
-                r'android:label="@string/app_name"',
-                content
-            )
-            if new_content != content:
-                manifest.write_text(new_content, encoding='utf-8')
-                logs.append(f"[APP_NAME] ✅ Normalized android:label in {manifest.relative_to(project_path)}")
-                change_count += 1
-        except Exception as e:
-            import traceback
-            logs.append(f"[APP_NAME] ❌ ERROR updating {manifest}: {str(e)}")
-            logs.append(f"[APP_NAME] Traceback: {traceback.format_exc()}")
+    error_message = "[APP_NAME] ❌ ERROR updating {file}: {error}"
+
+    # 1. strings.xml 수정
+    # (values* 디렉토리 조건은 인덱스의 ROLE_STRINGS 분류에 반영되어 있음)
+    for strings_xml in index.files(ROLE_STRINGS):
+        change_count += rewrite.report(
+            logs, strings_xml, STEP_APP_NAME,
+            "[APP_NAME] ✅ Updated app_name in {path}", error_message, '[APP_NAME]'
+        )
+
+    # 2. AndroidManifest.xml 정규화 (android:label을 @string/app_name으로 교체)
+    for manifest in index.files(ROLE_MANIFEST):
+        change_count += rewrite.report(
+            logs, manifest, STEP_APP_NAME,
+            "[APP_NAME] ✅ Normalized android:label in {path}", error_message, '[APP_NAME]'
+        )
 
     # 3. settings.gradle(.kts) rootProject.name 수정
-    for settings_file in project_path.glob('settings.gradle*'):
-        try:
-            content = settings_file.read_text(encoding='utf-8', errors='ignore')
-            original_content = content
-
-            # rootProject.name = "..." 형태 (Groovy/Kotlin DSL 모두 지원)
-            new_content = re.sub(
-                r'(rootProject\.name\s*=\s*["\'])[^"\']+(["\'])',
-                r'\1' + new_app_name + r'\2',
-                content
-            )
-
-            if new_content != original_content:
-                settings_file.write_text(new_content, encoding='utf-8')
-                logs.append(f"[APP_NAME] ✅ Updated rootProject.name in {settings_file.relative_to(project_path)}")
-                change_count += 1
-        except Exception as e:
-            import traceback
-            logs.append(f"[APP_NAME] ❌ ERROR updating {settings_file}: {str(e)}")
-            logs.append(f"[APP_NAME] Traceback: {traceback.format_exc()}")
+    for settings_file in index.files(ROLE_SETTINGS):
+        change_count += rewrite.report(
+            logs, settings_file, STEP_APP_NAME,
+            "[APP_NAME] ✅ Updated rootProject.name in {path}", error_message, '[APP_NAME]'
+        )
 
     logs.append(f"[APP_NAME] 📊 Total changes: {change_count} files")
     return logs, change_count
 
 
-def reset_version(project_root: str) -> Tuple[List[str], int]:
+def reset_version(
+    project_root: str,
+    index: Optional[ProjectIndex] = None,
+    rewrite: Optional[RewriteResult] = None
+) -> Tuple[List[str], int]:
     """
     버전 정보 초기화
     - versionCode = 1
@@ -409,57 +385,28 @@ def reset_version(project_root: str) -> Tuple[List[str], int]:
 
     Args:
         project_root: 프로젝트 루트
+        index: 프로젝트 인덱스 (없으면 새로 생성)
+        rewrite: 단일 패스 치환 결과 (있으면 결과만 기록)
 
     Returns:
         (로그 메시지 리스트, 변경된 파일 수)
     """
     logs = []
     change_count = 0
-    project_path = Path(project_root)
+    if index is None:
+        index = ProjectIndex.build(project_root)
 
     logs.append("[VERSION] 🔄 Resetting version to 1.0.0")
 
-    for gradle_file in project_path.rglob('build.gradle*'):
-        try:
-            content = gradle_file.read_text(encoding='utf-8', errors='ignore')
-            original_content = content
-
-            # versionCode (Groovy)
-            content = re.sub(
-                r'versionCode\s+\d+',
-                r'versionCode 1',
-                content
-            )
-
-            # versionCode = ... (Kotlin DSL)
-            content = re.sub(
-                r'versionCode\s*=\s*\d+',
-                r'versionCode = 1',
-                content
-            )
-
-            # versionName (Groovy)
-            content = re.sub(
-                r'versionName\s+["\'][^"\']*["\']',
-                r'versionName "1.0.0"',
-                content
-            )
-
-            # versionName = "..." (Kotlin DSL)
-            content = re.sub(
-                r'versionName\s*=\s*["\'][^"\']*["\']',
-                r'versionName = "1.0.0"',
-                content
-            )
-
-            if content != original_content:
-                gradle_file.write_text(content, encoding='utf-8')
-                logs.append(f"[VERSION] ✅ Reset to versionCode=1, versionName=1.0.0 in {gradle_file.relative_to(project_path)}")
-                change_count += 1
-        except Exception as e:
-            import traceback
-            logs.append(f"[VERSION] ❌ ERROR updating {gradle_file}: {str(e)}")
-            logs.append(f"[VERSION] Traceback: {traceback.format_exc()}")
+    if rewrite is None:
+        rewrite = RewritePlan(version_rules()).apply(index)
+
+    for gradle_file in index.files(ROLE_GRADLE):
+        change_count += rewrite.report(
+            logs, gradle_file, STEP_VERSION,
+            "[VERSION] ✅ Reset to versionCode=1, versionName=1.0.0 in {path}",
+            "[VERSION] ❌ ERROR updating {file}: {error}", '[VERSION]'
+        )
 
     logs.append(f"[VERSION] 📊 Total changes: {change_count} files")
     return logs, change_count
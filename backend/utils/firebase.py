@@ -6,12 +6,15 @@ import json
 from pathlib import Path
 from typing import List, Optional
 
+from backend.utils.project_index import ProjectIndex, ROLE_GOOGLE_SERVICES, ROLE_GRADLE
+
 
 def replace_google_services(
     project_root: str,
     google_services_path: str,
     old_package: Optional[str] = None,
-    new_package: Optional[str] = None
+    new_package: Optional[str] = None,
+    index: Optional[ProjectIndex] = None
 ) -> List[str]:
     """
     google-services.json을 app 모듈의 여러 위치에 교체하고 패키지명 변경
@@ -21,6 +24,7 @@ def replace_google_services(
         google_services_path: 새 google-services.json 파일 경로
         old_package: 이전 패키지명 (패키지명 변경 시)
         new_package: 새 패키지명 (패키지명 변경 시)
+        index: 프로젝트 인덱스 (없으면 새로 생성, 배치한 파일이 반영됨)
 
     Returns:
         로그 메시지 리스트
@@ -32,14 +36,12 @@ def replace_google_services(
         return logs
 
     project_path = Path(project_root)
+    if index is None:
+        index = ProjectIndex.build(project_root)
 
     # 프로젝트 내 기존 google-services.json 파일들을 모두 찾기
-    existing_files = list(project_path.rglob('google-services.json'))
-
-    # 제외할 폴더 (build 등)
-    EXCLUDE_DIRS = {'build', '.gradle', 'outputs'}
-    existing_files = [f for f in existing_files
-                     if not any(excluded in f.parts for excluded in EXCLUDE_DIRS)]
+    # (build 등 제외 폴더는 인덱스의 ROLE_GOOGLE_SERVICES 분류에 반영되어 있음)
+    existing_files = index.files(ROLE_GOOGLE_SERVICES)
 
     if not existing_files:
         # 기존 파일이 없으면 기본 위치들에 배치
@@ -47,10 +49,10 @@ def replace_google_services(
 
         # app 모듈 찾기
         app_module = project_path / 'app'
-        if not app_module.exists():
-            for gradle_file in project_path.rglob('build.gradle*'):
+        if not index.exists(app_module):
+            for gradle_file in index.files(ROLE_GRADLE):
                 app_module = gradle_file.parent
-                if (app_module / 'src').exists():
+                if index.exists(app_module / 'src'):
                     break
 
         target_locations = [
@@ -93,6 +95,7 @@ def replace_google_services(
                 shutil.copy2(google_services_path, target_path)
                 logs.append(f"[FIREBASE] ✅ Placed at {target_path.relative_to(project_path)}")
 
+            index.add_file(target_path)
             replaced_count += 1
 
         except Exception as e:
@@ -1,13 +1,32 @@
 """
 앱 아이콘 교체 (자동 리사이징)
+- 해상도별 PNG 렌디션은 (원본 이미지 해시, 해상도, 대상) 키로 디스크에 캐시
+- 큰 원본은 축소 디코딩(JPEG draft) 후 중간 크기로 한 번만 줄이고, 해상도별 리사이징은 병렬 실행
+- 출력 형식 선택: PNG, 최적화 PNG(무손실일 때 팔레트), 무손실 WebP(minSdk 허용 시)
 """
+import hashlib
+import io
+import os
 import re
-import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, NamedTuple, Optional, Tuple
+
+from backend.cache import ResultCache
+from backend.utils.project_index import ProjectIndex, ROLE_GRADLE, ROLE_LAYOUT, ROLE_MANIFEST
+from backend.utils.rewrite_plan import (
+    RewritePlan,
+    RewriteResult,
+    STEP_ICON,
+    STEP_SPLASH,
+    icon_reference_rules,
+    splash_reference_rules,
+)
 
 try:
-    from PIL import Image
+    from PIL import Image, features
     PILLOW_AVAILABLE = True
 except ImportError:
     PILLOW_AVAILABLE = False
@@ -22,8 +41,439 @@ ICON_SIZES: Dict[str, int] = {
     'xxxhdpi': 192,
 }
 
+# 스플래시 이미지 파일명 (출력 형식에 따라 확장자만 바뀜)
+SPLASH_FILENAME = 'splash_screen.png'
+
+# 교체할 런처 아이콘 리소스 이름 (ic_launcher, ic_launcher_round는 항상 생성)
+ICON_TARGETS = [
+    'ic_launcher',
+    'ic_launcher_round',
+    'ic_launcher_background',
+    'ic_launcher_foreground',
+    'ic_launcher_monochrome',
+]
+REQUIRED_ICON_TARGETS = ('ic_launcher', 'ic_launcher_round')
+
+# 출력 형식
+ICON_FORMAT_PNG = 'png'              # 기존 32비트 PNG
+ICON_FORMAT_OPTIMIZED = 'optimized'  # 최적화 PNG (색상 256개 이하면 무손실 팔레트 PNG)
+ICON_FORMAT_WEBP = 'webp'            # 무손실 WebP (minSdk 미달 시 최적화 PNG로 대체)
+ICON_FORMATS = (ICON_FORMAT_PNG, ICON_FORMAT_OPTIMIZED, ICON_FORMAT_WEBP)
+FORMAT_EXTENSIONS = {
+    ICON_FORMAT_PNG: '.png',
+    ICON_FORMAT_OPTIMIZED: '.png',
+    ICON_FORMAT_WEBP: '.webp',
+}
+# 같은 리소스 이름으로 공존하면 빌드 오류(중복 리소스)가 나는 이미지 확장자
+RESOURCE_IMAGE_EXTENSIONS = ('.png', '.webp', '.jpg', '.jpeg')
+# 투명도가 있는 무손실 WebP를 지원하는 최소 API 레벨 (Android 4.3)
+WEBP_LOSSLESS_MIN_SDK = 18
+
+MIN_SDK_PATTERN = re.compile(r'\bminSdk(?:Version)?\s*(?:=\s*)?(\d+)')
+
+# 렌디션 대상 (캐시 키 구분용)
+TARGET_ICON = 'icon'
+TARGET_SPLASH = 'splash'
+
+# 렌디션 캐시 설정 (환경 변수로 조정, 0이면 비활성화)
+ICON_CACHE_DIR = os.environ.get(
+    'ICON_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'android_rebuild_icon_cache')
+)
+ICON_CACHE_MAX_BYTES = int(os.environ.get('ICON_CACHE_MAX_BYTES', str(64 * 1024 * 1024)))
+# 렌디션 생성 방식이 바뀌면 올려서 기존 캐시 무효화
+RENDITION_VERSION = 3
+
+# 중간 이미지는 가장 큰 해상도의 이 배수 이상으로 유지 (최종 LANCZOS 품질 유지)
+RESAMPLE_SUPERSAMPLE = 2
+# 큰 축소 시 정수 배 박스 축소 후 LANCZOS 적용 (Pillow reducing_gap)
+RESAMPLE_REDUCING_GAP = 3.0
+# PNG zlib 압축 레벨 (0~9, Pillow 기본값 6, 낮을수록 빠르고 파일이 큼)
+PNG_COMPRESS_LEVEL = int(os.environ.get('ICON_PNG_COMPRESS_LEVEL', '6'))
+
+_rendition_cache: Optional[ResultCache] = None
+_rendition_cache_lock = threading.Lock()
+
+
+def get_rendition_cache() -> ResultCache:
+    """프로세스 공용 렌디션 캐시 (처음 사용할 때 생성)"""
+    global _rendition_cache
+    with _rendition_cache_lock:
+        if _rendition_cache is None:
+            # PNG와 WebP 렌디션이 함께 저장되므로 (형식은 키에 포함) 항목 확장자 없음
+            _rendition_cache = ResultCache(ICON_CACHE_DIR, ICON_CACHE_MAX_BYTES, suffix='')
+        return _rendition_cache
+
+
+def _file_sha256(path: Path) -> str:
+    """파일 SHA-256 (청크 단위로 읽음)"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _rendition_key(
+    image_hash: str,
+    density: str,
+    target: str,
+    compress_level: int,
+    output_format: str
+) -> str:
+    material = (f"v{RENDITION_VERSION}:{image_hash}:{density}:{ICON_SIZES[density]}:"
+                f"{target}:{compress_level}:{output_format}")
+    return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+
+def detect_min_sdk(index: ProjectIndex) -> Optional[int]:
+    """
+    Gradle 파일의 minSdk / minSdkVersion 중 가장 작은 값 (숫자로 선언된 경우만)
+
+    Returns:
+        minSdk (찾지 못하면 None)
+    """
+    values = []
+    for gradle_file in index.files(ROLE_GRADLE):
+        try:
+            content = gradle_file.read_text(encoding='utf-8', errors='ignore')
+        except OSError:
+            continue
+        values.extend(int(value) for value in MIN_SDK_PATTERN.findall(content))
+    return min(values) if values else None
+
+
+def resolve_output_format(output_format: str, index: ProjectIndex) -> Tuple[str, Optional[str]]:
+    """
+    요청한 출력 형식을 프로젝트에서 사용 가능한 형식으로 결정
+
+    Returns:
+        (실제 형식, 대체 사유 또는 None)
+    """
+    if output_format != ICON_FORMAT_WEBP:
+        return output_format, None
+    if not features.check('webp'):
+        return ICON_FORMAT_OPTIMIZED, "Pillow has no WebP support"
+    min_sdk = detect_min_sdk(index)
+    if min_sdk is None:
+        return ICON_FORMAT_OPTIMIZED, "minSdk not found"
+    if min_sdk < WEBP_LOSSLESS_MIN_SDK:
+        return ICON_FORMAT_OPTIMIZED, f"minSdk {min_sdk} < {WEBP_LOSSLESS_MIN_SDK}"
+    return ICON_FORMAT_WEBP, None
+
+
+def _to_exact_palette(image: 'Image.Image') -> Optional['Image.Image']:
+    """색상이 256개 이하인 RGBA 이미지를 무손실 팔레트(P) 이미지로 변환 (초과하면 None)"""
+    colors = image.getcolors(256)
+    if colors is None:
+        return None
+    palette_index = {color: i for i, (_, color) in enumerate(colors)}
+    paletted = Image.new('P', image.size)
+    paletted.putdata([palette_index[pixel] for pixel in image.getdata()])
+    paletted.putpalette([channel for _, color in colors for channel in color[:3]])
+    paletted.info['transparency'] = bytes(color[3] for _, color in colors)
+    return paletted
+
+
+def _prepare_source(image: 'Image.Image', largest: int) -> 'Image.Image':
+    """
+    리사이징 원본 준비 (RGBA, 가장 큰 해상도의 RESAMPLE_SUPERSAMPLE배 크기)
+
+    - JPEG은 draft로 축소 스케일(1/2, 1/4, 1/8) 디코딩하여 전체 해상도 디코딩을 피함
+    - 그래도 크면 중간 크기로 한 번만 축소 (해상도별 리사이징은 이 중간 이미지에서 시작)
+    """
+    limit = largest * RESAMPLE_SUPERSAMPLE
+    if image.format == 'JPEG' and min(image.size) > limit:
+        image.draft(image.mode, (limit, limit))
+
+    # RGBA 모드로 변환 (투명도 지원)
+    if image.mode != 'RGBA':
+        image = image.convert('RGBA')
+
+    if image.width > limit and image.height > limit:
+        image = image.resize((limit, limit), Image.Resampling.LANCZOS, reducing_gap=RESAMPLE_REDUCING_GAP)
+    return image
+
+
+def _encode_rendition(
+    source: 'Image.Image',
+    size: int,
+    compress_level: int,
+    output_format: str = ICON_FORMAT_PNG
+) -> bytes:
+    """해상도 하나의 렌디션 생성 (Pillow가 리사이징/인코딩 중 GIL을 해제하므로 스레드 병렬 실행)"""
+    resized = source.resize((size, size), Image.Resampling.LANCZOS)
+    buffer = io.BytesIO()
+    if output_format == ICON_FORMAT_WEBP:
+        resized.save(buffer, 'WEBP', lossless=True, quality=100, method=6, exact=True)
+    elif output_format == ICON_FORMAT_OPTIMIZED:
+        paletted = _to_exact_palette(resized)
+        if paletted is not None:
+            paletted.save(buffer, 'PNG', optimize=True, transparency=paletted.info['transparency'])
+        else:
+            resized.save(buffer, 'PNG', optimize=True)
+    else:
+        resized.save(buffer, 'PNG', compress_level=compress_level)
+    return buffer.getvalue()
+
+
+def _build_renditions(
+    image: 'Image.Image',
+    image_file: Path,
+    target: str,
+    cache: Optional[ResultCache],
+    compress_level: int = PNG_COMPRESS_LEVEL,
+    output_format: str = ICON_FORMAT_PNG
+) -> Tuple[Dict[str, bytes], Dict[str, str], int]:
+    """
+    해상도별 PNG 렌디션 생성 (캐시에 있으면 디코딩/리사이징 없이 재사용)
+
+    Args:
+        image: 열린 원본 이미지 (헤더만 읽은 상태)
+        image_file: 원본 이미지 경로 (캐시 키용 해시 계산)
+        target: TARGET_ICON 또는 TARGET_SPLASH
+        cache: 렌디션 캐시 (None이면 캐시 사용 안 함)
+        compress_level: PNG 압축 레벨
+        output_format: ICON_FORMAT_* (resolve_output_format으로 결정된 형식)
+
+    Returns:
+        (해상도 -> PNG 바이트, 해상도 -> 오류 메시지, 캐시에서 가져온 수)
+    """
+    renditions: Dict[str, bytes] = {}
+    errors: Dict[str, str] = {}
+    keys: Dict[str, str] = {}
+
+    if cache is not None and cache.enabled:
+        image_hash = _file_sha256(image_file)
+        for density in ICON_SIZES:
+            keys[density] = _rendition_key(image_hash, density, target, compress_level, output_format)
+            data = cache.read(keys[density])
+            if data is not None:
+                renditions[density] = data
+    reused = len(renditions)
+
+    missing = [density for density in ICON_SIZES if density not in renditions]
+    if missing:
+        # 캐시에 없는 해상도가 있을 때만 디코딩
+        try:
+            source = _prepare_source(image, max(ICON_SIZES[density] for density in missing))
+        except Exception as e:
+            return renditions, {density: str(e) for density in missing}, reused
+
+        with ThreadPoolExecutor(max_workers=len(missing)) as pool:
+            futures = {
+                density: pool.submit(_encode_rendition, source, ICON_SIZES[density], compress_level, output_format)
+                for density in missing
+            }
+
+        for density in missing:
+            try:
+                renditions[density] = futures[density].result()
+            except Exception as e:
+                errors[density] = str(e)
+                continue
+            if density in keys:
+                try:
+                    cache.write(keys[density], renditions[density])
+                except OSError:
+                    pass  # 캐시 저장 실패는 결과에 영향 없음
+
+    return renditions, errors, reused
+
+
+class RenderedImage(NamedTuple):
+    """미리 만든 렌디션 (파이프라인 스케줄러가 텍스트 단계와 겹쳐 실행)"""
+    output_format: str
+    renditions: Dict[str, bytes]
+    errors: Dict[str, str]
+    reused: int
+
+
+def render_images(
+    icon_path: str,
+    splash_path: Optional[str] = None,
+    output_format: str = ICON_FORMAT_PNG,
+    cache: Optional[ResultCache] = None
+) -> Dict[str, RenderedImage]:
+    """
+    아이콘/스플래시 렌디션만 미리 생성 (프로젝트 파일은 읽거나 쓰지 않음)
+
+    Args:
+        icon_path: 새 아이콘 이미지 경로
+        splash_path: 스플래시 이미지 경로 (선택)
+        output_format: resolve_output_format으로 결정된 형식
+        cache: 렌디션 캐시 (None이면 프로세스 공용 캐시 사용)
+
+    Returns:
+        TARGET_ICON/TARGET_SPLASH -> RenderedImage (열 수 없는 이미지는 제외,
+        replace_app_icon이 직접 처리하며 오류를 기록)
+    """
+    if not PILLOW_AVAILABLE:
+        return {}
+    if cache is None:
+        cache = get_rendition_cache()
+
+    rendered = {}
+    for target, image_path in ((TARGET_ICON, icon_path), (TARGET_SPLASH, splash_path)):
+        if not image_path or not Path(image_path).exists():
+            continue
+        try:
+            image = Image.open(image_path)
+        except Exception:
+            continue
+        renditions, errors, reused = _build_renditions(
+            image, Path(image_path), target, cache, output_format=output_format
+        )
+        rendered[target] = RenderedImage(output_format, renditions, errors, reused)
+    return rendered
+
+
+def _take_renditions(
+    prerendered: Optional[Dict[str, RenderedImage]],
+    target: str,
+    output_format: str
+) -> Optional[Tuple[Dict[str, bytes], Dict[str, str], int]]:
+    """미리 만든 렌디션 중 형식이 같은 것 (없으면 None)"""
+    rendered = (prerendered or {}).get(target)
+    if rendered is None or rendered.output_format != output_format:
+        return None
+    return rendered.renditions, rendered.errors, rendered.reused
+
+
+def _stale_duplicates(target_path: Path, index: ProjectIndex) -> List[Path]:
+    """target_path와 리소스 이름이 같고 확장자가 다른 이미지 목록"""
+    return [sibling for sibling in index.children(target_path.parent, f"{target_path.stem}.*")
+            if sibling != target_path and sibling.suffix.lower() in RESOURCE_IMAGE_EXTENSIONS]
+
+
+def _icon_targets(mipmap_dir: Path, extension: str, index: ProjectIndex) -> List[Path]:
+    """
+    mipmap 디렉토리 하나에서 교체할 아이콘 경로 목록
 
-def replace_app_icon(project_root: str, icon_path: str, splash_path: str = None) -> List[str]:
+    ic_launcher와 ic_launcher_round는 항상 생성하고, 나머지는 같은 이름의 이미지가 있을 때만 교체
+    """
+    return [mipmap_dir / f"{icon_name}{extension}" for icon_name in ICON_TARGETS
+            if icon_name in REQUIRED_ICON_TARGETS or _has_resource(mipmap_dir, icon_name, index)]
+
+
+def _remove_stale_duplicates(
+    target_path: Path,
+    index: ProjectIndex,
+    project_path: Path,
+    tag: str,
+    logs: List[str]
+) -> None:
+    """같은 리소스 이름의 다른 확장자 이미지 삭제 (중복 리소스 빌드 오류 방지)"""
+    for sibling in _stale_duplicates(target_path, index):
+        try:
+            if sibling.exists():
+                sibling.unlink()
+            index.remove(sibling)
+            logs.append(f"{tag} 🗑️ Removed stale duplicate: {sibling.relative_to(project_path)}")
+        except OSError as e:
+            logs.append(f"{tag} ❌ ERROR removing {sibling}: {str(e)}")
+
+
+def _has_resource(directory: Path, name: str, index: ProjectIndex) -> bool:
+    """리소스 이름(확장자 제외)의 이미지가 디렉토리에 있는지 확인"""
+    return any(path.suffix.lower() in RESOURCE_IMAGE_EXTENSIONS
+               for path in index.children(directory, f"{name}.*"))
+
+
+def _can_open_image(image_path: str) -> bool:
+    """이미지 헤더를 읽을 수 있는지 확인 (픽셀 디코딩 없음)"""
+    try:
+        with Image.open(image_path):
+            return True
+    except Exception:
+        return False
+
+
+def can_replace_icon(icon_path: str, index: ProjectIndex) -> bool:
+    """
+    replace_app_icon이 아이콘을 교체하고 매니페스트 참조를 갱신할지 미리 판단
+    (단일 패스 치환 계획에 아이콘 참조 규칙을 포함할지 결정하는 용도)
+
+    Args:
+        icon_path: 새 아이콘 이미지 경로
+        index: 프로젝트 인덱스
+
+    Returns:
+        교체 가능하면 True
+    """
+    if not icon_path or not Path(icon_path).exists() or not PILLOW_AVAILABLE:
+        return False
+    return _can_open_image(icon_path) and bool(index.res_dirs())
+
+
+def can_replace_splash(splash_path: str) -> bool:
+    """스플래시 이미지를 처리할 수 있는지 확인 (아이콘 교체가 가능한 경우에만 의미 있음)"""
+    return bool(splash_path) and Path(splash_path).exists() and _can_open_image(splash_path)
+
+
+def plan_icon_targets(
+    project_root: str,
+    icon_path: str,
+    splash_path: Optional[str] = None,
+    index: Optional[ProjectIndex] = None,
+    output_format: str = ICON_FORMAT_PNG
+) -> Dict:
+    """
+    replace_app_icon이 만들고 지울 파일을 계산 (이미지 디코딩/파일 기록 없음, 드라이런용)
+
+    Args:
+        project_root: 프로젝트 루트
+        icon_path: 새 아이콘 이미지 경로
+        splash_path: 스플래시 이미지 경로 (선택)
+        index: 프로젝트 인덱스 (변경되지 않음)
+        output_format: 요청한 출력 형식
+
+    Returns:
+        {
+            'format': str,              # 실제 출력 형식 (WebP 대체 반영)
+            'icons': List[str],         # 생성할 아이콘 (프로젝트 기준 상대 경로)
+            'splash': List[str],        # 생성할 스플래시 이미지
+            'removed': List[str],       # 삭제할 같은 이름의 다른 확장자 이미지
+            'created_dirs': List[str]   # 새로 만들 mipmap 디렉토리
+        }
+        교체할 수 없으면 빈 dict
+    """
+    if index is None:
+        index = ProjectIndex.build(project_root)
+    if not can_replace_icon(icon_path, index):
+        return {}
+
+    project_path = Path(project_root)
+    res_dir = index.res_dirs()[0]
+    resolved_format, _ = resolve_output_format(output_format, index)
+    extension = FORMAT_EXTENSIONS[resolved_format]
+    with_splash = can_replace_splash(splash_path)
+    splash_filename = Path(SPLASH_FILENAME).stem + extension
+
+    plan = {'format': resolved_format, 'icons': [], 'splash': [], 'removed': [], 'created_dirs': []}
+    for density in ICON_SIZES:
+        mipmap_dir = res_dir / f'mipmap-{density}'
+        if not index.is_dir(mipmap_dir):
+            plan['created_dirs'].append(mipmap_dir.relative_to(project_path).as_posix())
+        targets = [('icons', path) for path in _icon_targets(mipmap_dir, extension, index)]
+        if with_splash:
+            targets.append(('splash', mipmap_dir / splash_filename))
+        for kind, target_path in targets:
+            plan[kind].append(target_path.relative_to(project_path).as_posix())
+            plan['removed'].extend(path.relative_to(project_path).as_posix()
+                                   for path in _stale_duplicates(target_path, index))
+    return plan
+
+
+def replace_app_icon(
+    project_root: str,
+    icon_path: str,
+    splash_path: str = None,
+    index: Optional[ProjectIndex] = None,
+    rewrite: Optional[RewriteResult] = None,
+    cache: Optional[ResultCache] = None,
+    output_format: str = ICON_FORMAT_PNG,
+    prerendered: Optional[Dict[str, RenderedImage]] = None
+) -> List[str]:
     """
     업로드된 아이콘 이미지를 각 해상도에 맞게 리사이징하여 mipmap-* 폴더에 저장
     스플래시 이미지도 함께 처리
@@ -32,6 +482,13 @@ def replace_app_icon(project_root: str, icon_path: str, splash_path: str = None)
         project_root: 프로젝트 루트
         icon_path: 새 아이콘 이미지 경로 (PNG/JPG, 권장: 512x512 이상)
         splash_path: 스플래시 이미지 경로 (PNG/JPG, 선택)
+        index: 프로젝트 인덱스 (없으면 새로 생성, 생성한 파일이 반영됨)
+        rewrite: 단일 패스 치환 결과 (있으면 아이콘/스플래시 참조는 결과만 기록)
+        cache: 렌디션 캐시 (None이면 프로세스 공용 캐시 사용)
+        output_format: 출력 형식 (ICON_FORMAT_PNG, ICON_FORMAT_OPTIMIZED, ICON_FORMAT_WEBP)
+            - 리소스 참조(@mipmap/...)는 확장자와 무관하므로 매니페스트/layout 참조는 그대로 유지
+            - 같은 이름의 다른 확장자 이미지는 삭제 (중복 리소스 방지)
+        prerendered: render_images 결과 (형식이 같으면 렌디션을 다시 만들지 않음)
 
     Returns:
         로그 메시지 리스트
@@ -48,69 +505,69 @@ def replace_app_icon(project_root: str, icon_path: str, splash_path: str = None)
         return logs
 
     project_path = Path(project_root)
+    if index is None:
+        index = ProjectIndex.build(project_root)
+    if cache is None:
+        cache = get_rendition_cache()
     icon_file = Path(icon_path)
 
-    # 원본 이미지 열기
+    # 원본 이미지 열기 (헤더만 읽음, 픽셀은 렌디션이 캐시에 없을 때만 디코딩)
     try:
         original_image = Image.open(icon_file)
         logs.append(f"[ICON] Loaded original image: {original_image.size[0]}x{original_image.size[1]}")
-
-        # RGBA 모드로 변환 (투명도 지원)
-        if original_image.mode != 'RGBA':
-            original_image = original_image.convert('RGBA')
     except Exception as e:
         logs.append(f"[ICON] ERROR: Failed to open image: {str(e)}")
         return logs
 
     # app/src/main/res 디렉토리 찾기
-    res_dirs = list(project_path.rglob('src/main/res'))
+    res_dirs = index.res_dirs()
     if not res_dirs:
         logs.append("[ICON] ERROR: res directory not found")
         return logs
 
     res_dir = res_dirs[0]
 
-    # 교체할 아이콘 파일 목록 (모든 런처 아이콘 파일)
-    icon_targets = [
-        'ic_launcher.png',
-        'ic_launcher_round.png',
-        'ic_launcher_background.png',
-        'ic_launcher_foreground.png',
-        'ic_launcher_monochrome.png'
-    ]
+    # 출력 형식 결정 (WebP는 minSdk가 허용할 때만)
+    resolved_format, fallback_reason = resolve_output_format(output_format, index)
+    if fallback_reason:
+        logs.append(f"[ICON] ℹ️ {output_format} output not available ({fallback_reason}), using {resolved_format}")
+    extension = FORMAT_EXTENSIONS[resolved_format]
 
     replaced_count = 0
 
+    # 해상도별 렌디션 준비 (캐시 재사용)
+    prepared = _take_renditions(prerendered, TARGET_ICON, resolved_format)
+    renditions, errors, reused = prepared or _build_renditions(
+        original_image, icon_file, TARGET_ICON, cache, output_format=resolved_format
+    )
+    if reused:
+        logs.append(f"[ICON] ♻️ Reused {reused} cached renditions")
+
     # mipmap-* 폴더 순회
     for density, size in ICON_SIZES.items():
         mipmap_dir = res_dir / f'mipmap-{density}'
 
         # mipmap 디렉토리가 없으면 생성
-        if not mipmap_dir.exists():
+        if not index.is_dir(mipmap_dir):
             mipmap_dir.mkdir(parents=True, exist_ok=True)
+            index.add_dir(mipmap_dir)
             logs.append(f"[ICON] Created directory: {mipmap_dir.relative_to(project_path)}")
 
-        # 해당 해상도로 리사이징
-        try:
-            resized_image = original_image.resize((size, size), Image.Resampling.LANCZOS)
-
-            for icon_name in icon_targets:
-                target_path = mipmap_dir / icon_name
-
-                # 파일이 존재하지 않으면 스킵 (선택적 교체)
-                # 단, ic_launcher와 ic_launcher_round는 항상 생성
-                if not target_path.exists() and icon_name not in ['ic_launcher.png', 'ic_launcher_round.png']:
-                    continue
+        if density in errors:
+            logs.append(f"[ICON] ❌ ERROR resizing for {density}: {errors[density]}")
+            continue
 
-                try:
-                    # PNG로 저장
-                    resized_image.save(target_path, 'PNG')
-                    logs.append(f"[ICON] ✅ Created {density} ({size}x{size}): {target_path.relative_to(project_path)}")
-                    replaced_count += 1
-                except Exception as e:
-                    logs.append(f"[ICON] ❌ ERROR saving to {target_path}: {str(e)}")
-        except Exception as e:
-            logs.append(f"[ICON] ❌ ERROR resizing for {density}: {str(e)}")
+        # 기존에 없는 선택적 아이콘은 스킵 (ic_launcher, ic_launcher_round는 항상 생성)
+        for target_path in _icon_targets(mipmap_dir, extension, index):
+            try:
+                target_path.write_bytes(renditions[density])
+                index.add_file(target_path)
+                logs.append(f"[ICON] ✅ Created {density} ({size}x{size}): {target_path.relative_to(project_path)}")
+                replaced_count += 1
+            except Exception as e:
+                logs.append(f"[ICON] ❌ ERROR saving to {target_path}: {str(e)}")
+                continue
+            _remove_stale_duplicates(target_path, index, project_path, '[ICON]', logs)
 
     if replaced_count == 0:
         logs.append("[ICON] ⚠️ WARNING: No icon files were created")
@@ -118,24 +575,39 @@ def replace_app_icon(project_root: str, icon_path: str, splash_path: str = None)
         logs.append(f"[ICON] 📊 Successfully created {replaced_count} icon files across all densities")
 
     # AndroidManifest.xml 아이콘 참조 수정
-    manifest_logs = _update_manifest_icon_references(project_path)
+    manifest_logs = _update_manifest_icon_references(project_path, index, rewrite)
     logs.extend(manifest_logs)
 
     # 스플래시 이미지 처리
     if splash_path and Path(splash_path).exists():
-        splash_logs = _replace_splash_image(project_path, splash_path)
+        splash_logs = _replace_splash_image(
+            project_path, splash_path, index, rewrite, cache, resolved_format, prerendered
+        )
         logs.extend(splash_logs)
 
     return logs
 
 
-def _replace_splash_image(project_path: Path, splash_path: str) -> List[str]:
+def _replace_splash_image(
+    project_path: Path,
+    splash_path: str,
+    index: ProjectIndex,
+    rewrite: Optional[RewriteResult] = None,
+    cache: Optional[ResultCache] = None,
+    output_format: str = ICON_FORMAT_PNG,
+    prerendered: Optional[Dict[str, RenderedImage]] = None
+) -> List[str]:
     """
     스플래시 이미지를 각 해상도에 맞게 리사이징하여 mipmap-* 폴더에 저장
 
     Args:
         project_path: 프로젝트 루트
         splash_path: 스플래시 이미지 경로 (PNG/JPG)
+        index: 프로젝트 인덱스
+        rewrite: 단일 패스 치환 결과 (있으면 layout 참조는 결과만 기록)
+        cache: 렌디션 캐시 (None이면 캐시 사용 안 함)
+        output_format: 출력 형식 (resolve_output_format으로 결정된 형식)
+        prerendered: render_images 결과 (형식이 같으면 렌디션을 다시 만들지 않음)
 
     Returns:
         로그 메시지 리스트
@@ -143,47 +615,56 @@ def _replace_splash_image(project_path: Path, splash_path: str) -> List[str]:
     logs = []
     splash_file = Path(splash_path)
 
-    # 원본 이미지 열기
+    # 원본 이미지 열기 (헤더만 읽음)
     try:
         splash_image = Image.open(splash_file)
         logs.append(f"[SPLASH] Loaded splash image: {splash_image.size[0]}x{splash_image.size[1]}")
-
-        # RGBA 모드로 변환
-        if splash_image.mode != 'RGBA':
-            splash_image = splash_image.convert('RGBA')
     except Exception as e:
         logs.append(f"[SPLASH] ERROR: Failed to open splash image: {str(e)}")
         return logs
 
     # res 디렉토리 찾기
-    res_dirs = list(project_path.rglob('src/main/res'))
+    res_dirs = index.res_dirs()
     if not res_dirs:
         logs.append("[SPLASH] ERROR: res directory not found")
         return logs
 
     res_dir = res_dirs[0]
-    splash_filename = 'splash_screen.png'
+    splash_filename = Path(SPLASH_FILENAME).stem + FORMAT_EXTENSIONS[output_format]
     replaced_count = 0
 
+    # 해상도별 렌디션 준비 (캐시 재사용)
+    prepared = _take_renditions(prerendered, TARGET_SPLASH, output_format)
+    renditions, errors, reused = prepared or _build_renditions(
+        splash_image, splash_file, TARGET_SPLASH, cache, output_format=output_format
+    )
+    if reused:
+        logs.append(f"[SPLASH] ♻️ Reused {reused} cached renditions")
+
     # mipmap-* 폴더 순회하여 스플래시 이미지 저장
     for density, size in ICON_SIZES.items():
         mipmap_dir = res_dir / f'mipmap-{density}'
 
-        if not mipmap_dir.exists():
+        if not index.is_dir(mipmap_dir):
             mipmap_dir.mkdir(parents=True, exist_ok=True)
+            index.add_dir(mipmap_dir)
             logs.append(f"[SPLASH] Created directory: {mipmap_dir.relative_to(project_path)}")
 
+        if density in errors:
+            logs.append(f"[SPLASH] ❌ ERROR creating splash for {density}: {errors[density]}")
+            continue
+
         try:
-            # 해상도별 리사이징
-            resized_splash = splash_image.resize((size, size), Image.Resampling.LANCZOS)
             target_path = mipmap_dir / splash_filename
 
-            # PNG로 저장
-            resized_splash.save(target_path, 'PNG')
+            target_path.write_bytes(renditions[density])
+            index.add_file(target_path)
             logs.append(f"[SPLASH] ✅ Created {density} ({size}x{size}): {target_path.relative_to(project_path)}")
             replaced_count += 1
         except Exception as e:
             logs.append(f"[SPLASH] ❌ ERROR creating splash for {density}: {str(e)}")
+            continue
+        _remove_stale_duplicates(target_path, index, project_path, '[SPLASH]', logs)
 
     if replaced_count == 0:
         logs.append("[SPLASH] ⚠️ WARNING: No splash images were created")
@@ -191,65 +672,51 @@ def _replace_splash_image(project_path: Path, splash_path: str) -> List[str]:
         logs.append(f"[SPLASH] 📊 Successfully created {replaced_count} splash images across all densities")
 
     # layout XML 파일에서 스플래시 이미지 참조 업데이트
-    layout_logs = _update_splash_references_in_layouts(project_path, splash_filename)
+    layout_logs = _update_splash_references_in_layouts(project_path, splash_filename, index, rewrite)
     logs.extend(layout_logs)
 
     return logs
 
 
-def _update_splash_references_in_layouts(project_path: Path, splash_filename: str) -> List[str]:
+def _update_splash_references_in_layouts(
+    project_path: Path,
+    splash_filename: str,
+    index: ProjectIndex,
+    rewrite: Optional[RewriteResult] = None
+) -> List[str]:
     """
     layout XML 파일에서 스플래시 이미지 참조를 새로운 파일명으로 업데이트
 
     Args:
         project_path: 프로젝트 루트
         splash_filename: 새 스플래시 이미지 파일명 (확장자 제외)
+        index: 프로젝트 인덱스
+        rewrite: 단일 패스 치환 결과 (없으면 layout 참조 규칙만으로 직접 치환)
 
     Returns:
         로그 메시지 리스트
     """
     logs = []
-    splash_name_without_ext = splash_filename.replace('.png', '')
+    splash_name_without_ext = Path(splash_filename).stem
 
     # layout 디렉토리 찾기
-    layout_dirs = list(project_path.rglob('src/main/res/layout*'))
-    if not layout_dirs:
+    if not index.dirs_matching('src/main/res/layout*'):
         logs.append("[SPLASH] ⚠️ WARNING: No layout directories found")
         return logs
 
     updated_files = 0
 
-    for layout_dir in layout_dirs:
-        if not layout_dir.is_dir():
-            continue
+    if rewrite is None:
+        rewrite = RewritePlan(splash_reference_rules(splash_name_without_ext)).apply(index)
 
-        # layout XML 파일들 순회
-        for xml_file in layout_dir.glob('*.xml'):
-            try:
-                content = xml_file.read_text(encoding='utf-8', errors='ignore')
-                original_content = content
-
-                # @mipmap/xxx 형태의 스플래시 참조를 찾아서 교체
-                # android:src="@mipmap/기존이름" -> android:src="@mipmap/splash_screen"
-                # id가 splash인 ImageView를 찾아서 src 속성 업데이트
-                pattern = r'(<ImageView[^>]*android:id="@\+?id/splash"[^>]*android:src=")@mipmap/[^"]*(")'
-                if re.search(pattern, content):
-                    content = re.sub(pattern, rf'\1@mipmap/{splash_name_without_ext}\2', content)
-
-                # 반대 순서 (src가 id보다 먼저 오는 경우)
-                pattern2 = r'(<ImageView[^>]*android:src=")@mipmap/[^"]*("[^>]*android:id="@\+?id/splash")'
-                if re.search(pattern2, content):
-                    content = re.sub(pattern2, rf'\1@mipmap/{splash_name_without_ext}\2', content)
-
-                if content != original_content:
-                    xml_file.write_text(content, encoding='utf-8')
-                    logs.append(f"[SPLASH] ✅ Updated splash reference in {xml_file.relative_to(project_path)}")
-                    updated_files += 1
-
-            except Exception as e:
-                import traceback
-                logs.append(f"[SPLASH] ❌ ERROR updating {xml_file}: {str(e)}")
-                logs.append(f"[SPLASH] Traceback: {traceback.format_exc()}")
+    # layout XML 파일들 순회
+    # android:src="@mipmap/기존이름" -> android:src="@mipmap/splash_screen"
+    for xml_file in index.files(ROLE_LAYOUT):
+        updated_files += rewrite.report(
+            logs, xml_file, STEP_SPLASH,
+            "[SPLASH] ✅ Updated splash reference in {path}",
+            "[SPLASH] ❌ ERROR updating {file}: {error}", '[SPLASH]'
+        )
 
     if updated_files == 0:
         logs.append("[SPLASH] ℹ️ No splash references found in layout files")
@@ -259,12 +726,18 @@ def _update_splash_references_in_layouts(project_path: Path, splash_filename: st
     return logs
 
 
-def _update_manifest_icon_references(project_path: Path) -> List[str]:
+def _update_manifest_icon_references(
+    project_path: Path,
+    index: ProjectIndex,
+    rewrite: Optional[RewriteResult] = None
+) -> List[str]:
     """
     AndroidManifest.xml에서 아이콘 참조를 ic_launcher로 통일
 
     Args:
         project_path: 프로젝트 루트
+        index: 프로젝트 인덱스
+        rewrite: 단일 패스 치환 결과 (없으면 아이콘 참조 규칙만으로 직접 치환)
 
     Returns:
         로그 메시지 리스트
@@ -272,39 +745,22 @@ def _update_manifest_icon_references(project_path: Path) -> List[str]:
     logs = []
 
     # AndroidManifest.xml 파일 찾기
-    manifests = list(project_path.rglob('AndroidManifest.xml'))
+    manifests = index.files(ROLE_MANIFEST)
     if not manifests:
         logs.append("[ICON] ⚠️ WARNING: No AndroidManifest.xml found")
         return logs
 
-    for manifest in manifests:
-        try:
-            content = manifest.read_text(encoding='utf-8', errors='ignore')
-            original_content = content
-
-            # android:icon 속성 수정
-            content = re.sub(
-                r'android:icon="@mipmap/[^"]*"',
-                r'android:icon="@mipmap/ic_launcher"',
-                content
-            )
-
-            # android:roundIcon 속성 수정
-            content = re.sub(
-                r'android:roundIcon="@mipmap/[^"]*"',
-                r'android:roundIcon="@mipmap/ic_launcher_round"',
-                content
-            )
-
-            if content != original_content:
-                manifest.write_text(content, encoding='utf-8')
-                logs.append(f"[ICON] ✅ Updated icon references in {manifest.relative_to(project_path)}")
-            else:
-                logs.append(f"[ICON] ℹ️ No icon reference changes needed in {manifest.relative_to(project_path)}")
+    if rewrite is None:
+        rewrite = RewritePlan(icon_reference_rules()).apply(index)
 
-        except Exception as e:
-            import traceback
-            logs.append(f"[ICON] ❌ ERROR updating {manifest}: {str(e)}")
-            logs.append(f"[ICON] Traceback: {traceback.format_exc()}")
+    # android:icon / android:roundIcon 속성 수정
+    for manifest in manifests:
+        updated = rewrite.report(
+            logs, manifest, STEP_ICON,
+            "[ICON] ✅ Updated icon references in {path}",
+            "[ICON] ❌ ERROR updating {file}: {error}", '[ICON]'
+        )
+        if not updated and rewrite.error_for(manifest) is None:
+            logs.append(f"[ICON] ℹ️ No icon reference changes needed in {manifest.relative_to(project_path)}")
 
     return logs
@@ -0,0 +1,489 @@
+"""
+프로젝트 파일 인덱스
+- 압축 해제 직후 한 번만 트리를 순회하여 파일을 역할별로 분류
+- 모든 파이프라인 단계가 같은 인덱스를 공유 (단계마다 rglob 반복 방지)
+- 파일 생성/이동/삭제 시 인덱스를 함께 갱신
+- 패스스루 모드: 압축 해제하지 않은 ZIP 멤버도 경로만으로 인덱스에 등록
+- 동시에 실행되는 단계가 함께 조회/갱신할 수 있도록 순회/갱신은 잠금 안에서 수행
+"""
+import fnmatch
+import functools
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+
+# 파일 역할 플래그 (하나의 파일이 여러 역할을 가질 수 있음)
+ROLE_GRADLE = 1 << 0            # build.gradle(.kts)
+ROLE_SETTINGS = 1 << 1          # 루트의 settings.gradle(.kts)
+ROLE_MANIFEST = 1 << 2          # AndroidManifest.xml
+ROLE_STRINGS = 1 << 3           # values*/strings.xml
+ROLE_SOURCE = 1 << 4            # .kt / .java (build 폴더 제외)
+ROLE_TEXT = 1 << 5              # 패키지명 일괄 치환 대상 텍스트 파일
+ROLE_GOOGLE_SERVICES = 1 << 6   # google-services.json (build 등 제외)
+ROLE_LAYOUT = 1 << 7            # src/main/res/layout*/*.xml
+ROLE_DEFAULT_STRINGS = 1 << 8   # 기본 로케일 values/strings.xml
+ROLE_RES_IMAGE = 1 << 9         # res/*/ 아래의 이미지 (아이콘/스플래시 교체 대상)
+
+# 텍스트 파일 역할 (ROLE_TEXT와 같은 파일에 함께 붙을 수 있는 역할)
+TEXT_ROLES = (ROLE_GRADLE | ROLE_SETTINGS | ROLE_MANIFEST | ROLE_STRINGS | ROLE_SOURCE
+              | ROLE_GOOGLE_SERVICES | ROLE_LAYOUT | ROLE_DEFAULT_STRINGS)
+
+# res 이미지 확장자
+RES_IMAGE_EXTENSIONS = {'.png', '.webp', '.jpg', '.jpeg'}
+
+# 텍스트 파일 확장자 (일괄 치환 대상)
+TEXT_EXTENSIONS = {
+    '.xml', '.kt', '.java', '.gradle', '.kts', '.properties',
+    '.json', '.txt', '.md', '.pro', '.cfg', '.config'
+}
+
+# 일괄 치환에서 제외할 폴더
+TEXT_EXCLUDE_DIRS = {'build', '.gradle', '.idea', 'outputs', '__pycache__', '.git'}
+
+# google-services.json 탐색에서 제외할 폴더
+GOOGLE_SERVICES_EXCLUDE_DIRS = {'build', '.gradle', 'outputs'}
+
+PathLike = Union[str, Path]
+
+
+def classify(rel_path: str) -> int:
+    """
+    프로젝트 루트 기준 상대 경로(POSIX)로 파일 역할 플래그 계산
+
+    Args:
+        rel_path: 'app/src/main/AndroidManifest.xml' 형태의 상대 경로
+
+    Returns:
+        ROLE_* 플래그 조합
+    """
+    parts = rel_path.split('/')
+    name = parts[-1]
+    suffix = os.path.splitext(name)[1].lower()
+    roles = 0
+
+    if fnmatch.fnmatchcase(name, 'build.gradle*'):
+        roles |= ROLE_GRADLE
+    if len(parts) == 1 and fnmatch.fnmatchcase(name, 'settings.gradle*'):
+        roles |= ROLE_SETTINGS
+    if name == 'AndroidManifest.xml':
+        roles |= ROLE_MANIFEST
+    if name == 'strings.xml' and len(parts) > 1 and parts[-2].startswith('values'):
+        roles |= ROLE_STRINGS
+        if parts[-2] == 'values':
+            roles |= ROLE_DEFAULT_STRINGS
+    if suffix in ('.kt', '.java') and 'build' not in parts:
+        roles |= ROLE_SOURCE
+    if suffix in TEXT_EXTENSIONS and not any(part in TEXT_EXCLUDE_DIRS for part in parts):
+        roles |= ROLE_TEXT
+    if name == 'google-services.json' and not any(part in GOOGLE_SERVICES_EXCLUDE_DIRS for part in parts):
+        roles |= ROLE_GOOGLE_SERVICES
+    if (suffix == '.xml' and len(parts) >= 5 and parts[-2].startswith('layout')
+            and parts[-5:-2] == ['src', 'main', 'res']):
+        roles |= ROLE_LAYOUT
+    if suffix in RES_IMAGE_EXTENSIONS and len(parts) >= 3 and parts[-3] == 'res':
+        roles |= ROLE_RES_IMAGE
+
+    return roles
+
+
+def needs_extraction(member: str) -> bool:
+    """
+    패스스루 모드에서 압축 해제가 필요한 ZIP 멤버인지 확인
+    (파이프라인 단계가 읽거나 수정할 수 있는 텍스트/Gradle 파일)
+
+    Args:
+        member: ZIP 멤버 이름
+
+    Returns:
+        압축 해제 대상이면 True
+    """
+    name = member.rsplit('/', 1)[-1]
+    return (os.path.splitext(name)[1].lower() in TEXT_EXTENSIONS
+            or fnmatch.fnmatchcase(name, 'build.gradle*')
+            or fnmatch.fnmatchcase(name, 'settings.gradle*'))
+
+
+def _synchronized(method):
+    """인덱스 잠금을 잡고 실행 (단계가 동시에 실행될 때 순회 중 갱신 방지)"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+class FileRecord:
+    """
+    인덱스에 저장되는 파일 단위 레코드 (메모리 절약을 위해 __slots__ 사용)
+
+    source가 있으면 디스크에 압축 해제되지 않은 패스스루 파일이며,
+    내용은 원본 ZIP의 해당 멤버에 그대로 남아 있습니다.
+    """
+
+    __slots__ = ('size', 'roles', 'source')
+
+    def __init__(self, size: int, roles: int, source: Optional[str] = None):
+        self.size = size
+        self.roles = roles
+        self.source = source
+
+    def __repr__(self):
+        return f"FileRecord(size={self.size}, roles={self.roles}, source={self.source!r})"
+
+
+class ProjectIndex:
+    """
+    프로젝트 트리의 파일/디렉토리 인덱스
+
+    키는 프로젝트 루트 기준 POSIX 상대 경로 문자열이며,
+    조회 결과는 기존 코드와 호환되도록 절대 Path로 반환합니다.
+    """
+
+    def __init__(self, project_root: PathLike):
+        self.root = Path(project_root)
+        self._files: Dict[str, FileRecord] = {}
+        self._dirs: Set[str] = set()
+        self._role_cache: Dict[int, List[str]] = {}
+        # 파일 경로 집합이 바뀔 때마다 증가 (경로 기준 조회 결과 캐시 무효화용)
+        self._generation = 0
+        self.source_zip: Optional[str] = None
+        # 인덱스 생성(복제) 이후 내용이 기록된 파일 (증분 재적용에서 이전 결과 재사용 제외)
+        self._modified: Set[str] = set()
+        self._lock = threading.RLock()
+
+    @classmethod
+    def build(cls, project_root: PathLike) -> 'ProjectIndex':
+        """
+        프로젝트 트리를 한 번 순회하여 인덱스 생성
+
+        Args:
+            project_root: 프로젝트 루트 디렉토리
+
+        Returns:
+            ProjectIndex
+        """
+        index = cls(project_root)
+        root = str(index.root)
+        stack = ['']
+
+        while stack:
+            rel_dir = stack.pop()
+            abs_dir = os.path.join(root, rel_dir) if rel_dir else root
+            try:
+                entries = os.scandir(abs_dir)
+            except OSError:
+                continue
+            with entries:
+                for entry in entries:
+                    rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            index._dirs.add(rel)
+                            stack.append(rel)
+                        elif entry.is_file():
+                            index._files[rel] = FileRecord(entry.stat().st_size, classify(rel))
+                    except OSError:
+                        continue
+
+        return index
+
+    @_synchronized
+    def clone(self, project_root: PathLike) -> 'ProjectIndex':
+        """
+        다른 루트로 복사된 트리용 인덱스 복제 (레코드는 독립적으로 갱신됨)
+
+        Args:
+            project_root: 복사된 프로젝트 루트 디렉토리
+        """
+        index = type(self)(project_root)
+        index._files = {
+            rel: FileRecord(record.size, record.roles, record.source)
+            for rel, record in self._files.items()
+        }
+        index._dirs = set(self._dirs)
+        index.source_zip = self.source_zip
+        return index
+
+    # ------------------------------------------------------------------
+    # 경로 변환
+    # ------------------------------------------------------------------
+
+    def rel(self, path: PathLike) -> str:
+        """절대/상대 경로를 인덱스 키(POSIX 상대 경로)로 변환"""
+        path = Path(path)
+        try:
+            path = path.relative_to(self.root)
+        except ValueError:
+            pass  # 이미 루트 기준 상대 경로
+        rel = path.as_posix()
+        return '' if rel == '.' else rel
+
+    def path(self, rel: str) -> Path:
+        """인덱스 키를 절대 Path로 변환"""
+        return self.root / rel if rel else self.root
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+
+    @property
+    def generation(self) -> int:
+        """파일 경로 집합의 변경 횟수 (생성/삭제/이동 시 증가, 제자리 수정은 제외)"""
+        return self._generation
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def __contains__(self, path: PathLike) -> bool:
+        return self.exists(path)
+
+    def record(self, path: PathLike) -> Optional[FileRecord]:
+        """파일 레코드 조회 (없으면 None)"""
+        return self._files.get(self.rel(path))
+
+    def is_passthrough(self, path: PathLike) -> bool:
+        """원본 ZIP에만 존재하는 (압축 해제되지 않은) 파일인지 확인"""
+        record = self._files.get(self.rel(path))
+        return record is not None and record.source is not None
+
+    @_synchronized
+    def passthrough_count(self) -> int:
+        """패스스루 파일 수"""
+        return sum(1 for record in self._files.values() if record.source is not None)
+
+    def is_file(self, path: PathLike) -> bool:
+        return self.rel(path) in self._files
+
+    def is_dir(self, path: PathLike) -> bool:
+        rel = self.rel(path)
+        return rel == '' or rel in self._dirs
+
+    def exists(self, path: PathLike) -> bool:
+        return self.is_file(path) or self.is_dir(path)
+
+    def files(self, role: int = 0) -> List[Path]:
+        """
+        역할별 파일 목록 (경로 순 정렬)
+
+        Args:
+            role: ROLE_* 플래그 (0이면 전체 파일)
+        """
+        return [self.path(rel) for rel in self._rel_files(role)]
+
+    @_synchronized
+    def records(self, role: int = 0) -> List[Tuple[str, FileRecord]]:
+        """역할별 (상대 경로, 레코드) 목록 (경로 순 정렬)"""
+        return [(rel, self._files[rel]) for rel in self._rel_files(role)]
+
+    @_synchronized
+    def total_size(self, role: int = 0) -> int:
+        """역할별 파일 크기 합계 (bytes)"""
+        return sum(self._files[rel].size for rel in self._rel_files(role))
+
+    @_synchronized
+    def strings_by_locale(self) -> Dict[str, List[Path]]:
+        """values* 디렉토리명(로케일 한정자)별 strings.xml 목록"""
+        locales: Dict[str, List[Path]] = {}
+        for rel in self._rel_files(ROLE_STRINGS):
+            qualifier = rel.rsplit('/', 2)[-2]
+            locales.setdefault(qualifier, []).append(self.path(rel))
+        return locales
+
+    @_synchronized
+    def dirs_matching(self, pattern: str) -> List[Path]:
+        """
+        상대 경로 끝부분이 패턴과 일치하는 디렉토리 목록 (rglob과 동일한 의미)
+
+        Args:
+            pattern: 'src/main/res', 'src/main/res/layout*' 형태의 패턴
+        """
+        pattern_parts = pattern.split('/')
+        depth = len(pattern_parts)
+        matched = []
+        for rel in sorted(self._dirs):
+            parts = rel.split('/')
+            if len(parts) < depth:
+                continue
+            if all(fnmatch.fnmatchcase(part, pat) for part, pat in zip(parts[-depth:], pattern_parts)):
+                matched.append(self.path(rel))
+        return matched
+
+    def res_dirs(self) -> List[Path]:
+        """src/main/res 디렉토리 목록"""
+        return self.dirs_matching('src/main/res')
+
+    @_synchronized
+    def find_named(self, name: str) -> List[Path]:
+        """이름이 일치하는 파일/디렉토리 목록 (경로 순 정렬)"""
+        matched = [rel for rel in self._files if rel.rsplit('/', 1)[-1] == name]
+        matched.extend(rel for rel in self._dirs if rel.rsplit('/', 1)[-1] == name)
+        return [self.path(rel) for rel in sorted(matched)]
+
+    @_synchronized
+    def subdirs(self, directory: PathLike) -> List[Path]:
+        """디렉토리 바로 아래의 하위 디렉토리 목록"""
+        rel_dir = self.rel(directory)
+        prefix = f"{rel_dir}/" if rel_dir else ''
+        matched = [d for d in self._dirs
+                   if d.startswith(prefix) and '/' not in d[len(prefix):]]
+        return [self.path(rel) for rel in sorted(matched)]
+
+    @_synchronized
+    def children(self, directory: PathLike, pattern: str = '*') -> List[Path]:
+        """디렉토리 바로 아래의 파일 목록 (glob 패턴 필터)"""
+        rel_dir = self.rel(directory)
+        prefix = f"{rel_dir}/" if rel_dir else ''
+        matched = []
+        for rel in self._files:
+            if not rel.startswith(prefix):
+                continue
+            name = rel[len(prefix):]
+            if '/' not in name and fnmatch.fnmatchcase(name, pattern):
+                matched.append(rel)
+        return [self.path(rel) for rel in sorted(matched)]
+
+    # ------------------------------------------------------------------
+    # 갱신 (단계에서 파일을 생성/이동/삭제할 때 호출)
+    # ------------------------------------------------------------------
+
+    @_synchronized
+    def add_archive_members(self, source_zip: PathLike, members: Iterable[Tuple[str, str, int]]) -> None:
+        """
+        압축 해제하지 않은 패스스루 멤버를 인덱스에 등록
+
+        Args:
+            source_zip: 원본 ZIP 경로 (출력 ZIP 생성 시 원시 바이트 복사에 사용)
+            members: extract_zip이 수집한 (멤버명, 대상 경로, 원본 크기) 목록
+        """
+        self.source_zip = str(source_zip)
+        for member, target_path, size in members:
+            try:
+                rel = Path(target_path).relative_to(self.root).as_posix()
+            except ValueError:
+                continue  # 프로젝트 루트 밖의 멤버는 출력 ZIP에 포함되지 않음
+            if rel in self._files:
+                continue
+            self._files[rel] = FileRecord(size, classify(rel), member)
+            self._add_parents(rel)
+        self._role_cache.clear()
+        self._generation += 1
+
+    @_synchronized
+    def add_file(self, path: PathLike, size: Optional[int] = None) -> None:
+        """파일 생성/덮어쓰기를 인덱스에 반영 (패스스루 파일이면 디스크 파일로 전환)"""
+        rel = self.rel(path)
+        if size is None:
+            try:
+                size = self.path(rel).stat().st_size
+            except OSError:
+                size = 0
+        self._files[rel] = FileRecord(size, classify(rel))
+        self._modified.add(rel)
+        self._add_parents(rel)
+        self._role_cache.clear()
+        self._generation += 1
+
+    @_synchronized
+    def set_size(self, path: PathLike, size: int) -> None:
+        """제자리 수정된 파일의 크기 갱신 (역할은 그대로)"""
+        rel = self.rel(path)
+        record = self._files.get(rel)
+        if record is not None:
+            record.size = size
+            self._modified.add(rel)
+
+    @_synchronized
+    def add_dir(self, path: PathLike) -> None:
+        """디렉토리 생성을 인덱스에 반영"""
+        rel = self.rel(path)
+        if rel:
+            self._dirs.add(rel)
+            self._add_parents(rel)
+
+    @_synchronized
+    def remove(self, path: PathLike) -> None:
+        """파일 또는 디렉토리(하위 포함) 삭제를 인덱스에 반영"""
+        rel = self.rel(path)
+        self._files.pop(rel, None)
+        if rel in self._dirs or rel == '':
+            prefix = f"{rel}/" if rel else ''
+            self._files = {k: v for k, v in self._files.items() if not k.startswith(prefix)}
+            self._dirs = {d for d in self._dirs if d != rel and not d.startswith(prefix)}
+        self._role_cache.clear()
+        self._generation += 1
+
+    @_synchronized
+    def move_tree(self, old_path: PathLike, new_path: PathLike) -> None:
+        """디렉토리 이동을 인덱스에 반영 (하위 파일 경로 재작성 및 역할 재분류)"""
+        old_rel = self.rel(old_path)
+        new_rel = self.rel(new_path)
+        old_prefix = f"{old_rel}/"
+
+        moved_files = {}
+        for rel in list(self._files):
+            if rel.startswith(old_prefix):
+                record = self._files.pop(rel)
+                target = new_rel + rel[len(old_rel):]
+                record.roles = classify(target)
+                moved_files[target] = record
+        self._files.update(moved_files)
+        self._modified = {new_rel + rel[len(old_rel):] if rel.startswith(old_prefix) else rel
+                          for rel in self._modified}
+        self._modified.update(moved_files)
+
+        moved_dirs = {new_rel + d[len(old_rel):] for d in self._dirs
+                      if d == old_rel or d.startswith(old_prefix)}
+        self._dirs = {d for d in self._dirs if d != old_rel and not d.startswith(old_prefix)}
+        self._dirs.update(moved_dirs)
+        self._add_parents(new_rel)
+        self._dirs.add(new_rel)
+        self._role_cache.clear()
+        self._generation += 1
+
+    @_synchronized
+    def prune_empty_dirs(self, start_dir: PathLike) -> None:
+        """start_dir 하위에서 파일이 하나도 없는 디렉토리를 인덱스에서 제거"""
+        start_rel = self.rel(start_dir)
+        prefix = f"{start_rel}/" if start_rel else ''
+        occupied: Set[str] = set()
+        for rel in self._files:
+            if rel.startswith(prefix):
+                occupied.update(self._parents(rel))
+        self._dirs = {d for d in self._dirs
+                      if not d.startswith(prefix) or d in occupied}
+
+    @_synchronized
+    def modified(self) -> Set[str]:
+        """인덱스 생성(복제) 이후 생성/수정/이동된 파일의 상대 경로"""
+        return set(self._modified)
+
+    @_synchronized
+    def update(self, paths: Iterable[PathLike]) -> None:
+        """여러 파일의 생성/덮어쓰기를 한 번에 반영"""
+        for path in paths:
+            self.add_file(path)
+
+    # ------------------------------------------------------------------
+    # 내부 헬퍼
+    # ------------------------------------------------------------------
+
+    @_synchronized
+    def _rel_files(self, role: int) -> List[str]:
+        cached = self._role_cache.get(role)
+        if cached is None:
+            if role:
+                cached = sorted(rel for rel, record in self._files.items() if record.roles & role)
+            else:
+                cached = sorted(self._files)
+            self._role_cache[role] = cached
+        return cached
+
+    @staticmethod
+    def _parents(rel: str) -> List[str]:
+        parts = rel.split('/')
+        return ['/'.join(parts[:i]) for i in range(1, len(parts))]
+
+    def _add_parents(self, rel: str) -> None:
+        self._dirs.update(self._parents(rel))
@@ -0,0 +1,1037 @@
+"""
+단일 패스 텍스트 치환 엔진
+- 패키지명, 앱 이름, 버전, 아이콘 참조, BASE_URL 치환 규칙을 작업당 한 번만 컴파일
+- 각 파일은 한 번 읽고, 적용 가능한 모든 규칙을 순서대로 적용한 뒤 최대 한 번 기록
+- 어떤 규칙이 어떤 파일을 변경했는지 결과로 보고
+- 파일 단위 변환을 스레드/프로세스 풀로 병렬 실행 (결과는 경로 순으로 수집되어 결정적)
+- 바이너리 내용은 건너뛰고, 크기 상한을 넘는 파일은 메모리에 읽지 않고 스트리밍 치환
+- 바이트 단위 사전 필터: 규칙의 리터럴 단서(needle)가 하나도 없는 파일은 디코딩/정규식 생략
+- 일괄 치환은 여러 리터럴(패키지 점/슬래시 형태, 기존 BASE_URL은 별도 규칙)을 경계 조건을 지키며 한 번에 검색
+"""
+import difflib
+import mmap
+import multiprocessing
+import os
+import re
+import traceback
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+from backend.joblog import LogRecord, RelativePath
+from backend.utils.project_index import (
+    FileRecord,
+    ProjectIndex,
+    ROLE_DEFAULT_STRINGS,
+    ROLE_GRADLE,
+    ROLE_LAYOUT,
+    ROLE_MANIFEST,
+    ROLE_SETTINGS,
+    ROLE_SOURCE,
+    ROLE_STRINGS,
+    ROLE_TEXT,
+)
+
+
+# 규칙 단계 이름 (각 파이프라인 단계의 로그/변경 수 집계 단위)
+STEP_PACKAGE = 'package'
+STEP_PACKAGE_BULK = 'package_bulk'
+STEP_APP_NAME = 'app_name'
+STEP_VERSION = 'version'
+STEP_ICON = 'icon'
+STEP_SPLASH = 'splash'
+STEP_BASE_URL = 'base_url'
+
+# 병렬 실행 모드
+EXECUTOR_SERIAL = 'serial'
+EXECUTOR_THREAD = 'thread'
+EXECUTOR_PROCESS = 'process'
+EXECUTOR_MODES = (EXECUTOR_SERIAL, EXECUTOR_THREAD, EXECUTOR_PROCESS)
+
+# 워커 하나가 맡을 최소 파일 수 (작은 프로젝트에서 풀 생성 비용이 이득보다 크지 않도록)
+MIN_FILES_PER_WORKER = 32
+# 프로세스 풀 작업 하나에 묶어 보낼 파일 수
+PROCESS_CHUNK_SIZE = 16
+
+# 파일 크기 상한 (초과하면 통째로 읽지 않고 스트리밍으로 리터럴 규칙만 적용, 환경 변수로 조정)
+REWRITE_MAX_FILE_SIZE = int(os.environ.get('REWRITE_MAX_FILE_SIZE', str(2 * 1024 * 1024)))
+# 바이너리 판별에 사용할 파일 앞부분 크기
+SNIFF_BYTES = 8192
+# 앞부분에서 제어 문자가 이 비율을 넘으면 바이너리로 판단
+BINARY_CONTROL_RATIO = 0.3
+# 스트리밍 치환 읽기 단위
+STREAM_CHUNK_SIZE = 1024 * 1024
+# 이 크기 이상인 파일은 사전 필터를 메모리 매핑으로 검사 (단서가 없으면 파일을 읽지 않음)
+MMAP_THRESHOLD = 256 * 1024
+
+# 건너뛴 사유
+SKIP_BINARY = 'binary'          # 바이너리 내용 (모든 규칙 건너뜀)
+SKIP_TOO_LARGE = 'too_large'    # 크기 상한 초과 (스트리밍 처리, 정규식 규칙은 건너뜀)
+SKIP_NO_MATCH = 'no_match'      # 사전 필터에서 단서가 없어 디코딩하지 않음 (결과에는 집계만)
+
+# 텍스트에 나타나는 제어 문자 (탭, 개행, 폼피드, ESC 등)
+_TEXT_CONTROL_BYTES = {7, 8, 9, 10, 11, 12, 13, 27}
+_CONTROL_BYTES = bytes(b for b in range(32) if b not in _TEXT_CONTROL_BYTES) + b'\x7f'
+
+
+def _escape_repl(value: str) -> str:
+    """re.sub 치환 문자열에 들어갈 값의 역슬래시 이스케이프"""
+    return value.replace('\\', r'\\')
+
+
+# 리터럴 경계 종류
+BOUNDARY_IDENTIFIER = 'identifier'  # 점 형태 패키지명: 앞뒤가 식별자 문자가 아니어야 함 (뒤의 '.'은 허용)
+BOUNDARY_PATH = 'path'              # 슬래시 형태 패키지 경로: JNI 시그니처(Lcom/...)의 'L' 접두어 허용
+BOUNDARY_URL = 'url'                # URL: 뒤에 경로/쿼리/프래그먼트, 따옴표, '<', 공백이 오거나 텍스트 끝이어야 함
+BOUNDARY_PREFIX = 'prefix'          # '/'로 끝나는 URL: 앞쪽 경계만 검사 (뒤에 경로가 이어져도 치환)
+
+# Java/Kotlin 식별자 문자
+_IDENT = r'\w$'
+_BOUNDARY_TEMPLATES = {
+    BOUNDARY_IDENTIFIER: (rf'(?<![{_IDENT}.])', rf'(?![{_IDENT}])'),
+    BOUNDARY_PATH: (rf'(?:(?<![{_IDENT}/])|(?<=(?<![{_IDENT}])L))', rf'(?![{_IDENT}])'),
+    # api.old.com이 api.old.community나 api.old.com.cdn.net 안에서 일치하지 않도록 뒤쪽 경계 검사
+    BOUNDARY_URL: (rf'(?<![{_IDENT}])', r'(?![^/?#"\'<\s])'),
+    BOUNDARY_PREFIX: (rf'(?<![{_IDENT}])', ''),
+}
+
+
+class LiteralMatcher:
+    """
+    여러 리터럴을 한 번의 스캔으로 찾아 치환하는 매처 (경계 조건 포함)
+
+    pyahocorasick이 설치되어 있으면 Aho-Corasick 오토마톤으로 후보 위치를 찾고,
+    없으면 모든 리터럴을 하나로 컴파일한 정규식 교대(alternation)를 사용합니다.
+    두 경로 모두 같은 위치에서는 가장 긴 리터럴, 겹치면 왼쪽 일치를 우선합니다.
+
+    Args:
+        literals: (기존 문자열, 새 문자열, 경계 종류) 목록
+    """
+
+    def __init__(self, literals: Sequence[Tuple[str, str, str]]):
+        # 같은 문자열이 여러 번 오면 처음 것만 사용, 긴 리터럴 우선
+        unique: Dict[str, Tuple[str, str]] = {}
+        for old, new, boundary in literals:
+            if old and old not in unique:
+                unique[old] = (new, boundary)
+        self.literals = sorted(
+            ((old, new, boundary) for old, (new, boundary) in unique.items()),
+            key=lambda literal: -len(literal[0])
+        )
+        self.replacements = {old: new for old, new, _ in self.literals}
+        self.max_length = max((len(old) for old, _, _ in self.literals), default=0)
+
+        alternatives = [self._wrap(re.escape(old), boundary) for old, _, boundary in self.literals]
+        self.pattern = re.compile('|'.join(alternatives) or r'(?!)')
+        # 스트리밍(바이트) 경로용
+        self.byte_pattern = re.compile(
+            '|'.join(alternatives).encode('utf-8') or rb'(?!)', re.ASCII
+        )
+        self.byte_replacements = {
+            old.encode('utf-8'): new.encode('utf-8') for old, new, _ in self.literals
+        }
+        self._anchored = {old: re.compile(self._wrap(re.escape(old), boundary))
+                          for old, _, boundary in self.literals}
+        self._automaton = None
+        if AHOCORASICK_AVAILABLE and self.literals:
+            self._automaton = ahocorasick.Automaton()
+            for old in self.replacements:
+                self._automaton.add_word(old, old)
+            self._automaton.make_automaton()
+
+    @staticmethod
+    def _wrap(pattern: str, boundary: str) -> str:
+        before, after = _BOUNDARY_TEMPLATES[boundary]
+        return f"(?:{before}{pattern}{after})"
+
+    @property
+    def needles(self) -> Tuple[str, ...]:
+        return tuple(self.replacements)
+
+    def sub(self, content: str) -> str:
+        """모든 리터럴 치환 (경계 조건을 만족하는 일치만)"""
+        if self._automaton is not None:
+            return self._sub_automaton(content)
+        return self.pattern.sub(lambda match: self.replacements[match.group(0)], content)
+
+    def _sub_automaton(self, content: str) -> str:
+        # 시작 위치별 가장 긴 후보 (경계 조건은 리터럴별 정규식으로 해당 위치에서만 확인)
+        candidates: Dict[int, str] = {}
+        for end, old in self._automaton.iter(content):
+            start = end - len(old) + 1
+            if len(old) > len(candidates.get(start, '')) and self._anchored[old].match(content, start):
+                candidates[start] = old
+
+        pieces = []
+        pos = 0
+        for start in sorted(candidates):
+            if start < pos:
+                continue
+            old = candidates[start]
+            pieces.append(content[pos:start])
+            pieces.append(self.replacements[old])
+            pos = start + len(old)
+        if not pieces:
+            return content
+        pieces.append(content[pos:])
+        return ''.join(pieces)
+
+
+class RewriteRule:
+    """
+    단일 텍스트 치환 규칙
+
+    pattern이 있으면 미리 컴파일된 정규식 치환, literal이 있으면 str.replace 치환,
+    matcher가 있으면 여러 리터럴을 한 번에 경계 조건을 지키며 치환
+
+    needles는 규칙이 일치하려면 파일에 반드시 들어 있어야 하는 리터럴 중 하나 이상입니다.
+    (None이면 사전 필터 없이 항상 적용, 리터럴/매처 규칙은 기존 문자열)
+    """
+
+    __slots__ = ('name', 'step', 'roles', 'pattern', 'repl', 'literal', 'matcher', 'needles')
+
+    def __init__(
+        self,
+        name: str,
+        step: str,
+        roles: int,
+        pattern: Optional[str] = None,
+        repl: str = '',
+        flags: int = 0,
+        literal: Optional[Tuple[str, str]] = None,
+        needles: Optional[Tuple[str, ...]] = None,
+        matcher: Optional[LiteralMatcher] = None
+    ):
+        self.name = name
+        self.step = step
+        self.roles = roles
+        self.pattern = re.compile(pattern, flags) if pattern is not None else None
+        self.repl = repl
+        self.literal = literal
+        self.matcher = matcher
+        if needles is None and literal is not None:
+            needles = (literal[0],)
+        if needles is None and matcher is not None:
+            needles = matcher.needles
+        self.needles = tuple(needle.encode('utf-8') for needle in needles) if needles is not None else None
+
+    def may_match(self, data) -> bool:
+        """바이트(또는 mmap)에 단서가 있는지 확인 (False면 규칙이 내용을 바꿀 수 없음)"""
+        return self.needles is None or any(data.find(needle) != -1 for needle in self.needles)
+
+    def apply(self, content: str) -> str:
+        """규칙 적용 결과 반환 (변경 없으면 원본 그대로)"""
+        if self.literal is not None:
+            old, new = self.literal
+            return content.replace(old, new)
+        if self.matcher is not None:
+            return self.matcher.sub(content)
+        return self.pattern.sub(self.repl, content)
+
+    @property
+    def streamable(self) -> bool:
+        """파일을 통째로 읽지 않고 청크 단위로 적용할 수 있는지 (리터럴/매처 규칙만 가능)"""
+        return self.literal is not None or self.matcher is not None
+
+    def __repr__(self):
+        return f"RewriteRule({self.name!r}, step={self.step!r})"
+
+
+# ----------------------------------------------------------------------
+# 규칙 팩토리 (기존 단계별 치환과 동일한 정규식/순서)
+# ----------------------------------------------------------------------
+
+def package_rules(old_package: str, new_package: str) -> List[RewriteRule]:
+    """build.gradle / AndroidManifest.xml / 소스 package 선언의 패키지명 치환 규칙"""
+    old = re.escape(old_package)
+    new = _escape_repl(new_package)
+    needles = (old_package,)
+    return [
+        # applicationId "..." (Groovy)
+        RewriteRule('package.gradle_application_id', STEP_PACKAGE, ROLE_GRADLE,
+                    r'(applicationId\s+["\'])' + old + r'(["\'])', r'\1' + new + r'\2', needles=needles),
+        # applicationId = "..." (Kotlin DSL)
+        RewriteRule('package.gradle_application_id_kts', STEP_PACKAGE, ROLE_GRADLE,
+                    r'(applicationId\s*=\s*["\'])' + old + r'(["\'])', r'\1' + new + r'\2', needles=needles),
+        # namespace = "..." (AGP 7.0+)
+        RewriteRule('package.gradle_namespace', STEP_PACKAGE, ROLE_GRADLE,
+                    r'(namespace\s*=\s*["\'])' + old + r'(["\'])', r'\1' + new + r'\2', needles=needles),
+        # <manifest package="...">
+        RewriteRule('package.manifest', STEP_PACKAGE, ROLE_MANIFEST,
+                    r'(package\s*=\s*["\'])' + old + r'(["\'])', r'\1' + new + r'\2', needles=needles),
+        # package 선언 (서브패키지 포함, 세미콜론 선택적)
+        RewriteRule('package.source_declaration', STEP_PACKAGE, ROLE_SOURCE,
+                    r'^package\s+' + old + r'(\.[a-zA-Z_][a-zA-Z0-9_.]*)?\s*;?\s*$',
+                    f'package {new}\\1', flags=re.MULTILINE, needles=needles),
+    ]
+
+
+def bulk_package_rules(old_package: str, new_package: str) -> List[RewriteRule]:
+    """
+    모든 텍스트 파일의 패키지명 일괄 치환 규칙 (한 번의 스캔으로 두 형태 모두 검색)
+
+    - 패키지명 점 형태 (com.example.app, 식별자 경계: com.example.appextra는 제외)
+    - 패키지 경로 슬래시 형태 (com/example/app, ProGuard/JNI 시그니처 등)
+    """
+    literals = [
+        (old_package, new_package, BOUNDARY_IDENTIFIER),
+        (old_package.replace('.', '/'), new_package.replace('.', '/'), BOUNDARY_PATH),
+    ]
+    return [
+        RewriteRule('package.bulk', STEP_PACKAGE_BULK, ROLE_TEXT,
+                    matcher=LiteralMatcher(literals)),
+    ]
+
+
+def base_url_literal_rules(old_base_urls: Sequence[str], new_base_url: Optional[str]) -> List[RewriteRule]:
+    """
+    모든 텍스트 파일의 기존 BASE_URL 리터럴 일괄 치환 규칙 (정의 외의 참조까지, BASE_URL 단계)
+
+    Returns:
+        규칙 목록 (바꿀 URL이 없으면 빈 목록)
+    """
+    literals = _base_url_literals(old_base_urls, new_base_url)
+    if not literals:
+        return []
+    return [
+        RewriteRule('base_url.bulk', STEP_BASE_URL, ROLE_TEXT,
+                    matcher=LiteralMatcher(literals)),
+    ]
+
+
+def _base_url_literals(old_base_urls: Sequence[str], new_base_url: Optional[str]) -> List[Tuple[str, str, str]]:
+    if not new_base_url:
+        return []
+    return [(old_url, new_base_url, BOUNDARY_PREFIX if old_url.endswith('/') else BOUNDARY_URL)
+            for old_url in old_base_urls if old_url != new_base_url]
+
+
+def app_name_rules(new_app_name: str) -> List[RewriteRule]:
+    """strings.xml app_name / android:label / rootProject.name 치환 규칙"""
+    name = _escape_repl(new_app_name)
+    return [
+        RewriteRule('app_name.strings', STEP_APP_NAME, ROLE_STRINGS,
+                    r'(<string\s+name="app_name">)[^<]+(</string>)', r'\1' + name + r'\2',
+                    needles=('"app_name"',)),
+        RewriteRule('app_name.manifest_label', STEP_APP_NAME, ROLE_MANIFEST,
+                    r'android:label="[^"]*"', r'android:label="@string/app_name"',
+                    needles=('android:label=',)),
+        RewriteRule('app_name.root_project', STEP_APP_NAME, ROLE_SETTINGS,
+                    r'(rootProject\.name\s*=\s*["\'])[^"\']+(["\'])', r'\1' + name + r'\2',
+                    needles=('rootProject.name',)),
+    ]
+
+
+def version_rules() -> List[RewriteRule]:
+    """versionCode=1, versionName=1.0.0 초기화 규칙"""
+    return [
+        RewriteRule('version.code', STEP_VERSION, ROLE_GRADLE,
+                    r'versionCode\s+\d+', r'versionCode 1', needles=('versionCode',)),
+        RewriteRule('version.code_kts', STEP_VERSION, ROLE_GRADLE,
+                    r'versionCode\s*=\s*\d+', r'versionCode = 1', needles=('versionCode',)),
+        RewriteRule('version.name', STEP_VERSION, ROLE_GRADLE,
+                    r'versionName\s+["\'][^"\']*["\']', r'versionName "1.0.0"', needles=('versionName',)),
+        RewriteRule('version.name_kts', STEP_VERSION, ROLE_GRADLE,
+                    r'versionName\s*=\s*["\'][^"\']*["\']', r'versionName = "1.0.0"', needles=('versionName',)),
+    ]
+
+
+def icon_reference_rules() -> List[RewriteRule]:
+    """AndroidManifest.xml 아이콘 참조를 ic_launcher로 통일하는 규칙"""
+    return [
+        RewriteRule('icon.manifest_icon', STEP_ICON, ROLE_MANIFEST,
+                    r'android:icon="@mipmap/[^"]*"', r'android:icon="@mipmap/ic_launcher"',
+                    needles=('android:icon="@mipmap/',)),
+        RewriteRule('icon.manifest_round_icon', STEP_ICON, ROLE_MANIFEST,
+                    r'android:roundIcon="@mipmap/[^"]*"', r'android:roundIcon="@mipmap/ic_launcher_round"',
+                    needles=('android:roundIcon="@mipmap/',)),
+    ]
+
+
+def splash_reference_rules(splash_name: str) -> List[RewriteRule]:
+    """layout XML의 스플래시 ImageView src 참조 치환 규칙"""
+    name = _escape_repl(splash_name)
+    return [
+        # id가 src보다 먼저 오는 경우
+        RewriteRule('splash.layout_src', STEP_SPLASH, ROLE_LAYOUT,
+                    r'(<ImageView[^>]*android:id="@\+?id/splash"[^>]*android:src=")@mipmap/[^"]*(")',
+                    rf'\1@mipmap/{name}\2', needles=('id/splash',)),
+        # 반대 순서 (src가 id보다 먼저 오는 경우)
+        RewriteRule('splash.layout_src_reversed', STEP_SPLASH, ROLE_LAYOUT,
+                    r'(<ImageView[^>]*android:src=")@mipmap/[^"]*("[^>]*android:id="@\+?id/splash")',
+                    rf'\1@mipmap/{name}\2', needles=('id/splash',)),
+    ]
+
+
+def base_url_rules(new_url: str) -> List[RewriteRule]:
+    """buildConfigField / BASE_URL 상수 / strings.xml base_url 치환 규칙"""
+    url = _escape_repl(new_url)
+    return [
+        # buildConfigField("String", "BASE_URL", "...") (Kotlin DSL)
+        RewriteRule('base_url.gradle_kts', STEP_BASE_URL, ROLE_GRADLE,
+                    r'(buildConfigField\s*\(\s*["\']String["\']\s*,\s*["\']BASE_URL["\']\s*,\s*["\'])[^"\']+(["\'])',
+                    r'\1' + url + r'\2', needles=('BASE_URL',)),
+        # buildConfigField "String", "BASE_URL", "..." (Groovy)
+        RewriteRule('base_url.gradle', STEP_BASE_URL, ROLE_GRADLE,
+                    r'(buildConfigField\s+["\']String["\']\s*,\s*["\']BASE_URL["\']\s*,\s*["\'])[^"\']+(["\'])',
+                    r'\1' + url + r'\2', needles=('BASE_URL',)),
+        # Kotlin: const val BASE_URL = "..."
+        RewriteRule('base_url.kotlin_const', STEP_BASE_URL, ROLE_SOURCE,
+                    r'(const\s+val\s+BASE_URL\s*=\s*["\'])[^"\']+(["\'])',
+                    r'\1' + url + r'\2', needles=('BASE_URL',)),
+        # Java: static final String BASE_URL = "...";
+        RewriteRule('base_url.java_const', STEP_BASE_URL, ROLE_SOURCE,
+                    r'(static\s+final\s+String\s+BASE_URL\s*=\s*["\'])[^"\']+(["\'])',
+                    r'\1' + url + r'\2', needles=('BASE_URL',)),
+        # 일반 변수: val BASE_URL = "..."
+        RewriteRule('base_url.kotlin_val', STEP_BASE_URL, ROLE_SOURCE,
+                    r'(val\s+BASE_URL\s*=\s*["\'])[^"\']+(["\'])',
+                    r'\1' + url + r'\2', needles=('BASE_URL',)),
+        # <string name="base_url">...</string>
+        RewriteRule('base_url.strings', STEP_BASE_URL, ROLE_DEFAULT_STRINGS,
+                    r'(<string\s+name="base_url">)[^<]+(</string>)', r'\1' + url + r'\2', needles=('base_url',)),
+        # <string name="BASE_URL">...</string>
+        RewriteRule('base_url.strings_upper', STEP_BASE_URL, ROLE_DEFAULT_STRINGS,
+                    r'(<string\s+name="BASE_URL">)[^<]+(</string>)', r'\1' + url + r'\2', needles=('BASE_URL',)),
+    ]
+
+
+# ----------------------------------------------------------------------
+# 실행 계획 / 결과
+# ----------------------------------------------------------------------
+
+class RewriteResult:
+    """
+    단일 패스 치환 결과
+
+    변경/오류 기록은 인덱스의 FileRecord에 연결되므로 이후 디렉토리 이동
+    (_rename_package_directories)으로 경로가 바뀌어도 새 경로로 조회됩니다.
+
+    Attributes:
+        files_scanned: 사전 필터로 검사한 파일 수 (바이너리 제외)
+        files_matched: 단서가 있어 디코딩/치환한 파일 수 (스트리밍 포함)
+        files_written: 기록한 파일 수
+        files_streamed: 크기 상한을 넘어 스트리밍으로 처리한 파일 수
+        files_skipped: 바이너리로 판단해 건너뛴 파일 수
+        bytes_read: 검사한 파일의 크기 합계 (바이너리 제외)
+        bytes_written: 기록한 파일의 크기 합계
+        workers: 사용한 워커 수
+    """
+
+    def __init__(self, index: ProjectIndex):
+        self.index = index
+        self.files_scanned = 0
+        self.files_matched = 0
+        self.files_written = 0
+        self.files_streamed = 0
+        self.files_skipped = 0
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self.workers = 1
+        self._rules: Dict[FileRecord, List[RewriteRule]] = {}
+        self._errors: Dict[FileRecord, Tuple[str, str]] = {}
+        self._skipped: Dict[FileRecord, Tuple[str, List[RewriteRule]]] = {}
+        self._lines: Dict[FileRecord, Dict[str, List[Tuple[int, int]]]] = {}
+        # 경로 기준 조회 결과 (_path_view, 인덱스 경로가 바뀌면 다시 생성)
+        self._view: Optional[Dict[str, Dict]] = None
+        self._view_generation = -1
+
+    def record_change(self, record: FileRecord, rule: RewriteRule) -> None:
+        self._rules.setdefault(record, []).append(rule)
+
+    def record_error(self, record: FileRecord, error: str, trace: str) -> None:
+        self._errors[record] = (error, trace)
+
+    def record_skip(self, record: FileRecord, reason: str, rules: List[RewriteRule]) -> None:
+        self._skipped[record] = (reason, rules)
+
+    def record_lines(self, record: FileRecord, rule: RewriteRule, ranges: List[Tuple[int, int]]) -> None:
+        self._lines.setdefault(record, {})[rule.name] = ranges
+
+    def _path_view(self) -> Dict[str, Dict]:
+        """
+        경로 기준 조회 결과 (apply가 끝날 때 한 번 생성, 인덱스 경로가 바뀐 경우에만 다시 생성)
+
+        레코드를 경로로 바꾸려면 인덱스 전체를 순회해야 하므로 속성마다 순회하지 않고 모아 둡니다.
+        디렉토리 이동(_rename_package_directories) 뒤에는 새 경로로 다시 만듭니다.
+        """
+        generation = self.index.generation
+        if self._view is not None and self._view_generation == generation:
+            return self._view
+        view = {'changes': {}, 'errors': {}, 'skipped': {}, 'lines': {}, 'steps': {}}
+        if self._rules or self._errors or self._skipped or self._lines:
+            for rel, record in self.index.records():
+                rules = self._rules.get(record)
+                if rules:
+                    view['changes'][rel] = [rule.name for rule in rules]
+                    for step in dict.fromkeys(rule.step for rule in rules):
+                        view['steps'].setdefault(step, []).append(rel)
+                if record in self._errors:
+                    view['errors'][rel] = self._errors[record]
+                if record in self._skipped:
+                    reason, skipped_rules = self._skipped[record]
+                    view['skipped'][rel] = (reason, [rule.name for rule in skipped_rules])
+                if record in self._lines:
+                    view['lines'][rel] = self._lines[record]
+        self._view = view
+        self._view_generation = generation
+        return view
+
+    @property
+    def changes(self) -> Dict[str, List[str]]:
+        """상대 경로 -> 파일을 변경한 규칙 이름 목록 (적용 순서, 경로 순 정렬)"""
+        return dict(self._path_view()['changes'])
+
+    @property
+    def errors(self) -> Dict[str, Tuple[str, str]]:
+        """상대 경로 -> (오류 메시지, traceback)"""
+        return dict(self._path_view()['errors'])
+
+    @property
+    def skipped(self) -> Dict[str, Tuple[str, List[str]]]:
+        """상대 경로 -> (건너뛴 사유, 적용하지 않은 규칙 이름 목록)"""
+        return dict(self._path_view()['skipped'])
+
+    @property
+    def line_ranges(self) -> Dict[str, Dict[str, List[Tuple[int, int]]]]:
+        """상대 경로 -> 규칙 이름 -> 변경된 줄 범위 (apply(collect_lines=True)일 때만 기록)"""
+        return dict(self._path_view()['lines'])
+
+    def changed_by(self, path, step: str) -> bool:
+        """해당 단계의 규칙이 파일을 변경했는지 확인"""
+        record = self.index.record(path)
+        return any(rule.step == step for rule in self._rules.get(record, ()))
+
+    def error_for(self, path) -> Optional[Tuple[str, str]]:
+        """파일 처리 중 발생한 오류 (없으면 None)"""
+        return self._errors.get(self.index.record(path))
+
+    def changed_files(self, step: str) -> List[Path]:
+        """해당 단계의 규칙이 변경한 파일 목록 (경로 순 정렬)"""
+        return [self.index.path(rel) for rel in self._path_view()['steps'].get(step, [])]
+
+    def report(
+        self,
+        logs: List[str],
+        file_path: Path,
+        step: str,
+        message: str,
+        error_message: Optional[str] = None,
+        traceback_tag: Optional[str] = None
+    ) -> int:
+        """
+        파일 한 개의 단계별 처리 결과를 기존 로그 형식으로 기록
+
+        Args:
+            logs: 로그를 추가할 리스트
+            file_path: 대상 파일
+            step: 규칙 단계 이름
+            message: 변경 시 로그 ('{path}'는 프로젝트 기준 상대 경로, 읽을 때 포맷하는 LogRecord로 추가)
+            error_message: 오류 시 로그 ('{file}'은 전체 경로, '{error}'는 오류 메시지, None이면 생략)
+            traceback_tag: 있으면 '{tag} Traceback: ...' 줄 추가
+
+        Returns:
+            변경되었으면 1, 아니면 0
+        """
+        error = self.error_for(file_path)
+        if error is not None:
+            if error_message is not None:
+                logs.append(error_message.format(file=file_path, error=error[0]))
+                if traceback_tag:
+                    logs.append(f"{traceback_tag} Traceback: {error[1]}")
+            return 0
+        if self.changed_by(file_path, step):
+            logs.append(LogRecord(message, path=RelativePath(file_path, self.index.root)))
+            return 1
+        return 0
+
+
+def resolve_workers(file_count: int, workers: Optional[int] = None) -> int:
+    """
+    워커 수 결정
+
+    Args:
+        file_count: 처리할 파일 수
+        workers: 명시적 워커 수 (None 또는 0 이하면 자동)
+
+    Returns:
+        CPU 수와 파일 수(워커당 MIN_FILES_PER_WORKER개)로 제한한 워커 수 (최소 1)
+    """
+    if workers is not None and workers > 0:
+        return max(1, min(workers, file_count))
+    cpu_count = os.cpu_count() or 1
+    return max(1, min(cpu_count, file_count // MIN_FILES_PER_WORKER))
+
+
+def _process_context():
+    """프로세스 풀 시작 방식 (forkserver 지원 플랫폼은 forkserver, 아니면 spawn)"""
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('forkserver')
+    return multiprocessing.get_context('spawn')
+
+
+# 프로세스 풀 워커에 한 번만 전달되는 규칙 목록
+_worker_rules: List[RewriteRule] = []
+
+
+def _init_worker(rules: List[RewriteRule]) -> None:
+    global _worker_rules
+    _worker_rules = rules
+
+
+# _rewrite_file 결과: (변경한 규칙 인덱스, 기록 후 크기, 오류, (건너뛴 사유, 건너뛴 규칙 인덱스),
+#                     규칙 인덱스 -> 변경된 줄 범위 (collect_lines일 때만))
+FileOutcome = Tuple[
+    List[int],
+    Optional[int],
+    Optional[Tuple[str, str]],
+    Optional[Tuple[str, List[int]]],
+    Optional[Dict[int, List[Tuple[int, int]]]]
+]
+
+
+def is_binary(head: bytes) -> bool:
+    """
+    파일 앞부분으로 바이너리 여부 판단
+
+    NUL 바이트가 있거나 텍스트에 쓰이지 않는 제어 문자 비율이 BINARY_CONTROL_RATIO를 넘으면 바이너리
+    """
+    if not head:
+        return False
+    if b'\x00' in head:
+        return True
+    control = len(head) - len(head.translate(None, _CONTROL_BYTES))
+    return control / len(head) > BINARY_CONTROL_RATIO
+
+
+def _replace_stream(chunks: Iterable[bytes], old: bytes, new: bytes, counter: List[int]) -> Iterator[bytes]:
+    """
+    청크 스트림에서 old를 new로 치환 (청크 경계에 걸친 일치는 다음 청크와 이어서 검사)
+
+    UTF-8은 자기 동기화 인코딩이므로 바이트 단위 치환은 문자열 치환과 결과가 같습니다.
+    """
+    keep = len(old) - 1
+    carry = b''
+    for chunk in chunks:
+        buffer = carry + chunk
+        # cut 이후에서 시작하는 일치는 다음 청크까지 봐야 확정 가능
+        cut = len(buffer) - keep
+        pos = 0
+        while True:
+            found = buffer.find(old, pos)
+            if found == -1 or found >= cut:
+                break
+            yield buffer[pos:found]
+            yield new
+            pos = found + len(old)
+            if new != old:
+                counter[0] += 1
+        split = max(pos, cut)
+        yield buffer[pos:split]
+        carry = buffer[split:]
+    # 남은 부분은 old보다 짧으므로 일치 없음
+    yield carry
+
+
+def _match_stream(chunks: Iterable[bytes], matcher: LiteralMatcher, counter: List[int]) -> Iterator[bytes]:
+    """
+    청크 스트림에 LiteralMatcher 치환 적용 (바이트 정규식, 경계 검사는 ASCII 식별자 기준)
+
+    일치와 오른쪽 경계를 확정하려면 max_length + 1바이트가 더 필요하므로 그만큼은 다음 청크까지 보류하고,
+    왼쪽 경계(lookbehind)를 위해 이미 내보낸 바이트 중 몇 바이트를 문맥으로 남겨 둡니다.
+    """
+    margin = matcher.max_length + 1
+    context = 2
+    buffer = b''
+    pos = 0
+    chunks = iter(chunks)
+    final = False
+    while not final:
+        chunk = next(chunks, None)
+        if chunk is None:
+            final = True
+        else:
+            buffer += chunk
+        limit = len(buffer) if final else len(buffer) - margin
+        for match in matcher.byte_pattern.finditer(buffer, pos):
+            if match.start() >= limit:
+                break
+            old = match.group(0)
+            new = matcher.byte_replacements[old]
+            yield buffer[pos:match.start()]
+            yield new
+            pos = match.end()
+            # 같은 문자열로 바꾸는 경우는 변경으로 보지 않음
+            if new != old:
+                counter[0] += 1
+        if limit > pos:
+            yield buffer[pos:limit]
+            pos = limit
+        trim = max(0, pos - context)
+        buffer = buffer[trim:]
+        pos -= trim
+
+
+def _read_chunks(file_obj, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[bytes]:
+    while True:
+        chunk = file_obj.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def _stream_file(
+    path: Path,
+    rule_ids: List[int],
+    write: bool,
+    rules: List[RewriteRule]
+) -> Tuple[List[int], Optional[int]]:
+    """
+    크기 상한을 넘는 파일에 리터럴 규칙을 스트리밍으로 적용 (같은 디렉토리의 임시 파일에 쓴 뒤 교체)
+
+    Returns:
+        (변경한 규칙 인덱스 목록, 기록 후 파일 크기 또는 None)
+    """
+    counters = {rule_id: [0] for rule_id in rule_ids}
+    tmp_path = path.with_name(f".{path.name}.rewrite.tmp")
+    try:
+        with open(path, 'rb') as source:
+            stream: Iterable[bytes] = _read_chunks(source)
+            for rule_id in rule_ids:
+                rule = rules[rule_id]
+                if rule.matcher is not None:
+                    stream = _match_stream(stream, rule.matcher, counters[rule_id])
+                    continue
+                old, new = rule.literal
+                if old:
+                    stream = _replace_stream(stream, old.encode('utf-8'), new.encode('utf-8'), counters[rule_id])
+            if write:
+                with open(tmp_path, 'wb') as target:
+                    for piece in stream:
+                        target.write(piece)
+            else:
+                for _ in stream:
+                    pass
+
+        changed = [rule_id for rule_id in rule_ids if counters[rule_id][0]]
+        if changed and write:
+            os.replace(tmp_path, path)
+            return changed, path.stat().st_size
+        return changed, None
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+def changed_line_ranges(before: str, after: str) -> List[Tuple[int, int]]:
+    """
+    치환 전후 내용에서 바뀐 줄 범위 계산
+
+    Returns:
+        변경 전 기준 (시작 줄, 끝 줄) 목록 (1부터 시작, 끝 줄 포함)
+    """
+    old_lines = before.splitlines()
+    new_lines = after.splitlines()
+    ranges: List[Tuple[int, int]] = []
+    if len(old_lines) == len(new_lines):
+        # 줄 수가 같으면 (일반적인 한 줄 치환) 줄 단위 비교로 충분
+        for number, (old_line, new_line) in enumerate(zip(old_lines, new_lines), start=1):
+            if old_line == new_line:
+                continue
+            if ranges and ranges[-1][1] == number - 1:
+                ranges[-1] = (ranges[-1][0], number)
+            else:
+                ranges.append((number, number))
+        return ranges
+    matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+    for tag, i1, i2, _, _ in matcher.get_opcodes():
+        if tag != 'equal':
+            ranges.append((i1 + 1, max(i2, i1 + 1)))
+    return ranges
+
+
+def _prefilter(data, rule_ids: List[int], rules: List[RewriteRule]) -> List[int]:
+    """바이트 내용에 단서가 있는 규칙만 남김 (적용 순서 유지)"""
+    return [rule_id for rule_id in rule_ids if rules[rule_id].may_match(data)]
+
+
+def _rewrite_file(
+    file_path: str,
+    rule_ids: List[int],
+    write: bool,
+    rules: Optional[List[RewriteRule]] = None,
+    max_size: Optional[int] = None,
+    collect_lines: bool = False
+) -> FileOutcome:
+    """
+    파일 하나에 규칙을 적용하는 순수 변환 (워커에서 실행)
+
+    - 앞부분이 바이너리로 보이면 읽지 않고 건너뜀
+    - 원본 바이트에서 규칙의 단서를 먼저 찾고 (큰 파일은 mmap), 단서가 있는 규칙만 디코딩 후 적용
+    - max_size를 넘으면 스트리밍 경로로 리터럴 규칙만 적용 (정규식 규칙은 건너뜀)
+
+    Args:
+        file_path: 파일 경로
+        rule_ids: 적용할 규칙 인덱스 (적용 순서)
+        write: 변경 시 파일 기록 여부
+        rules: 규칙 목록 (None이면 프로세스 워커에 전달된 목록 사용)
+        max_size: 통째로 읽을 최대 크기 (None이면 REWRITE_MAX_FILE_SIZE)
+        collect_lines: 규칙별 변경된 줄 범위 계산 여부 (스트리밍 파일은 계산하지 않음)
+
+    Returns:
+        (변경한 규칙 인덱스 목록, 기록 후 파일 크기 또는 None, 오류 또는 None, 건너뛴 내용 또는 None,
+         규칙별 줄 범위 또는 None)
+    """
+    rules = _worker_rules if rules is None else rules
+    max_size = REWRITE_MAX_FILE_SIZE if max_size is None else max_size
+    changed: List[int] = []
+    try:
+        path = Path(file_path)
+        data = None
+        with open(path, 'rb') as f:
+            head = f.read(SNIFF_BYTES)
+            if is_binary(head):
+                return changed, None, None, (SKIP_BINARY, list(rule_ids)), None
+            size = os.fstat(f.fileno()).st_size
+            if size <= len(head):
+                data = head
+                hits = _prefilter(data, rule_ids, rules)
+            elif size >= MMAP_THRESHOLD:
+                # 큰 파일은 매핑된 바이트에서 단서만 찾고, 단서가 있을 때만 읽음
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    hits = _prefilter(mapped, rule_ids, rules)
+                    if hits and size <= max_size:
+                        data = mapped[:]
+            else:
+                data = head + f.read()
+                hits = _prefilter(data, rule_ids, rules)
+
+        if not hits:
+            return changed, None, None, (SKIP_NO_MATCH, []), None
+
+        if size > max_size:
+            streamed = [rule_id for rule_id in hits if rules[rule_id].streamable]
+            skipped = [rule_id for rule_id in hits if not rules[rule_id].streamable]
+            if streamed:
+                changed, new_size = _stream_file(path, streamed, write, rules)
+            else:
+                new_size = None
+            return changed, new_size, None, (SKIP_TOO_LARGE, skipped), None
+
+        # read_text와 같은 디코딩 (잘못된 바이트 무시, 개행 문자 통일)
+        content = data.decode('utf-8', errors='ignore')
+        if '\r' in content:
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
+        original_content = content
+        lines = {} if collect_lines else None
+
+        for rule_id in hits:
+            new_content = rules[rule_id].apply(content)
+            if new_content != content:
+                changed.append(rule_id)
+                if lines is not None:
+                    lines[rule_id] = changed_line_ranges(content, new_content)
+                content = new_content
+
+        if content != original_content and write:
+            path.write_text(content, encoding='utf-8')
+            return changed, path.stat().st_size, None, None, lines
+        return changed, None, None, None, lines
+    except Exception as e:
+        return changed, None, (str(e), traceback.format_exc()), None, None
+
+
+def _rewrite_chunk(
+    tasks: List[Tuple[str, List[int]]],
+    write: bool,
+    collect_lines: bool = False
+) -> List[FileOutcome]:
+    """프로세스 워커용 묶음 변환"""
+    return [_rewrite_file(file_path, rule_ids, write, collect_lines=collect_lines)
+            for file_path, rule_ids in tasks]
+
+
+class RewritePlan:
+    """
+    작업 단위로 컴파일된 치환 규칙 묶음
+
+    규칙은 기존 파이프라인 단계 순서(패키지 → 일괄 치환 → 앱 이름 → 버전 →
+    아이콘 참조 → BASE_URL)대로 적용되므로 단계별 순차 처리와 결과가 같습니다.
+    """
+
+    def __init__(self, rules: List[RewriteRule]):
+        self.rules = list(rules)
+        self.roles = 0
+        for rule in self.rules:
+            self.roles |= rule.roles
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def rules_for(self, roles: int) -> List[RewriteRule]:
+        """파일 역할에 적용 가능한 규칙 목록 (적용 순서 유지)"""
+        return [rule for rule in self.rules if rule.roles & roles]
+
+    def rule_ids_for(self, roles: int) -> List[int]:
+        """파일 역할에 적용 가능한 규칙 인덱스 (적용 순서 유지)"""
+        return [i for i, rule in enumerate(self.rules) if rule.roles & roles]
+
+    def apply(
+        self,
+        index: ProjectIndex,
+        write: bool = True,
+        executor: str = EXECUTOR_SERIAL,
+        workers: Optional[int] = None,
+        collect_lines: bool = False
+    ) -> RewriteResult:
+        """
+        인덱스의 대상 파일마다 한 번 읽고, 모든 규칙을 적용한 뒤 최대 한 번 기록
+
+        Args:
+            index: 프로젝트 인덱스
+            write: False면 변경 내용을 계산만 하고 파일은 기록하지 않음
+            executor: 실행 모드 ('serial', 'thread', 'process')
+            workers: 워커 수 (None이면 CPU 수와 파일 수로 자동 결정)
+            collect_lines: 규칙별 변경된 줄 범위 기록 여부 (드라이런 계획용)
+
+        Returns:
+            RewriteResult (실행 모드와 무관하게 경로 순으로 집계)
+        """
+        if executor not in EXECUTOR_MODES:
+            raise ValueError(f"Unknown executor: {executor}")
+
+        result = RewriteResult(index)
+        if not self.rules:
+            return result
+
+        tasks: List[Tuple[str, FileRecord, List[int]]] = []
+        for rel, record in index.records(self.roles):
+            # 패스스루 파일은 디스크에 없음 (텍스트 파일은 항상 압축 해제됨)
+            if record.source is not None:
+                continue
+            tasks.append((rel, record, self.rule_ids_for(record.roles)))
+
+        worker_count = resolve_workers(len(tasks), workers)
+        if executor == EXECUTOR_SERIAL or worker_count <= 1:
+            outcomes = [
+                _rewrite_file(str(index.path(rel)), rule_ids, write, self.rules, collect_lines=collect_lines)
+                for rel, _, rule_ids in tasks
+            ]
+        else:
+            outcomes = self._run_pool(index, tasks, write, executor, worker_count, collect_lines)
+
+        # 워커 완료 순서와 무관하게 경로 순으로 결과 반영
+        for (rel, record, _), (changed, new_size, error, skipped, lines) in zip(tasks, outcomes):
+            if error is not None:
+                result.record_error(record, *error)
+                continue
+            if skipped is not None and skipped[0] == SKIP_BINARY:
+                result.record_skip(record, SKIP_BINARY, [self.rules[rule_id] for rule_id in skipped[1]])
+                result.files_skipped += 1
+                continue
+            result.files_scanned += 1
+            result.bytes_read += record.size
+            if skipped is not None and skipped[0] == SKIP_NO_MATCH:
+                continue
+            result.files_matched += 1
+            if skipped is not None:
+                result.record_skip(record, SKIP_TOO_LARGE, [self.rules[rule_id] for rule_id in skipped[1]])
+                result.files_streamed += 1
+            for rule_id in changed:
+                result.record_change(record, self.rules[rule_id])
+                if lines and rule_id in lines:
+                    result.record_lines(record, self.rules[rule_id], lines[rule_id])
+            if new_size is not None:
+                index.set_size(rel, new_size)
+                result.files_written += 1
+                result.bytes_written += new_size
+
+        result.workers = worker_count if executor != EXECUTOR_SERIAL else 1
+        result._path_view()
+        return result
+
+    def _run_pool(
+        self,
+        index: ProjectIndex,
+        tasks: List[Tuple[str, FileRecord, List[int]]],
+        write: bool,
+        executor: str,
+        worker_count: int,
+        collect_lines: bool = False
+    ) -> list:
+        """스레드/프로세스 풀로 파일 변환 실행 (입력 순서대로 결과 반환)"""
+        if executor == EXECUTOR_THREAD:
+            with ThreadPoolExecutor(max_workers=worker_count) as pool:
+                return list(pool.map(
+                    lambda task: _rewrite_file(
+                        str(index.path(task[0])), task[2], write, self.rules, collect_lines=collect_lines
+                    ),
+                    tasks
+                ))
+
+        chunks = [
+            [(str(index.path(rel)), rule_ids) for rel, _, rule_ids in tasks[i:i + PROCESS_CHUNK_SIZE]]
+            for i in range(0, len(tasks), PROCESS_CHUNK_SIZE)
+        ]
+        # 서버의 작업/단계 스레드에서 fork하면 다른 스레드가 잡고 있던 잠금을 자식이 물려받아 멈출 수 있으므로
+        # forkserver(없으면 spawn)로 워커 생성 (규칙은 initargs로 피클링되어 전달)
+        with ProcessPoolExecutor(
+            max_workers=worker_count,
+            mp_context=_process_context(),
+            initializer=_init_worker,
+            initargs=(self.rules,)
+        ) as pool:
+            outcomes = []
+            for chunk_outcomes in pool.map(
+                _rewrite_chunk, chunks, [write] * len(chunks), [collect_lines] * len(chunks)
+            ):
+                outcomes.extend(chunk_outcomes)
+            return outcomes
+
+
+def build_rewrite_plan(
+    old_package: Optional[str],
+    new_package: str,
+    new_app_name: Optional[str],
+    new_base_url: Optional[str] = None,
+    update_icon_references: bool = False,
+    splash_name: Optional[str] = None,
+    old_base_urls: Sequence[str] = ()
+) -> RewritePlan:
+    """
+    작업 파라미터로 전체 치환 계획 생성
+
+    Args:
+        old_package: 기존 패키지명 (None이면 패키지 규칙 제외)
+        new_package: 새 패키지명
+        new_app_name: 새 앱 이름 (None이면 앱 이름 규칙 제외)
+        new_base_url: 새 BASE_URL (None이면 BASE_URL 규칙 제외)
+        update_icon_references: 매니페스트 아이콘 참조 통일 여부
+        splash_name: 스플래시 리소스 이름 (있으면 layout 참조 치환)
+        old_base_urls: 기존 BASE_URL 값 (new_base_url이 있으면 모든 텍스트 파일에서 리터럴로 교체)
+
+    Returns:
+        RewritePlan
+    """
+    rules: List[RewriteRule] = []
+    if old_package:
+        rules.extend(package_rules(old_package, new_package))
+        rules.extend(bulk_package_rules(old_package, new_package))
+    if new_app_name is not None:
+        rules.extend(app_name_rules(new_app_name))
+    rules.extend(version_rules())
+    if update_icon_references:
+        rules.extend(icon_reference_rules())
+        if splash_name:
+            rules.extend(splash_reference_rules(splash_name))
+    if new_base_url:
+        # 정의는 정의 규칙으로 먼저 바꾸고, 남은 참조를 리터럴로 교체
+        rules.extend(base_url_rules(new_base_url))
+        rules.extend(base_url_literal_rules(old_base_urls, new_base_url))
+    return RewritePlan(rules)
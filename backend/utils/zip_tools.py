@@ -3,68 +3,369 @@ ZIP 압축 해제 및 재압축 유틸리티
 """
 import zipfile
 import os
+import queue
+import struct
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import List
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
 
+from backend.utils.project_index import ProjectIndex, ROLE_GRADLE
 
-def extract_zip(zip_path: str, extract_to: str) -> str:
+
+# 압축 해제에서 제외할 파일/폴더 패턴
+EXCLUDE_PATTERNS = {
+    '__MACOSX', '.DS_Store', 'Thumbs.db', '._.',
+    '/build/', '/.gradle/', '/.idea/',
+    '/outputs/', '/.cxx/', '/.externalNativeBuild/',
+    '/captures/', 'local.properties'
+}
+
+# Gradle 캐시 패턴 (accessors, classes 등)
+GRADLE_CACHE_PATTERNS = ['accessors', 'classes/org/gradle', 'caches']
+
+# 패스스루 복사 시 한 번에 읽는 크기
+COPY_CHUNK_SIZE = 1024 * 1024
+
+# 압축 해제 워커 스레드 수 (0이면 CPU 수 기준 자동, 1이면 순차 처리)
+EXTRACT_WORKERS = int(os.environ.get('EXTRACT_WORKERS', '0'))
+# 워커당 최소 멤버 수 (작은 ZIP은 스레드 생성 비용이 더 큼)
+MIN_MEMBERS_PER_WORKER = 64
+# 워커에 한 번에 넘기는 멤버 수
+EXTRACT_BATCH_SIZE = 32
+
+# 결과 ZIP에 포함하는 로그 파일명
+LOG_FILE_NAME = 'ANDROID_REBUILDER_LOG.txt'
+
+# 스트리밍 출력: 응답으로 보내는 청크 크기, 전송 대기 청크 최대 수 (초과 시 압축이 전송을 기다림)
+STREAM_CHUNK_SIZE = 256 * 1024
+STREAM_MAX_PENDING_CHUNKS = int(os.environ.get('ZIP_STREAM_MAX_PENDING_CHUNKS', '16'))
+# 전송 중단 여부를 다시 확인하는 간격, 받는 쪽이 읽지 않을 때 압축을 중단하기까지 기다리는 시간 (초)
+STREAM_POLL_SECONDS = 1.0
+STREAM_STALL_TIMEOUT = float(os.environ.get('ZIP_STREAM_STALL_TIMEOUT', '300'))
+
+
+class ZipStreamClosed(OSError):
+    """받는 쪽이 중단된 ZipStream에 쓰려고 한 경우"""
+
+
+class ZipStream:
+    """
+    결과 ZIP을 만들면서 바로 내보내는 쓰기 전용 스트림 (압축 스레드 -> 응답 스레드)
+
+    seek/tell이 없으므로 zipfile은 data descriptor 방식으로 항목을 기록하고,
+    기록된 바이트는 STREAM_CHUNK_SIZE 단위 청크로 제한된 큐에 들어갑니다.
+    tee()로 파일을 지정하면 같은 바이트를 파일에도 기록합니다 (결과 캐시/증분 재적용용).
+
+    Args:
+        max_pending: 전송 대기 청크 최대 수
+    """
+
+    name = '<stream>'
+
+    def __init__(self, max_pending: int = STREAM_MAX_PENDING_CHUNKS):
+        self._chunks: queue.Queue = queue.Queue(maxsize=max(1, max_pending))
+        self._buffer = bytearray()
+        self._tee: Optional[BinaryIO] = None
+        self._closed = False
+        self._cancelled = threading.Event()
+        self.error: Optional[str] = None
+        self.bytes_written = 0
+        # 첫 바이트가 기록되거나 스트림이 닫히면 완료 (응답 시작 시점 판단용)
+        self.started: Future = Future()
+
+    def tee(self, path: str) -> None:
+        """기록하는 바이트를 path 파일에도 기록"""
+        self._tee = open(path, 'wb')
+        self.name = path
+
+    def write(self, data: bytes) -> int:
+        if self._cancelled.is_set():
+            raise ZipStreamClosed("Output stream was cancelled by the receiver")
+        if self._tee is not None:
+            self._tee.write(data)
+        self._buffer += data
+        self.bytes_written += len(data)
+        if not self.started.done():
+            self.started.set_result(True)
+        if len(self._buffer) >= STREAM_CHUNK_SIZE:
+            self._put(bytes(self._buffer))
+            self._buffer.clear()
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def close(self, error: Optional[str] = None) -> None:
+        """
+        스트림 종료 (남은 바이트 전송, 여러 번 호출해도 한 번만 처리)
+
+        Args:
+            error: 실패 사유 (있으면 받는 쪽에서 ZipStreamClosed 발생)
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self.error = error
+        try:
+            if self._tee is not None:
+                self._tee.close()
+            if self._buffer and error is None:
+                self._put(bytes(self._buffer))
+            self._buffer.clear()
+            self._put(None)
+        except ZipStreamClosed:
+            pass
+        finally:
+            if not self.started.done():
+                self.started.set_result(False)
+
+    def cancel(self) -> None:
+        """받는 쪽 중단 (이후 write는 ZipStreamClosed, 대기 중인 청크는 버림)"""
+        self._cancelled.set()
+        while True:
+            try:
+                self._chunks.get_nowait()
+            except queue.Empty:
+                break
+
+    def _put(self, chunk: Optional[bytes]) -> None:
+        # 받는 쪽이 중단되거나 응답이 시작되지 않으면 압축 스레드가 큐에서 계속 기다리지 않도록 주기적으로 확인
+        deadline = time.monotonic() + STREAM_STALL_TIMEOUT
+        while True:
+            if self._cancelled.is_set():
+                raise ZipStreamClosed("Output stream was cancelled by the receiver")
+            try:
+                self._chunks.put(chunk, timeout=STREAM_POLL_SECONDS)
+                return
+            except queue.Full:
+                if time.monotonic() >= deadline:
+                    self.cancel()
+                    raise ZipStreamClosed(f"Output stream receiver stalled for {STREAM_STALL_TIMEOUT:.0f}s")
+
+    def chunks(self) -> Iterator[bytes]:
+        """
+        기록된 청크를 순서대로 반환 (스트림이 닫힐 때까지 대기)
+
+        Raises:
+            ZipStreamClosed: 실패로 닫힌 경우 (응답이 중간에 끊김)
+        """
+        try:
+            while True:
+                chunk = self._chunks.get()
+                if chunk is None:
+                    break
+                yield chunk
+            if self.error is not None:
+                raise ZipStreamClosed(self.error)
+        finally:
+            # 끝까지 읽지 않고 중단된 경우 (클라이언트 연결 끊김 등) 압축 중단
+            if not self._closed:
+                self.cancel()
+
+
+def is_excluded_member(member: str) -> bool:
+    """
+    압축 해제에서 제외할 ZIP 멤버인지 확인
+
+    Args:
+        member: ZIP 멤버 이름
+
+    Returns:
+        제외 대상이면 True
+    """
+    # 1. 숨김 파일/폴더 체크 (. 로 시작)
+    for part in member.split('/'):
+        if part.startswith('.') and part != '.' and part != '..':
+            return True
+
+    # 2. 빌드 관련 폴더 체크
+    for pattern in EXCLUDE_PATTERNS:
+        if pattern in member:
+            return True
+
+    # 3. Gradle 캐시 체크
+    member_lower = member.lower()
+    for cache_pattern in GRADLE_CACHE_PATTERNS:
+        if cache_pattern in member_lower:
+            return True
+
+    return False
+
+
+def _sanitize_member_path(member: str) -> str:
+    """ZipFile.extract와 동일한 규칙으로 멤버 이름을 안전한 상대 경로로 변환"""
+    arcname = member.replace('/', os.path.sep)
+    if os.path.altsep:
+        arcname = arcname.replace(os.path.altsep, os.path.sep)
+    arcname = os.path.splitdrive(arcname)[1]
+    invalid_parts = ('', os.path.curdir, os.path.pardir)
+    return os.path.sep.join(part for part in arcname.split(os.path.sep) if part not in invalid_parts)
+
+
+def copy_raw_member(src_fp, info: zipfile.ZipInfo, zipf: zipfile.ZipFile, arcname: str) -> None:
+    """
+    원본 ZIP 멤버의 압축된 바이트와 CRC를 그대로 출력 ZIP에 기록 (압축 해제/재압축 없음)
+
+    zipfile에는 원시 복사 API가 없으므로 로컬 헤더를 직접 기록하고
+    ZipFile의 중앙 디렉토리 목록(filelist/NameToInfo)을 갱신합니다.
+
+    Args:
+        src_fp: 원본 ZIP의 바이너리 파일 객체
+        info: 원본 멤버의 ZipInfo
+        zipf: 쓰기 모드의 출력 ZipFile
+        arcname: 출력 ZIP 내부 경로
+    """
+    src_fp.seek(info.header_offset)
+    fheader = struct.unpack(zipfile.structFileHeader, src_fp.read(zipfile.sizeFileHeader))
+    if fheader[zipfile._FH_SIGNATURE] != zipfile.stringFileHeader:
+        raise zipfile.BadZipFile(f"Bad local file header for {info.filename}")
+    src_fp.seek(fheader[zipfile._FH_FILENAME_LENGTH] + fheader[zipfile._FH_EXTRA_FIELD_LENGTH], os.SEEK_CUR)
+
+    zinfo = zipfile.ZipInfo(arcname, info.date_time)
+    zinfo.compress_type = info.compress_type
+    zinfo.CRC = info.CRC
+    zinfo.compress_size = info.compress_size
+    zinfo.file_size = info.file_size
+    zinfo.external_attr = info.external_attr
+    zinfo.create_system = info.create_system
+    # 크기/CRC를 헤더에 바로 기록하므로 data descriptor 플래그(0x08)는 제거
+    zinfo.flag_bits = info.flag_bits & ~(0x08 | 0x800)
+
+    zip64 = zinfo.file_size > zipfile.ZIP64_LIMIT or zinfo.compress_size > zipfile.ZIP64_LIMIT
+
+    with zipf._lock:
+        if zipf._seekable:
+            zipf.fp.seek(zipf.start_dir)
+        zinfo.header_offset = zipf.fp.tell()
+        zipf.fp.write(zinfo.FileHeader(zip64))
+
+        remaining = info.compress_size
+        while remaining > 0:
+            chunk = src_fp.read(min(COPY_CHUNK_SIZE, remaining))
+            if not chunk:
+                raise zipfile.BadZipFile(f"Truncated data for {info.filename}")
+            zipf.fp.write(chunk)
+            remaining -= len(chunk)
+
+        zipf.filelist.append(zinfo)
+        zipf.NameToInfo[zinfo.filename] = zinfo
+        zipf.start_dir = zipf.fp.tell()
+        zipf._didModify = True
+
+
+def _extract_workers(member_count: int, workers: Optional[int] = None) -> int:
+    """압축 해제 워커 수 (파일 생성 대기가 있으므로 CPU 수의 2배까지, 멤버 수로 제한)"""
+    workers = workers if workers is not None else EXTRACT_WORKERS
+    if workers > 0:
+        return max(1, min(workers, member_count))
+    cpu_count = os.cpu_count() or 1
+    return max(1, min(cpu_count * 2, member_count // MIN_MEMBERS_PER_WORKER))
+
+
+def _extract_members(zip_path: str, members: List[zipfile.ZipInfo], extract_to: str, workers: int) -> None:
+    """
+    멤버를 여러 스레드에서 압축 해제 (zlib 압축 해제와 파일 쓰기는 GIL을 놓음)
+
+    워커마다 자기 ZipFile 핸들을 열어 사용하며, 상위 디렉토리는 호출하는 쪽에서 미리 생성해야 합니다.
+    """
+    local = threading.local()
+    handles: List[zipfile.ZipFile] = []
+    handles_lock = threading.Lock()
+
+    def extract_batch(batch: List[zipfile.ZipInfo]) -> None:
+        zip_ref = getattr(local, 'zip_ref', None)
+        if zip_ref is None:
+            zip_ref = local.zip_ref = zipfile.ZipFile(zip_path, 'r')
+            with handles_lock:
+                handles.append(zip_ref)
+        for info in batch:
+            zip_ref.extract(info, extract_to)
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='zip-extract') as pool:
+            futures = [
+                pool.submit(extract_batch, members[start:start + EXTRACT_BATCH_SIZE])
+                for start in range(0, len(members), EXTRACT_BATCH_SIZE)
+            ]
+            for future in futures:
+                future.result()
+    finally:
+        for zip_ref in handles:
+            zip_ref.close()
+
+
+def extract_zip(
+    zip_path: str,
+    extract_to: str,
+    member_filter: Optional[Callable[[str], bool]] = None,
+    deferred: Optional[List[Tuple[str, str, int]]] = None,
+    workers: Optional[int] = None
+) -> str:
     """
     ZIP 파일을 지정된 경로에 압축 해제
 
     Args:
         zip_path: ZIP 파일 경로
         extract_to: 압축 해제 대상 디렉토리
+        member_filter: 압축 해제 여부 판단 함수 (False인 멤버는 압축 해제하지 않고
+            상위 디렉토리만 생성, 원본 ZIP에서 그대로 복사하는 패스스루 대상)
+        deferred: 패스스루 멤버를 (멤버명, 대상 경로, 원본 크기)로 수집할 리스트
+        workers: 압축 해제 워커 스레드 수 (None이면 EXTRACT_WORKERS, 0이면 자동)
 
     Returns:
         압축 해제된 프로젝트 루트 디렉토리 경로
     """
     logs = []
 
-    # 제외할 파일/폴더 패턴
-    EXCLUDE_PATTERNS = {
-        '__MACOSX', '.DS_Store', 'Thumbs.db', '._.',
-        '/build/', '/.gradle/', '/.idea/',
-        '/outputs/', '/.cxx/', '/.externalNativeBuild/',
-        '/captures/', 'local.properties'
-    }
-
     with zipfile.ZipFile(zip_path, 'r') as zip_ref:
         # 필터링된 파일만 압축 해제
         extracted_count = 0
         skipped_count = 0
+        deferred_count = 0
+        # 압축 해제할 파일 멤버 (대상 경로 -> ZipInfo, 같은 이름이 여러 번 나오면 순차 처리처럼 마지막 멤버)
+        file_members: Dict[str, zipfile.ZipInfo] = {}
+        parent_dirs: Set[str] = set()
 
-        for member in zip_ref.namelist():
-            # 제외 패턴 체크
-            should_skip = False
+        for info in zip_ref.infolist():
+            member = info.filename
 
-            # 1. 숨김 파일/폴더 체크 (. 로 시작)
-            member_parts = member.split('/')
-            for part in member_parts:
-                if part.startswith('.') and part != '.' and part != '..':
-                    should_skip = True
-                    break
+            if is_excluded_member(member):
+                skipped_count += 1
+                continue
 
-            # 2. 빌드 관련 폴더 체크
-            if not should_skip:
-                for pattern in EXCLUDE_PATTERNS:
-                    if pattern in member:
-                        should_skip = True
-                        break
-
-            # 3. Gradle 캐시 체크 (accessors, classes 등)
-            if not should_skip:
-                gradle_cache_patterns = ['accessors', 'classes/org/gradle', 'caches']
-                for cache_pattern in gradle_cache_patterns:
-                    if cache_pattern in member.lower():
-                        should_skip = True
-                        break
-
-            if not should_skip:
-                zip_ref.extract(member, extract_to)
+            if member_filter is None or info.is_dir() or member_filter(member):
+                if info.is_dir():
+                    zip_ref.extract(info, extract_to)
+                else:
+                    target_path = os.path.join(extract_to, _sanitize_member_path(member))
+                    file_members.pop(target_path, None)
+                    file_members[target_path] = info
+                    parent_dirs.add(os.path.dirname(target_path))
                 extracted_count += 1
             else:
-                skipped_count += 1
+                # 압축 해제 없이 상위 디렉토리만 생성 (프로젝트 루트 탐지/디렉토리 이동용)
+                target_path = os.path.join(extract_to, _sanitize_member_path(member))
+                os.makedirs(os.path.dirname(target_path), exist_ok=True)
+                if deferred is not None:
+                    deferred.append((member, target_path, info.file_size))
+                deferred_count += 1
+
+        # 워커끼리 같은 디렉토리를 동시에 만들지 않도록 상위 디렉토리를 먼저 생성
+        for directory in sorted(parent_dirs):
+            os.makedirs(directory, exist_ok=True)
+
+        members = list(file_members.values())
+        worker_count = _extract_workers(len(members), workers)
+        if worker_count > 1:
+            _extract_members(zip_path, members, extract_to, worker_count)
+        else:
+            for info in members:
+                zip_ref.extract(info, extract_to)
 
+        if deferred_count:
+            logs.append(f"[ZIP] Deferred {deferred_count} unchanged files for passthrough copy")
         logs.append(f"[ZIP] Extracted {extracted_count} files to {extract_to} (skipped {skipped_count} system/cache files)")
 
     # 압축 해제 후 실제 프로젝트 루트 찾기
@@ -110,89 +411,183 @@ def extract_zip(zip_path: str, extract_to: str) -> str:
     return project_root, logs
 
 
-def create_zip(source_dir: str, output_zip: str, log_content: str = None, new_folder_name: str = None) -> List[str]:
+def write_log(zipf: zipfile.ZipFile, arcname: str, log_content: Union[str, Iterable[str]]) -> None:
+    """
+    로그를 ZIP 항목으로 기록 (줄 목록은 하나의 문자열로 합치지 않고 줄 단위로 압축 스트림에 기록)
+
+    Args:
+        zipf: 쓰기 모드 ZIP
+        arcname: 항목 이름
+        log_content: 로그 문자열 또는 줄 목록 (JobLog 등, 줄 사이에 개행 추가)
+    """
+    if isinstance(log_content, str):
+        zipf.writestr(arcname, log_content)
+        return
+    # writestr과 같은 항목 속성 (현재 시각, 기본 압축 방식, rw-------)
+    info = zipfile.ZipInfo(arcname, date_time=time.localtime(time.time())[:6])
+    info.compress_type = zipf.compression
+    info.external_attr = 0o600 << 16
+    with zipf.open(info, 'w') as entry:
+        for position, line in enumerate(log_content):
+            if position:
+                entry.write(b'\n')
+            entry.write(line.encode('utf-8'))
+
+
+def create_zip(
+    source_dir: str,
+    output_zip: Union[str, ZipStream],
+    log_content: Union[str, Iterable[str], None] = None,
+    new_folder_name: str = None,
+    index: Optional[ProjectIndex] = None,
+    reuse_zip: Optional[str] = None,
+    reuse: Optional[Set[str]] = None,
+    reuse_folder_name: Optional[str] = None
+) -> List[str]:
     """
     디렉토리를 ZIP 파일로 압축
 
     Args:
         source_dir: 압축할 디렉토리
-        output_zip: 생성할 ZIP 파일 경로
-        log_content: ANDROID_REBUILDER_LOG.txt 내용 (있으면 포함)
+        output_zip: 생성할 ZIP 파일 경로 또는 ZipStream (압축하면서 바로 전송, 닫는 것은 호출하는 쪽)
+        log_content: ANDROID_REBUILDER_LOG.txt 내용 (문자열 또는 줄 목록, 있으면 포함)
         new_folder_name: ZIP 내부의 새 폴더명 (있으면 루트 폴더명 변경)
+        index: 프로젝트 인덱스 (있으면 트리 재순회 없이 인덱스의 파일 목록 사용,
+            패스스루 파일은 원본 ZIP의 압축된 바이트를 그대로 복사)
+        reuse_zip: 이전 결과 ZIP (증분 재적용 시 변경되지 않은 항목의 압축된 바이트를 그대로 복사)
+        reuse: reuse_zip에서 복사할 파일 (프로젝트 기준 상대 경로)
+        reuse_folder_name: reuse_zip 내부의 루트 폴더명
 
     Returns:
         로그 메시지 리스트
     """
     logs = []
     file_count = 0
+    passthrough_count = 0
+    reused_count = 0
+    reuse = reuse or set()
 
     # 제외할 폴더 및 파일 패턴
     EXCLUDE_DIRS = {'build', '.gradle', '.idea', 'outputs', '__pycache__', '.git', '__MACOSX'}
     EXCLUDE_FILES = {'.DS_Store', 'Thumbs.db', '._.DS_Store'}
 
-    with zipfile.ZipFile(output_zip, 'w', zipfile.ZIP_DEFLATED) as zipf:
-        source_path = Path(source_dir)
-
-        # 로그 파일 추가 (루트 또는 새 폴더 내부)
-        if log_content:
-            if new_folder_name:
-                zipf.writestr(f'{new_folder_name}/ANDROID_REBUILDER_LOG.txt', log_content)
-            else:
-                zipf.writestr('ANDROID_REBUILDER_LOG.txt', log_content)
-            logs.append("[ZIP] Added ANDROID_REBUILDER_LOG.txt to ZIP")
-
-        # 모든 파일 순회하며 압축
-        for file_path in source_path.rglob('*'):
-            # 제외 조건 확인
-            if any(excluded in file_path.parts for excluded in EXCLUDE_DIRS):
-                continue
-            if file_path.name in EXCLUDE_FILES:
-                continue
-            if not file_path.is_file():
-                continue
-
-            # 상대 경로로 압축
-            relative_path = file_path.relative_to(source_path)
-
-            # 새 폴더명이 지정되면 경로 앞에 추가
-            if new_folder_name:
-                archive_path = Path(new_folder_name) / relative_path
-            else:
-                archive_path = relative_path
-
-            zipf.write(file_path, archive_path)
-            file_count += 1
-
+    # 패스스루 파일 복사용 원본 ZIP
+    source_zip = None
+    source_fp = None
+    if index is not None and index.source_zip and index.passthrough_count():
+        source_zip = zipfile.ZipFile(index.source_zip, 'r')
+        source_fp = open(index.source_zip, 'rb')
+
+    # 이전 결과 ZIP (증분 재적용)
+    previous_zip = None
+    previous_fp = None
+    if reuse_zip and reuse:
+        previous_zip = zipfile.ZipFile(reuse_zip, 'r')
+        previous_fp = open(reuse_zip, 'rb')
+
+    try:
+        with zipfile.ZipFile(output_zip, 'w', zipfile.ZIP_DEFLATED) as zipf:
+            source_path = Path(source_dir)
+
+            # 로그 파일 추가 (루트 또는 새 폴더 내부)
+            if log_content:
+                if new_folder_name:
+                    write_log(zipf, f'{new_folder_name}/{LOG_FILE_NAME}', log_content)
+                else:
+                    write_log(zipf, LOG_FILE_NAME, log_content)
+                logs.append(f"[ZIP] Added {LOG_FILE_NAME} to ZIP")
+
+            # 모든 파일 순회하며 압축
+            file_paths = index.files() if index is not None else source_path.rglob('*')
+            for file_path in file_paths:
+                # 제외 조건 확인
+                if any(excluded in file_path.parts for excluded in EXCLUDE_DIRS):
+                    continue
+                if file_path.name in EXCLUDE_FILES:
+                    continue
+                record = index.record(file_path) if index is not None else None
+                is_passthrough = record is not None and record.source is not None
+
+                # 상대 경로로 압축
+                relative_path = file_path.relative_to(source_path)
+                previous_info = None
+                if previous_zip is not None and relative_path.as_posix() in reuse:
+                    previous_name = relative_path.as_posix()
+                    if reuse_folder_name:
+                        previous_name = f"{reuse_folder_name}/{previous_name}"
+                    previous_info = previous_zip.NameToInfo.get(previous_name)
+
+                if previous_info is None and not is_passthrough and not file_path.is_file():
+                    continue
+
+                # 새 폴더명이 지정되면 경로 앞에 추가
+                if new_folder_name:
+                    archive_path = Path(new_folder_name) / relative_path
+                else:
+                    archive_path = relative_path
+
+                if previous_info is not None:
+                    # 이전 결과 이후 변경되지 않은 파일: 이전 ZIP의 압축된 바이트/CRC를 그대로 복사
+                    copy_raw_member(previous_fp, previous_info, zipf, str(archive_path))
+                    reused_count += 1
+                elif is_passthrough:
+                    # 변경되지 않은 파일: 압축된 바이트/CRC를 그대로 복사
+                    copy_raw_member(source_fp, source_zip.getinfo(record.source), zipf, str(archive_path))
+                    passthrough_count += 1
+                else:
+                    zipf.write(file_path, archive_path)
+                file_count += 1
+    finally:
+        if source_zip is not None:
+            source_zip.close()
+            source_fp.close()
+        if previous_zip is not None:
+            previous_zip.close()
+            previous_fp.close()
+
+    if passthrough_count:
+        logs.append(f"[ZIP] Copied {passthrough_count} unchanged files without recompression")
+    if reused_count:
+        logs.append(
+            f"[ZIP] Reused {reused_count} entries from previous output, "
+            f"recompressed {file_count - reused_count - passthrough_count}"
+        )
+
+    action = 'Streamed' if isinstance(output_zip, ZipStream) else 'Created'
+    output_name = output_zip.name if isinstance(output_zip, ZipStream) else output_zip
     if new_folder_name:
-        logs.append(f"[ZIP] Created {output_zip} with {file_count} files (folder: {new_folder_name})")
+        logs.append(f"[ZIP] {action} {output_name} with {file_count} files (folder: {new_folder_name})")
     else:
-        logs.append(f"[ZIP] Created {output_zip} with {file_count} files")
+        logs.append(f"[ZIP] {action} {output_name} with {file_count} files")
     return logs
 
 
-def get_app_module_path(project_root: str) -> tuple:
+def get_app_module_path(project_root: str, index: Optional[ProjectIndex] = None) -> tuple:
     """
     Android 프로젝트에서 app 모듈 경로 탐지
 
     Args:
         project_root: 프로젝트 루트 디렉토리
+        index: 프로젝트 인덱스 (없으면 새로 생성)
 
     Returns:
         (app_module_path, logs)
     """
     logs = []
     project_path = Path(project_root)
+    if index is None:
+        index = ProjectIndex.build(project_root)
 
     # 1순위: app 디렉토리
     app_dir = project_path / 'app'
-    if app_dir.exists() and (app_dir / 'src' / 'main').exists():
+    if index.is_dir(app_dir) and index.is_dir(app_dir / 'src' / 'main'):
         logs.append(f"[DETECT] Found app module at: {app_dir}")
         return str(app_dir), logs
 
     # 2순위: build.gradle(.kts) + src/main 조합
-    for gradle_file in project_path.rglob('build.gradle*'):
+    for gradle_file in index.files(ROLE_GRADLE):
         module_dir = gradle_file.parent
-        if (module_dir / 'src' / 'main').exists():
+        if index.is_dir(module_dir / 'src' / 'main'):
             logs.append(f"[DETECT] Found app module at: {module_dir}")
             return str(module_dir), logs
 
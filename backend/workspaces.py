@@ -0,0 +1,117 @@
+"""
+증분 재적용용 이전 빌드 보관소
+- 같은 프로젝트(업로드 ZIP 또는 템플릿 해시)의 마지막 빌드 작업 공간과 단계 입력 기록을 보관
+- 다음 작업이 꺼내 가면(take) 소유권이 넘어가고, 성공하면 다시 보관 (두 작업이 동시에 공유하지 않음)
+- 보관 개수를 넘으면 가장 오래 사용하지 않은 항목부터 삭제
+"""
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+
+from backend.processor import BuildRecord
+
+
+# 보관 디렉토리의 상위 경로 (프로세스마다 하위 임시 디렉토리를 만들어 사용)
+DEFAULT_WORKSPACE_STORE_DIR = os.environ.get('WORKSPACE_STORE_DIR', tempfile.gettempdir())
+# 보관할 이전 빌드 수 (0이면 증분 재적용 비활성화)
+DEFAULT_MAX_KEPT_WORKSPACES = int(os.environ.get('MAX_KEPT_WORKSPACES', '4'))
+
+
+class WorkspaceStore:
+    """
+    프로젝트별 마지막 빌드(BuildRecord) 보관
+
+    레코드의 인덱스는 메모리에만 있으므로 보관 디렉토리는 프로세스 전용이며 재시작 시 유지되지 않습니다.
+
+    Args:
+        parent_dir: 보관 디렉토리를 만들 상위 경로
+        max_entries: 보관할 빌드 수 (0 이하면 비활성화)
+    """
+
+    def __init__(
+        self,
+        parent_dir: str = DEFAULT_WORKSPACE_STORE_DIR,
+        max_entries: int = DEFAULT_MAX_KEPT_WORKSPACES
+    ):
+        self.parent_dir = Path(parent_dir)
+        self.max_entries = max_entries
+        self.root_dir: Optional[Path] = None
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self._records: 'OrderedDict[str, BuildRecord]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def allocate(self) -> str:
+        """새 레코드용 빈 디렉토리"""
+        with self._lock:
+            if self.root_dir is None:
+                self.parent_dir.mkdir(parents=True, exist_ok=True)
+                self.root_dir = Path(tempfile.mkdtemp(prefix='android_rebuild_workspaces_', dir=self.parent_dir))
+        return tempfile.mkdtemp(prefix='build_', dir=self.root_dir)
+
+    def take(self, key: str) -> Optional[BuildRecord]:
+        """
+        보관된 빌드를 꺼냄 (소유권이 호출한 쪽으로 넘어감)
+
+        Returns:
+            BuildRecord (없으면 None)
+        """
+        with self._lock:
+            record = self._records.pop(key, None)
+            if record is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return record
+
+    def put(self, key: str, record: BuildRecord) -> None:
+        """빌드 보관 (같은 키의 기존 항목과 개수를 넘는 오래된 항목은 삭제)"""
+        evicted = []
+        with self._lock:
+            replaced = self._records.pop(key, None)
+            if replaced is not None:
+                evicted.append(replaced)
+            self._records[key] = record
+            self.stores += 1
+            while len(self._records) > max(self.max_entries, 0):
+                evicted.append(self._records.popitem(last=False)[1])
+                self.evictions += 1
+        for old in evicted:
+            old.cleanup()
+
+    def clear(self) -> int:
+        """모든 항목 및 보관 디렉토리 삭제"""
+        with self._lock:
+            records = list(self._records.values())
+            self._records.clear()
+            root_dir, self.root_dir = self.root_dir, None
+        for record in records:
+            record.cleanup()
+        if root_dir is not None:
+            shutil.rmtree(root_dir, ignore_errors=True)
+        return len(records)
+
+    def stats(self) -> Dict:
+        """보관 상태 및 재사용 카운터"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'enabled': self.enabled,
+                'entries': len(self._records),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+                'stores': self.stores,
+                'evictions': self.evictions,
+            }
@@ -0,0 +1,427 @@
+"""
+파이프라인 단계별 마이크로벤치마크
+- backend/utils의 각 단계 함수와 AndroidProjectProcessor.process 전체를 여러 규모의 합성 프로젝트로 측정
+- 준비(압축 해제, 인덱스 생성 등)는 측정에서 제외하고 함수 호출만 측정, 반복마다 새 작업 공간 사용
+- 결과를 JSON 기준 파일로 저장하고, 기준 파일과 비교해 느려진 항목을 보고
+- 네트워크 없이 동작 (아이콘 렌디션 캐시는 끄고 측정)
+
+사용법:
+    python -m benchmarks.run                                    # small, medium
+    python -m benchmarks.run --scales small large --repeat 5
+    python -m benchmarks.run --output after.json --compare benchmarks/baseline.json
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+# 반복 측정이 렌디션 캐시 적중으로 빨라지지 않도록 캐시 비활성화 (backend import 전에 설정)
+os.environ.setdefault('ICON_CACHE_MAX_BYTES', '0')
+
+from backend.processor import STEP_TITLES, AndroidProjectProcessor  # noqa: E402
+from backend.utils.baseurl_replace import detect_old_base_urls, replace_base_url  # noqa: E402
+from backend.utils.cleanup import clean_build_artifacts  # noqa: E402
+from backend.utils.file_replace import (  # noqa: E402
+    detect_old_package_name,
+    replace_app_name,
+    replace_package_name,
+    reset_version
+)
+from backend.utils.firebase import replace_google_services  # noqa: E402
+from backend.utils.icon_replace import PILLOW_AVAILABLE, replace_app_icon  # noqa: E402
+from backend.utils.project_index import ProjectIndex, needs_extraction  # noqa: E402
+from backend.utils.rewrite_plan import EXECUTOR_SERIAL, EXECUTOR_THREAD, build_rewrite_plan  # noqa: E402
+from backend.utils.zip_tools import create_zip, extract_zip, get_app_module_path  # noqa: E402
+from benchmarks.synthetic import (  # noqa: E402
+    OLD_BASE_URL,
+    OLD_PACKAGE,
+    GeneratedProject,
+    ProjectSpec,
+    generate_project
+)
+
+
+# 결과 JSON 형식 버전
+RESULT_VERSION = 1
+
+DEFAULT_OUTPUT = str(Path(__file__).parent / 'baseline.json')
+
+# 벤치마크 규모
+SCALES: Dict[str, ProjectSpec] = {
+    'small': ProjectSpec(modules=1, sources=50, locales=2, asset_bytes=256 * 1024, layouts=5),
+    'medium': ProjectSpec(modules=4, sources=500, locales=8, asset_bytes=8 * 1024 * 1024, layouts=30),
+    'medium-kts': ProjectSpec(modules=4, sources=500, locales=8, asset_bytes=8 * 1024 * 1024, layouts=30, kts=True),
+    'large': ProjectSpec(modules=12, sources=3000, locales=20, asset_bytes=64 * 1024 * 1024, layouts=120, kts=True),
+}
+DEFAULT_SCALES = ('small', 'medium')
+
+# 변형 파라미터
+NEW_PACKAGE = 'com.brand.whitelabel'
+NEW_APP_NAME = 'Brand App'
+NEW_BASE_URL = 'https://api.brand.example.com/'
+
+# 비교 시 느려짐으로 보는 기준 (중앙값 비율, 절대 차이)
+DEFAULT_THRESHOLD = 0.25
+NOISE_FLOOR_SECONDS = 0.005
+
+
+class Benchmark(NamedTuple):
+    """
+    벤치마크 하나
+
+    Attributes:
+        name: '모듈.함수[변형]' 형태의 이름
+        setup: 작업 공간을 받아 측정할 호출의 인자(dict)를 준비 (측정 제외)
+        run: 준비된 인자로 측정할 호출 실행
+        requires_pillow: Pillow가 없으면 건너뜀
+    """
+    name: str
+    setup: Callable[['Workspace'], Dict]
+    run: Callable[[Dict], object]
+    requires_pillow: bool = False
+
+
+class Workspace:
+    """합성 프로젝트 하나의 반복별 작업 공간 준비 (각 반복은 새 임시 디렉토리 사용)"""
+
+    def __init__(self, project: GeneratedProject, root: str):
+        self.project = project
+        self.root = root
+        self._temp_dirs: List[str] = []
+
+    def empty(self) -> Dict:
+        temp_dir = tempfile.mkdtemp(prefix='bench_', dir=self.root)
+        self._temp_dirs.append(temp_dir)
+        return {'temp_dir': temp_dir}
+
+    def extracted(self, index: bool = True, clean: bool = True) -> Dict:
+        """압축 해제 (+ 인덱스 생성, 빌드 아티팩트 정리, 모듈/패키지 탐지)"""
+        ctx = self.empty()
+        ctx['project_root'], _ = extract_zip(self.project.zip_path, ctx['temp_dir'])
+        if not index:
+            return ctx
+        ctx['index'] = ProjectIndex.build(ctx['project_root'])
+        if clean:
+            clean_build_artifacts(ctx['project_root'], ctx['index'])
+        ctx['app_module'], _ = get_app_module_path(ctx['project_root'], ctx['index'])
+        return ctx
+
+    def rewritten(self) -> Dict:
+        """단일 패스 치환까지 적용 (결과 ZIP 생성 측정용)"""
+        ctx = self.extracted()
+        old_base_urls, _ = detect_old_base_urls(ctx['index'])
+        plan = build_rewrite_plan(OLD_PACKAGE, NEW_PACKAGE, NEW_APP_NAME, NEW_BASE_URL, old_base_urls=old_base_urls)
+        ctx['rewrite'] = plan.apply(ctx['index'])
+        replace_package_name(ctx['project_root'], OLD_PACKAGE, NEW_PACKAGE, ctx['index'], ctx['rewrite'])
+        ctx['output_zip'] = os.path.join(ctx['temp_dir'], 'rebuilt_project.zip')
+        return ctx
+
+    def with_plan(self) -> Dict:
+        ctx = self.extracted()
+        old_base_urls, _ = detect_old_base_urls(ctx['index'])
+        ctx['plan'] = build_rewrite_plan(
+            OLD_PACKAGE, NEW_PACKAGE, NEW_APP_NAME, NEW_BASE_URL,
+            update_icon_references=True, splash_name='splash_screen', old_base_urls=old_base_urls
+        )
+        return ctx
+
+    def cleanup(self) -> None:
+        for temp_dir in self._temp_dirs:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+        self._temp_dirs.clear()
+
+
+def _process(ctx: Dict, **kwargs) -> AndroidProjectProcessor:
+    processor = AndroidProjectProcessor()
+    ctx['processor'] = processor
+    result = processor.process(**kwargs)
+    if not result['success']:
+        raise RuntimeError(result.get('error'))
+    return processor
+
+
+def _process_kwargs(project: GeneratedProject, **overrides) -> Dict:
+    kwargs = {
+        'zip_path': project.zip_path,
+        'new_package': NEW_PACKAGE,
+        'new_app_name': NEW_APP_NAME,
+        'google_services_path': project.google_services_path,
+        'icon_path': project.icon_path,
+        'splash_path': project.splash_path,
+        'new_base_url': NEW_BASE_URL,
+    }
+    kwargs.update(overrides)
+    return kwargs
+
+
+BENCHMARKS: List[Benchmark] = [
+    Benchmark(
+        'zip_tools.extract_zip',
+        lambda ws: dict(ws.empty(), zip_path=ws.project.zip_path),
+        lambda ctx: extract_zip(ctx['zip_path'], ctx['temp_dir'])
+    ),
+    Benchmark(
+        'zip_tools.extract_zip[passthrough]',
+        lambda ws: dict(ws.empty(), zip_path=ws.project.zip_path),
+        lambda ctx: extract_zip(ctx['zip_path'], ctx['temp_dir'], member_filter=needs_extraction, deferred=[])
+    ),
+    Benchmark(
+        'project_index.ProjectIndex.build',
+        lambda ws: ws.extracted(index=False),
+        lambda ctx: ProjectIndex.build(ctx['project_root'])
+    ),
+    Benchmark(
+        'cleanup.clean_build_artifacts',
+        lambda ws: ws.extracted(clean=False),
+        lambda ctx: clean_build_artifacts(ctx['project_root'], ctx['index'])
+    ),
+    Benchmark(
+        'zip_tools.get_app_module_path',
+        lambda ws: ws.extracted(),
+        lambda ctx: get_app_module_path(ctx['project_root'], ctx['index'])
+    ),
+    Benchmark(
+        'file_replace.detect_old_package_name',
+        lambda ws: ws.extracted(),
+        lambda ctx: detect_old_package_name(ctx['app_module'])
+    ),
+    Benchmark(
+        'baseurl_replace.detect_old_base_urls',
+        lambda ws: ws.extracted(),
+        lambda ctx: detect_old_base_urls(ctx['index'])
+    ),
+    Benchmark(
+        'rewrite_plan.RewritePlan.apply[serial]',
+        lambda ws: ws.with_plan(),
+        lambda ctx: ctx['plan'].apply(ctx['index'], executor=EXECUTOR_SERIAL)
+    ),
+    Benchmark(
+        'rewrite_plan.RewritePlan.apply[thread]',
+        lambda ws: ws.with_plan(),
+        lambda ctx: ctx['plan'].apply(ctx['index'], executor=EXECUTOR_THREAD)
+    ),
+    Benchmark(
+        'file_replace.replace_package_name',
+        lambda ws: ws.extracted(),
+        lambda ctx: replace_package_name(ctx['project_root'], OLD_PACKAGE, NEW_PACKAGE, ctx['index'])
+    ),
+    Benchmark(
+        'file_replace.replace_app_name',
+        lambda ws: ws.extracted(),
+        lambda ctx: replace_app_name(ctx['project_root'], NEW_APP_NAME, ctx['index'])
+    ),
+    Benchmark(
+        'file_replace.reset_version',
+        lambda ws: ws.extracted(),
+        lambda ctx: reset_version(ctx['project_root'], ctx['index'])
+    ),
+    Benchmark(
+        'firebase.replace_google_services',
+        lambda ws: dict(ws.extracted(), google_services_path=ws.project.google_services_path),
+        lambda ctx: replace_google_services(
+            ctx['project_root'], ctx['google_services_path'], OLD_PACKAGE, NEW_PACKAGE, ctx['index']
+        )
+    ),
+    Benchmark(
+        'icon_replace.replace_app_icon',
+        lambda ws: dict(ws.extracted(), icon_path=ws.project.icon_path, splash_path=ws.project.splash_path),
+        lambda ctx: replace_app_icon(ctx['project_root'], ctx['icon_path'], ctx['splash_path'], ctx['index']),
+        requires_pillow=True
+    ),
+    Benchmark(
+        'baseurl_replace.replace_base_url',
+        lambda ws: ws.extracted(),
+        lambda ctx: replace_base_url(ctx['project_root'], OLD_BASE_URL, NEW_BASE_URL, ctx['index'])
+    ),
+    Benchmark(
+        'zip_tools.create_zip',
+        lambda ws: ws.rewritten(),
+        lambda ctx: create_zip(ctx['project_root'], ctx['output_zip'], 'log', 'BrandApp', ctx['index'])
+    ),
+    Benchmark(
+        'processor.process',
+        lambda ws: dict(ws.empty(), kwargs=_process_kwargs(ws.project)),
+        lambda ctx: _process(ctx, **ctx['kwargs'])
+    ),
+    Benchmark(
+        'processor.process[passthrough]',
+        lambda ws: dict(ws.empty(), kwargs=_process_kwargs(ws.project, zip_passthrough=True)),
+        lambda ctx: _process(ctx, **ctx['kwargs'])
+    ),
+]
+
+
+def _summary(runs: List[float]) -> Dict:
+    return {
+        'runs': [round(seconds, 6) for seconds in runs],
+        'min': round(min(runs), 6),
+        'median': round(statistics.median(runs), 6),
+        'mean': round(statistics.fmean(runs), 6),
+    }
+
+
+def run_benchmark(benchmark: Benchmark, workspace: Workspace, repeat: int) -> Dict:
+    """
+    벤치마크 하나를 repeat번 실행 (준비는 측정 제외)
+
+    Returns:
+        {'runs', 'min', 'median', 'mean'} (초), process 벤치마크는 'steps'(단계별 중앙값) 포함
+    """
+    runs: List[float] = []
+    steps: Dict[int, List[float]] = {}
+    for _ in range(repeat):
+        ctx = benchmark.setup(workspace)
+        try:
+            started = time.perf_counter()
+            benchmark.run(ctx)
+            runs.append(time.perf_counter() - started)
+            processor = ctx.get('processor')
+            if processor is not None:
+                for number, seconds in processor.step_durations.items():
+                    steps.setdefault(number, []).append(seconds)
+        finally:
+            if ctx.get('processor') is not None:
+                ctx['processor'].cleanup()
+            workspace.cleanup()
+
+    result = _summary(runs)
+    if steps:
+        result['steps'] = {
+            f"{number}. {STEP_TITLES[number - 1]}": round(statistics.median(values), 6)
+            for number, values in sorted(steps.items())
+        }
+    return result
+
+
+def run_scale(name: str, spec: ProjectSpec, repeat: int, selected: Optional[List[str]], root: str) -> Dict:
+    """규모 하나의 프로젝트 생성 후 모든 벤치마크 실행"""
+    scale_dir = os.path.join(root, name)
+    started = time.perf_counter()
+    project = generate_project(spec, scale_dir)
+    print(f"[BENCH] {name}: generated {project.files} files ({project.bytes / (1024 * 1024):.1f} MB) "
+          f"in {time.perf_counter() - started:.1f}s", flush=True)
+
+    workspace = Workspace(project, scale_dir)
+    results: Dict[str, Dict] = {}
+    for benchmark in BENCHMARKS:
+        if selected and not any(pattern in benchmark.name for pattern in selected):
+            continue
+        if benchmark.requires_pillow and not PILLOW_AVAILABLE:
+            print(f"[BENCH] {name}: {benchmark.name} skipped (Pillow not installed)", flush=True)
+            continue
+        results[benchmark.name] = run_benchmark(benchmark, workspace, repeat)
+        print(f"[BENCH] {name}: {benchmark.name:<42} median {results[benchmark.name]['median'] * 1000:9.2f} ms",
+              flush=True)
+
+    return {
+        'spec': spec._asdict(),
+        'files': project.files,
+        'bytes': project.bytes,
+        'zip_bytes': os.path.getsize(project.zip_path),
+        'results': results,
+    }
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        completed = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, timeout=5,
+            cwd=Path(__file__).resolve().parent
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return completed.stdout.strip() or None
+
+
+def compare(current: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """
+    기준 결과와 중앙값 비교 출력
+
+    Returns:
+        느려진 항목 목록 ('규모/벤치마크')
+    """
+    regressions = []
+    for scale, scale_result in current['scales'].items():
+        base_scale = baseline.get('scales', {}).get(scale)
+        if base_scale is None:
+            continue
+        if base_scale.get('spec') != scale_result['spec']:
+            print(f"[COMPARE] {scale}: spec differs from baseline, skipped")
+            continue
+        for name, result in scale_result['results'].items():
+            base = base_scale['results'].get(name)
+            if base is None or not base['median']:
+                continue
+            ratio = result['median'] / base['median']
+            slower = (ratio > 1 + threshold
+                      and result['median'] - base['median'] > NOISE_FLOOR_SECONDS)
+            marker = ' ⚠️ slower' if slower else (' ✅ faster' if ratio < 1 - threshold else '')
+            print(f"[COMPARE] {scale}: {name:<42} {base['median'] * 1000:9.2f} -> "
+                  f"{result['median'] * 1000:9.2f} ms ({ratio:5.2f}x){marker}")
+            if slower:
+                regressions.append(f"{scale}/{name}")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Per-step benchmarks on synthetic Android projects')
+    parser.add_argument('--scales', nargs='+', default=list(DEFAULT_SCALES), choices=sorted(SCALES),
+                        help=f"project scales to run (default: {' '.join(DEFAULT_SCALES)})")
+    parser.add_argument('--repeat', type=int, default=3, help='runs per benchmark (default: 3)')
+    parser.add_argument('--only', nargs='+', help='run benchmarks whose name contains any of these')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help=f'result JSON path (default: {DEFAULT_OUTPUT})')
+    parser.add_argument('--compare', help='baseline JSON to compare against (exit code 1 on regressions)')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f'median slowdown ratio reported as a regression (default: {DEFAULT_THRESHOLD})')
+    parser.add_argument('--keep', action='store_true', help='keep generated projects (prints the directory)')
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    root = tempfile.mkdtemp(prefix='android_rebuild_bench_')
+    try:
+        scales = {name: run_scale(name, SCALES[name], max(1, args.repeat), args.only, root) for name in args.scales}
+    finally:
+        if args.keep:
+            print(f"[BENCH] Generated projects kept in {root}")
+        else:
+            shutil.rmtree(root, ignore_errors=True)
+
+    result = {
+        'version': RESULT_VERSION,
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'git_revision': _git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'repeat': max(1, args.repeat),
+        'scales': scales,
+    }
+    Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(result, f, indent=2, ensure_ascii=False)
+        f.write('\n')
+    print(f"[BENCH] Results written to {args.output}")
+
+    if baseline is not None:
+        regressions = compare(result, baseline, args.threshold)
+        if regressions:
+            print(f"[COMPARE] ⚠️ {len(regressions)} regressions: {', '.join(regressions)}")
+            return 1
+        print("[COMPARE] ✅ No regressions")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,378 @@
+"""
+벤치마크용 합성 Android 프로젝트 생성기
+- 모듈 수, 소스 파일 수, 로케일 수, 에셋 크기, Groovy/KTS 빌드 스크립트를 조절
+- 같은 스펙과 시드면 항상 같은 바이트의 ZIP 생성 (기준 결과 비교용)
+- 네트워크/외부 파일 없이 동작 (이미지는 Pillow가 있을 때만 생성)
+"""
+import io
+import json
+import random
+import zipfile
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+
+try:
+    from PIL import Image
+    PILLOW_AVAILABLE = True
+except ImportError:
+    PILLOW_AVAILABLE = False
+
+
+# 생성하는 프로젝트의 기존 값 (벤치마크가 교체할 대상)
+OLD_PACKAGE = 'com.example.legacy.app'
+OLD_APP_NAME = 'Legacy App'
+OLD_BASE_URL = 'https://api.legacy.example.com/'
+ROOT_FOLDER = 'LegacyApp'
+
+LOCALES = [
+    'ko', 'ja', 'zh-rCN', 'zh-rTW', 'de', 'fr', 'es', 'it', 'pt-rBR', 'ru',
+    'ar', 'hi', 'th', 'vi', 'id', 'tr', 'pl', 'nl', 'sv', 'uk',
+]
+DENSITIES = ['mdpi', 'hdpi', 'xhdpi', 'xxhdpi', 'xxxhdpi']
+LAUNCHER_SIZES = {'mdpi': 48, 'hdpi': 72, 'xhdpi': 96, 'xxhdpi': 144, 'xxxhdpi': 192}
+FEATURE_WORDS = ['home', 'search', 'profile', 'settings', 'checkout', 'cart', 'feed', 'chat', 'auth', 'media']
+
+# 에셋 파일 하나의 최대 크기 (에셋 총량을 이 크기 단위로 나눔)
+ASSET_CHUNK_BYTES = 4 * 1024 * 1024
+
+
+class ProjectSpec(NamedTuple):
+    """
+    합성 프로젝트 스펙
+
+    Attributes:
+        modules: 라이브러리(feature) 모듈 수 (app 모듈 제외)
+        sources: 전체 소스 파일 수 (app과 모듈에 나눠 배치)
+        locales: values-* 로케일 수 (최대 len(LOCALES))
+        asset_bytes: assets/ 아래 바이너리 에셋 총 크기
+        kts: True면 build.gradle.kts / settings.gradle.kts (Kotlin DSL)
+        layouts: layout XML 수 (스플래시 layout 포함)
+        seed: 내용 생성용 난수 시드
+    """
+    modules: int = 1
+    sources: int = 50
+    locales: int = 2
+    asset_bytes: int = 256 * 1024
+    kts: bool = False
+    layouts: int = 5
+    seed: int = 0
+
+
+class GeneratedProject(NamedTuple):
+    """생성 결과 (ZIP과 교체용 입력 파일 경로)"""
+    zip_path: str
+    icon_path: Optional[str]
+    splash_path: Optional[str]
+    google_services_path: str
+    files: int
+    bytes: int
+
+
+def _gradle_name(kts: bool) -> str:
+    return 'build.gradle.kts' if kts else 'build.gradle'
+
+
+def _settings_gradle(spec: ProjectSpec, modules: List[str]) -> str:
+    includes = ', '.join(f'":{name}"' for name in ['app'] + modules)
+    if spec.kts:
+        return f'rootProject.name = "{OLD_APP_NAME}"\ninclude({includes})\n'
+    return f"rootProject.name = '{OLD_APP_NAME}'\ninclude {includes}\n"
+
+
+def _root_gradle(kts: bool) -> str:
+    if kts:
+        return ('plugins {\n'
+                '    id("com.android.application") version "8.2.0" apply false\n'
+                '    id("org.jetbrains.kotlin.android") version "1.9.20" apply false\n'
+                '    id("com.google.gms.google-services") version "4.4.0" apply false\n'
+                '}\n')
+    return ("plugins {\n"
+            "    id 'com.android.application' version '8.2.0' apply false\n"
+            "    id 'org.jetbrains.kotlin.android' version '1.9.20' apply false\n"
+            "    id 'com.google.gms.google-services' version '4.4.0' apply false\n"
+            "}\n")
+
+
+def _app_gradle(kts: bool, modules: List[str]) -> str:
+    if kts:
+        deps = ''.join(f'    implementation(project(":{name}"))\n' for name in modules)
+        return (
+            'plugins {\n    id("com.android.application")\n    id("org.jetbrains.kotlin.android")\n'
+            '    id("com.google.gms.google-services")\n}\n\n'
+            'android {\n'
+            f'    namespace = "{OLD_PACKAGE}"\n'
+            '    compileSdk = 34\n\n'
+            '    defaultConfig {\n'
+            f'        applicationId = "{OLD_PACKAGE}"\n'
+            '        minSdk = 24\n        targetSdk = 34\n'
+            '        versionCode = 137\n        versionName = "4.12.3"\n'
+            f'        buildConfigField("String", "BASE_URL", "\\"{OLD_BASE_URL}\\"")\n'
+            '    }\n'
+            '    buildFeatures {\n        buildConfig = true\n    }\n'
+            '}\n\n'
+            'dependencies {\n'
+            '    implementation("androidx.core:core-ktx:1.12.0")\n'
+            '    implementation("com.squareup.retrofit2:retrofit:2.9.0")\n'
+            f'{deps}'
+            '}\n'
+        )
+    deps = ''.join(f"    implementation project(':{name}')\n" for name in modules)
+    return (
+        "plugins {\n    id 'com.android.application'\n    id 'org.jetbrains.kotlin.android'\n"
+        "    id 'com.google.gms.google-services'\n}\n\n"
+        'android {\n'
+        f"    namespace '{OLD_PACKAGE}'\n"
+        '    compileSdk 34\n\n'
+        '    defaultConfig {\n'
+        f'        applicationId "{OLD_PACKAGE}"\n'
+        '        minSdk 24\n        targetSdk 34\n'
+        '        versionCode 137\n        versionName "4.12.3"\n'
+        f'        buildConfigField "String", "BASE_URL", "\\"{OLD_BASE_URL}\\""\n'
+        '    }\n'
+        '    buildFeatures {\n        buildConfig true\n    }\n'
+        '}\n\n'
+        'dependencies {\n'
+        "    implementation 'androidx.core:core-ktx:1.12.0'\n"
+        "    implementation 'com.squareup.retrofit2:retrofit:2.9.0'\n"
+        f'{deps}'
+        '}\n'
+    )
+
+
+def _library_gradle(kts: bool, package: str) -> str:
+    if kts:
+        return ('plugins {\n    id("com.android.library")\n    id("org.jetbrains.kotlin.android")\n}\n\n'
+                f'android {{\n    namespace = "{package}"\n    compileSdk = 34\n'
+                '    defaultConfig {\n        minSdk = 24\n    }\n}\n')
+    return ("plugins {\n    id 'com.android.library'\n    id 'org.jetbrains.kotlin.android'\n}\n\n"
+            f"android {{\n    namespace '{package}'\n    compileSdk 34\n"
+            '    defaultConfig {\n        minSdk 24\n    }\n}\n')
+
+
+def _manifest(package: Optional[str], application: bool) -> str:
+    package_attr = f' package="{package}"' if package else ''
+    if not application:
+        return f'<?xml version="1.0" encoding="utf-8"?>\n<manifest{package_attr} />\n'
+    return (
+        '<?xml version="1.0" encoding="utf-8"?>\n'
+        f'<manifest xmlns:android="http://schemas.android.com/apk/res/android"{package_attr}>\n'
+        '    <uses-permission android:name="android.permission.INTERNET" />\n'
+        '    <application\n'
+        '        android:name=".LegacyApplication"\n'
+        '        android:icon="@mipmap/ic_launcher"\n'
+        '        android:roundIcon="@mipmap/ic_launcher_round"\n'
+        '        android:label="@string/app_name"\n'
+        '        android:theme="@style/Theme.Legacy">\n'
+        f'        <activity android:name="{OLD_PACKAGE}.ui.SplashActivity" android:exported="true">\n'
+        '            <intent-filter>\n'
+        '                <action android:name="android.intent.action.MAIN" />\n'
+        '                <category android:name="android.intent.category.LAUNCHER" />\n'
+        '            </intent-filter>\n'
+        '        </activity>\n'
+        f'        <activity android:name="{OLD_PACKAGE}.ui.MainActivity" />\n'
+        '    </application>\n'
+        '</manifest>\n'
+    )
+
+
+def _strings(app_name: str, rng: random.Random, extra: int) -> str:
+    lines = ['<?xml version="1.0" encoding="utf-8"?>', '<resources>',
+             f'    <string name="app_name">{app_name}</string>']
+    for position in range(extra):
+        word = rng.choice(FEATURE_WORDS)
+        lines.append(f'    <string name="{word}_label_{position}">{word.title()} {position}</string>')
+    lines.append('</resources>')
+    return '\n'.join(lines) + '\n'
+
+
+def _kotlin_source(package: str, name: str, rng: random.Random, base_url: bool) -> str:
+    body = [f'package {package}', '', f'import {OLD_PACKAGE}.R', f'import {OLD_PACKAGE}.core.Logger', '']
+    if base_url:
+        body += ['object ApiConfig {', f'    const val BASE_URL = "{OLD_BASE_URL}"', '}', '']
+    body.append(f'class {name} {{')
+    for position in range(rng.randint(4, 16)):
+        body += [
+            f'    fun action{position}(input: String): String {{',
+            f'        Logger.log("{package}.{name}", input)',
+            f'        return input.reversed() + "{position}"',
+            '    }',
+        ]
+    body.append('}')
+    return '\n'.join(body) + '\n'
+
+
+def _java_source(package: str, name: str, rng: random.Random) -> str:
+    body = [f'package {package};', '', f'import {OLD_PACKAGE}.R;', '', f'public class {name} {{']
+    for position in range(rng.randint(4, 16)):
+        body += [
+            f'    public String action{position}(String input) {{',
+            f'        return "{package}" + input + {position};',
+            '    }',
+        ]
+    body.append('}')
+    return '\n'.join(body) + '\n'
+
+
+def _layout(position: int, splash: bool) -> str:
+    if splash:
+        return ('<?xml version="1.0" encoding="utf-8"?>\n'
+                '<FrameLayout xmlns:android="http://schemas.android.com/apk/res/android"\n'
+                '    android:layout_width="match_parent" android:layout_height="match_parent">\n'
+                '    <ImageView android:id="@+id/splash" android:src="@mipmap/splash_legacy"\n'
+                '        android:layout_width="wrap_content" android:layout_height="wrap_content" />\n'
+                '</FrameLayout>\n')
+    return ('<?xml version="1.0" encoding="utf-8"?>\n'
+            '<LinearLayout xmlns:android="http://schemas.android.com/apk/res/android"\n'
+            '    android:layout_width="match_parent" android:layout_height="match_parent">\n'
+            f'    <{OLD_PACKAGE}.ui.widget.Badge android:id="@+id/badge_{position}"\n'
+            '        android:layout_width="wrap_content" android:layout_height="wrap_content" />\n'
+            '</LinearLayout>\n')
+
+
+def _png(size: int, color) -> bytes:
+    buffer = io.BytesIO()
+    Image.new('RGBA', (size, size), color).save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+def _google_services(package: str) -> str:
+    return json.dumps({
+        'project_info': {'project_number': '123456789012', 'project_id': 'legacy-app'},
+        'client': [{
+            'client_info': {
+                'mobilesdk_app_id': '1:123456789012:android:abcdef',
+                'android_client_info': {'package_name': package},
+            },
+            'api_key': [{'current_key': 'AIzaSyDUMMYKEY'}],
+        }],
+        'configuration_version': '1',
+    }, indent=2) + '\n'
+
+
+def project_files(spec: ProjectSpec) -> Dict[str, bytes]:
+    """
+    스펙에 맞는 프로젝트 파일 내용 (ZIP 루트 폴더 기준 상대 경로 -> 바이트)
+
+    빌드 아티팩트(build/, .gradle/, .idea/)도 포함하므로 정리 단계도 실제처럼 동작합니다.
+    """
+    rng = random.Random(spec.seed)
+    files: Dict[str, bytes] = {}
+
+    def text(path: str, content: str) -> None:
+        files[path] = content.encode('utf-8')
+
+    gradle = _gradle_name(spec.kts)
+    modules = [f'feature-{FEATURE_WORDS[i % len(FEATURE_WORDS)]}{i // len(FEATURE_WORDS) or ""}'
+               for i in range(spec.modules)]
+    package_dir = OLD_PACKAGE.replace('.', '/')
+
+    text('settings' + gradle[len('build'):], _settings_gradle(spec, modules))
+    text(gradle, _root_gradle(spec.kts))
+    text('gradle.properties', 'org.gradle.jvmargs=-Xmx2048m\nandroid.useAndroidX=true\n')
+    text('local.properties', 'sdk.dir=/opt/android-sdk\n')
+    text('gradle/wrapper/gradle-wrapper.properties',
+         'distributionUrl=https\\://services.gradle.org/distributions/gradle-8.4-bin.zip\n')
+    files['gradle/wrapper/gradle-wrapper.jar'] = b'PK\x03\x04' + rng.randbytes(60 * 1024)
+    text('.idea/workspace.xml', '<project version="4" />\n')
+    text('.gradle/8.4/checksums/checksums.lock', '')
+
+    # app 모듈
+    text(f'app/{gradle}', _app_gradle(spec.kts, modules))
+    text('app/src/main/AndroidManifest.xml', _manifest(None, application=True))
+    text('app/google-services.json', _google_services(OLD_PACKAGE))
+    text('app/proguard-rules.pro', f'-keep class {OLD_PACKAGE}.** {{ *; }}\n')
+    text('app/build/intermediates/merged_manifest/AndroidManifest.xml', _manifest(OLD_PACKAGE, application=True))
+    files['app/build/outputs/apk/debug/app-debug.apk'] = rng.randbytes(128 * 1024)
+
+    res = 'app/src/main/res'
+    text(f'{res}/values/strings.xml', _strings(OLD_APP_NAME, rng, 20))
+    text(f'{res}/values/themes.xml', '<resources>\n    <style name="Theme.Legacy" parent="Theme.Material3.DayNight" />\n</resources>\n')
+    for locale in LOCALES[:spec.locales]:
+        text(f'{res}/values-{locale}/strings.xml', _strings(f'{OLD_APP_NAME} ({locale})', rng, 20))
+    for position in range(max(1, spec.layouts)):
+        name = 'activity_splash' if position == 0 else f'fragment_{FEATURE_WORDS[position % len(FEATURE_WORDS)]}_{position}'
+        text(f'{res}/layout/{name}.xml', _layout(position, splash=position == 0))
+    if PILLOW_AVAILABLE:
+        for density in DENSITIES:
+            size = LAUNCHER_SIZES[density]
+            files[f'{res}/mipmap-{density}/ic_launcher.png'] = _png(size, (200, 40, 40, 255))
+            files[f'{res}/mipmap-{density}/ic_launcher_round.png'] = _png(size, (200, 40, 40, 255))
+            files[f'{res}/mipmap-{density}/splash_legacy.png'] = _png(size * 2, (20, 20, 20, 255))
+
+    # 소스 파일: app과 모듈에 나눠 배치 (모듈 패키지는 기존 패키지의 하위 패키지)
+    owners = ['app'] + modules
+    for position in range(spec.sources):
+        owner = owners[position % len(owners)]
+        feature = FEATURE_WORDS[(position // len(owners)) % len(FEATURE_WORDS)]
+        package = f'{OLD_PACKAGE}.{feature}' if owner == 'app' else f'{OLD_PACKAGE}.{owner.replace("-", "")}.{feature}'
+        directory = f'{owner}/src/main/java/{package.replace(".", "/")}'
+        name = f'{feature.title()}Component{position}'
+        if position % 5 == 4:
+            text(f'{directory}/{name}.java', _java_source(package, name, rng))
+        else:
+            text(f'{directory}/{name}.kt', _kotlin_source(package, name, rng, base_url=position == 0))
+    text(f'app/src/main/java/{package_dir}/core/Logger.kt',
+         f'package {OLD_PACKAGE}.core\n\nobject Logger {{\n    fun log(tag: String, message: String) = println("$tag: $message")\n}}\n')
+
+    for owner in modules:
+        module_package = f'{OLD_PACKAGE}.{owner.replace("-", "")}'
+        text(f'{owner}/{gradle}', _library_gradle(spec.kts, module_package))
+        text(f'{owner}/src/main/AndroidManifest.xml', _manifest(None, application=False))
+        text(f'{owner}/src/main/res/values/strings.xml', _strings(owner, rng, 5))
+        files[f'{owner}/build/intermediates/classes.jar'] = b'PK\x03\x04' + rng.randbytes(16 * 1024)
+
+    # 바이너리 에셋 (압축이 거의 되지 않는 내용)
+    remaining = spec.asset_bytes
+    position = 0
+    while remaining > 0:
+        size = min(remaining, ASSET_CHUNK_BYTES)
+        files[f'app/src/main/assets/blob_{position}.bin'] = rng.randbytes(size)
+        remaining -= size
+        position += 1
+    return files
+
+
+def generate_project(spec: ProjectSpec, directory: str) -> GeneratedProject:
+    """
+    합성 프로젝트 ZIP과 교체용 입력 파일(아이콘, 스플래시, google-services.json) 생성
+
+    Args:
+        spec: 프로젝트 스펙
+        directory: 출력 디렉토리 (없으면 생성)
+
+    Returns:
+        GeneratedProject
+    """
+    out = Path(directory)
+    out.mkdir(parents=True, exist_ok=True)
+    files = project_files(spec)
+
+    zip_path = out / 'project.zip'
+    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
+        for rel in sorted(files):
+            # 고정 타임스탬프로 같은 스펙이면 같은 바이트의 ZIP
+            info = zipfile.ZipInfo(f'{ROOT_FOLDER}/{rel}', date_time=(2024, 1, 1, 0, 0, 0))
+            info.compress_type = zipfile.ZIP_DEFLATED
+            zipf.writestr(info, files[rel])
+
+    icon_path = splash_path = None
+    if PILLOW_AVAILABLE:
+        # 실제 업로드와 비슷한 크기의 원본 이미지 (그라데이션으로 압축 효율을 현실적으로)
+        icon = Image.linear_gradient('L').resize((1024, 1024)).convert('RGB')
+        icon_path = str(out / 'icon.png')
+        icon.save(icon_path, 'PNG')
+        splash = Image.merge('RGBA', [Image.linear_gradient('L').resize((1242, 1242))] * 4)
+        splash_path = str(out / 'splash.png')
+        splash.save(splash_path, 'PNG')
+
+    google_services_path = out / 'google-services.json'
+    google_services_path.write_text(_google_services(OLD_PACKAGE), encoding='utf-8')
+
+    return GeneratedProject(
+        str(zip_path),
+        icon_path,
+        splash_path,
+        str(google_services_path),
+        len(files),
+        sum(len(content) for content in files.values())
+    )
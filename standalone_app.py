@@ -5,6 +5,7 @@ Main entry point for PyWebView-based standalone app
 """
 
 import webview
+import multiprocessing
 import os
 import sys
 import base64
@@ -207,4 +208,6 @@ def main():
 
 
 if __name__ == '__main__':
+    # Let spawned rewrite-pool workers run in a frozen (PyInstaller) app without relaunching it
+    multiprocessing.freeze_support()
     main()
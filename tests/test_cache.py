@@ -0,0 +1,53 @@
+"""
+디스크 캐시 예산/정리 확인
+"""
+import os
+
+from backend.cache import ResultCache
+
+
+def _cache(tmp_path, max_bytes, monkeypatch):
+    cache = ResultCache(str(tmp_path / 'cache'), max_bytes=max_bytes, suffix='.bin')
+    scans = []
+    entries = cache._entries
+    monkeypatch.setattr(cache, '_entries', lambda: scans.append(1) or entries())
+    return cache, scans
+
+
+def test_store_scans_only_when_over_budget(tmp_path, monkeypatch):
+    cache, scans = _cache(tmp_path, 1000, monkeypatch)
+    for number in range(5):
+        assert cache.write(f'{number:064x}', b'x' * 100)
+    # 첫 저장에서 한 번 스캔한 뒤에는 예산 안이므로 다시 스캔하지 않음
+    assert len(scans) == 1
+    assert cache.evictions == 0
+
+
+def test_store_over_budget_evicts_least_recently_used(tmp_path, monkeypatch):
+    cache, scans = _cache(tmp_path, 250, monkeypatch)
+    keys = [f'{number:064x}' for number in range(3)]
+    for age, key in enumerate(keys):
+        cache.write(key, b'x' * 100)
+        os.utime(cache.entry_path(key), (age, age))
+    assert cache.evictions == 1
+    assert not cache.entry_path(keys[0]).exists()
+    assert cache.read(keys[1]) is not None and cache.read(keys[2]) is not None
+    assert cache.stats()['bytes'] <= 250
+
+
+def test_replacing_entry_does_not_inflate_estimate(tmp_path, monkeypatch):
+    cache, scans = _cache(tmp_path, 250, monkeypatch)
+    key = '0' * 64
+    for _ in range(10):
+        cache.write(key, b'x' * 100)
+    assert len(scans) == 1
+    assert cache.evictions == 0
+
+
+def test_entries_without_suffix(tmp_path):
+    cache = ResultCache(str(tmp_path / 'cache'), max_bytes=1000, suffix='')
+    key = 'ab' * 32
+    assert cache.write(key, b'webp')
+    assert cache.entry_path(key).name == key
+    assert cache.read(key) == b'webp'
+    assert cache.stats()['entries'] == 1
@@ -0,0 +1,113 @@
+"""
+증분 재적용 결과가 전체 빌드 결과와 같은지 확인
+"""
+import hashlib
+import zipfile
+
+import pytest
+
+from backend import processor as processor_module
+from backend.processor import AndroidProjectProcessor
+from benchmarks.synthetic import ProjectSpec, generate_project
+
+
+SPEC = ProjectSpec(modules=1, sources=12, locales=2, asset_bytes=16 * 1024, layouts=2)
+
+BASE_PARAMS = {
+    'new_package': 'com.brand.whitelabel',
+    'new_app_name': 'A',
+    'google_services_path': None,
+    'icon_path': None,
+    'splash_path': None,
+    'new_base_url': None,
+    'include_log': False,
+}
+
+# 이전 빌드 파라미터에 차례로 적용할 변경 (한 줄이 한 시나리오)
+SEQUENCES = {
+    'app_name_same_size': [{'new_app_name': 'B'}, {'new_app_name': 'C'}],
+    'base_url': [{'new_base_url': 'https://a.example.com/'}, {'new_base_url': 'https://b.example.com/'}],
+    'icon_then_app_name': [{'icon_path': 'icon'}, {'new_app_name': 'B'}],
+    'firebase': [{'google_services_path': 'google_services'}, {'new_app_name': 'B'}],
+    'package_change_rebuilds': [{'new_app_name': 'B'}, {'new_package': 'com.brand.other'}],
+}
+
+
+@pytest.fixture(scope='module')
+def project(tmp_path_factory):
+    return generate_project(SPEC, str(tmp_path_factory.mktemp('project')))
+
+
+def _contents(path):
+    with zipfile.ZipFile(path) as zipf:
+        return {name: hashlib.sha256(zipf.read(name)).hexdigest() for name in zipf.namelist()}
+
+
+def _resolve(params, project):
+    # 'icon', 'google_services'는 생성된 프로젝트의 입력 파일로 바꿈
+    files = {'icon': project.icon_path, 'google_services': project.google_services_path}
+    return {key: files.get(value, value) if isinstance(value, str) else value for key, value in params.items()}
+
+
+def _run_sequence(project, changes, tmp_path):
+    previous = None
+    params = dict(BASE_PARAMS)
+    for position, change in enumerate([{}] + changes):
+        params = dict(params, **change)
+        kwargs = _resolve(params, project)
+        if kwargs['icon_path'] is None and change.get('icon_path'):
+            pytest.skip('Pillow not installed')
+
+        incremental = AndroidProjectProcessor()
+        full = AndroidProjectProcessor()
+        try:
+            result = incremental.process(zip_path=project.zip_path, previous=previous, **kwargs)
+            assert result['success'], result.get('error')
+            if previous is not None and 'new_package' not in change:
+                assert 'incremental_steps' in result
+            expected = full.process(zip_path=project.zip_path, **kwargs)
+            assert expected['success'], expected.get('error')
+            assert _contents(result['output_zip']) == _contents(expected['output_zip']), (position, change)
+            previous = incremental.detach_build(str(tmp_path / f'build{position}'))
+        finally:
+            incremental.cleanup()
+            full.cleanup()
+    previous.cleanup()
+
+
+@pytest.mark.parametrize('name', sorted(SEQUENCES))
+def test_incremental_output_matches_full_build(project, tmp_path, name):
+    _run_sequence(project, SEQUENCES[name], tmp_path)
+
+
+@pytest.mark.parametrize('name', ['app_name_same_size', 'firebase'])
+def test_incremental_output_with_coarse_mtime(project, tmp_path, monkeypatch, name):
+    # 수정 시각 해상도가 낮은 파일 시스템: 크기가 같은 수정은 스냅샷으로 구분되지 않음
+    snapshot_files = processor_module.snapshot_files
+
+    def coarse_snapshot(index):
+        return {rel: state if state[0] == 'archive' else (state[0], 0)
+                for rel, state in snapshot_files(index).items()}
+
+    monkeypatch.setattr(processor_module, 'snapshot_files', coarse_snapshot)
+    _run_sequence(project, SEQUENCES[name], tmp_path)
+
+
+def test_unrelated_change_runs_no_text_step(project, tmp_path):
+    # include_log만 바뀌면 텍스트 치환 규칙이 없으므로 치환 단계는 번호 없이 실행됨
+    first = AndroidProjectProcessor()
+    second = AndroidProjectProcessor()
+    progress = []
+    second.progress_callback = lambda number, title: progress.append(number)
+    try:
+        assert first.process(zip_path=project.zip_path, **BASE_PARAMS)['success']
+        previous = first.detach_build(str(tmp_path / 'build'))
+        result = second.process(zip_path=project.zip_path, previous=previous, **dict(BASE_PARAMS, include_log=True))
+        assert result['incremental_steps'] == [11]
+        assert progress == [11]
+        logs = [str(line) for line in second.logs.lines()]
+        assert not any(line.startswith('[REWRITE]') for line in logs)
+    finally:
+        first.cleanup()
+        second.cleanup()
+    previous.cleanup()
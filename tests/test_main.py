@@ -0,0 +1,58 @@
+"""
+API 응답 헤더와 스트리밍 응답 정리 확인
+"""
+import asyncio
+from concurrent.futures import Future
+from types import SimpleNamespace
+
+import pytest
+
+from backend import main
+from backend.utils.zip_tools import ZipStream, ZipStreamClosed
+
+
+def _job(name):
+    return SimpleNamespace(id='job-1', method='process', params={'new_app_name': name}, future=Future())
+
+
+def test_content_disposition_ascii():
+    assert main.content_disposition('package_changed_App.zip') == 'attachment; filename="package_changed_App.zip"'
+
+
+def test_content_disposition_non_latin1():
+    header = main.content_disposition('package_changed_새한글앱.zip')
+    assert header == "attachment; filename*=utf-8''package_changed_%EC%83%88%ED%95%9C%EA%B8%80%EC%95%B1.zip"
+    header.encode('latin-1')
+
+
+def test_streaming_response_non_latin1_name():
+    response = main.JobStreamingResponse(_job('새한글앱'), ZipStream())
+    assert response.headers['content-disposition'].startswith("attachment; filename*=utf-8''")
+
+
+def test_streaming_response_send_failure_cancels_and_removes(monkeypatch):
+    removed = []
+    monkeypatch.setattr(main.job_manager, 'remove', removed.append)
+    job = _job('App')
+    output_stream = ZipStream()
+    output_stream.write(b'x' * 10)
+    output_stream.close()
+    response = main.JobStreamingResponse(job, output_stream)
+
+    async def receive():
+        await asyncio.sleep(3600)
+
+    async def send(message):
+        if message['type'] == 'http.response.body':
+            raise OSError('connection reset')
+
+    scope = {'type': 'http', 'asgi': {'version': '3.0', 'spec_version': '2.4'}, 'method': 'POST', 'headers': []}
+    with pytest.raises(Exception):
+        asyncio.run(response(scope, receive, send))
+
+    # 압축 스레드의 다음 기록은 실패하고, 작업이 끝나면 정리됨
+    with pytest.raises(ZipStreamClosed):
+        output_stream.write(b'y')
+    assert removed == []
+    job.future.set_result(job)
+    assert removed == ['job-1']
@@ -0,0 +1,20 @@
+"""
+프로세서 보조 함수 확인
+"""
+from backend.processor import _unique_variant_names
+
+
+def test_variant_names_never_collide():
+    names = _unique_variant_names([{'name': 'a'}, {'name': 'a'}, {'name': 'a_2'}])
+    assert len(set(names)) == 3
+    assert names[0] == 'a'
+
+
+def test_variant_names_are_sanitized():
+    names = _unique_variant_names([
+        {'name': '../evil/x y'},
+        {'new_app_name': '새한글앱'},
+        {},
+        {'name': 'brand.a-1'},
+    ])
+    assert names == ['evil_x_y', 'variant', 'variant_2', 'brand.a-1']
@@ -0,0 +1,155 @@
+"""
+LiteralMatcher 경계 조건, 스트리밍 치환, 치환 결과 조회 테스트
+"""
+import pytest
+
+from backend.utils import rewrite_plan
+from backend.utils.rewrite_plan import (
+    BOUNDARY_IDENTIFIER,
+    BOUNDARY_PATH,
+    LiteralMatcher,
+    _base_url_literals,
+    STEP_PACKAGE,
+    RewritePlan,
+    _match_stream,
+    bulk_package_rules,
+    package_rules,
+)
+from backend.utils.project_index import ProjectIndex
+
+
+OLD_PACKAGE = 'com.foo.app'
+NEW_PACKAGE = 'org.bar.newapp'
+OLD_URL = 'https://api.old.com'
+NEW_URL = 'https://n.io'
+
+
+def _matchers(literals):
+    """정규식 경로와 (설치되어 있으면) Aho-Corasick 경로의 매처"""
+    regex = LiteralMatcher(literals)
+    regex._automaton = None
+    matchers = [regex]
+    if rewrite_plan.AHOCORASICK_AVAILABLE:
+        matchers.append(LiteralMatcher(literals))
+    return matchers
+
+
+PACKAGE_LITERALS = [
+    (OLD_PACKAGE, NEW_PACKAGE, BOUNDARY_IDENTIFIER),
+    (OLD_PACKAGE.replace('.', '/'), NEW_PACKAGE.replace('.', '/'), BOUNDARY_PATH),
+]
+URL_LITERALS = _base_url_literals([OLD_URL], NEW_URL)
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('import com.foo.app.Main;', 'import org.bar.newapp.Main;'),
+    ('package com.foo.app', 'package org.bar.newapp'),
+    ('import com.foo.appextra.Main;', 'import com.foo.appextra.Main;'),
+    ('xcom.foo.app', 'xcom.foo.app'),
+    ('net.com.foo.app', 'net.com.foo.app'),
+    ('-keep class com/foo/app/**', '-keep class org/bar/newapp/**'),
+    ('(Lcom/foo/app/Main;)V', '(Lorg/bar/newapp/Main;)V'),
+    ('[Lcom/foo/app/Main;', '[Lorg/bar/newapp/Main;'),
+    ('XLcom/foo/app/Main;', 'XLcom/foo/app/Main;'),
+    ('net/com/foo/app/Main', 'net/com/foo/app/Main'),
+    ('com/foo/appextra/Main', 'com/foo/appextra/Main'),
+])
+def test_package_boundaries(text, expected):
+    for matcher in _matchers(PACKAGE_LITERALS):
+        assert matcher.sub(text) == expected
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('"https://api.old.com"', '"https://n.io"'),
+    ("'https://api.old.com'", "'https://n.io'"),
+    ('"https://api.old.com/v1/"', '"https://n.io/v1/"'),
+    ('https://api.old.com?key=1', 'https://n.io?key=1'),
+    ('https://api.old.com#top', 'https://n.io#top'),
+    ('<string name="url">https://api.old.com</string>', '<string name="url">https://n.io</string>'),
+    ('see https://api.old.com now', 'see https://n.io now'),
+    ('https://api.old.com', 'https://n.io'),
+    ('"https://api.old.community/"', '"https://api.old.community/"'),
+    ('"https://api.old.com.cdn.net/x"', '"https://api.old.com.cdn.net/x"'),
+    ('"https://api.old.com:8080/"', '"https://api.old.com:8080/"'),
+    ('"xhttps://api.old.com"', '"xhttps://api.old.com"'),
+])
+def test_url_boundaries(text, expected):
+    for matcher in _matchers(URL_LITERALS):
+        assert matcher.sub(text) == expected
+
+
+def test_url_with_trailing_slash_matches_as_prefix():
+    literals = _base_url_literals(['https://api.old.com/'], 'https://n.io/')
+    for matcher in _matchers(literals):
+        assert matcher.sub('"https://api.old.com/v1"') == '"https://n.io/v1"'
+
+
+def test_unchanged_url_is_not_a_literal():
+    assert _base_url_literals([NEW_URL], NEW_URL) == []
+    assert _base_url_literals([OLD_URL], None) == []
+
+
+def _stream(data: bytes, matcher: LiteralMatcher, chunk_size: int):
+    counter = [0]
+    chunks = (data[start:start + chunk_size] for start in range(0, len(data), chunk_size))
+    return b''.join(_match_stream(chunks, matcher, counter)), counter[0]
+
+
+STREAM_TEXT = (
+    'import com.foo.app.Main;\n'
+    'import com.foo.appextra.Other;\n'
+    '(Lcom/foo/app/Main;)V XLcom/foo/app/Main;\n'
+    'val a = "https://api.old.com/v1"\n'
+    'val b = "https://api.old.community/"\n'
+    'val c = "https://api.old.com.cdn.net/x"\n'
+    'val d = "https://api.old.com"\n'
+) * 3
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 7, 11, 19, 64, 1024])
+def test_stream_matches_in_memory_across_chunk_splits(chunk_size):
+    matcher = LiteralMatcher(PACKAGE_LITERALS + URL_LITERALS)
+    matcher._automaton = None
+    expected = matcher.sub(STREAM_TEXT).encode('utf-8')
+
+    output, count = _stream(STREAM_TEXT.encode('utf-8'), matcher, chunk_size)
+
+    assert output == expected
+    # 반복마다 패키지 1개 + JNI 시그니처 1개 + URL 2개
+    assert count == 4 * 3
+
+
+def test_stream_match_at_end_of_stream():
+    matcher = LiteralMatcher(URL_LITERALS)
+    output, count = _stream(b'x = https://api.old.com', matcher, 5)
+    assert output == b'x = https://n.io'
+    assert count == 1
+
+    output, count = _stream(b'x = https://api.old.comm', matcher, 5)
+    assert output == b'x = https://api.old.comm'
+    assert count == 0
+
+
+def test_result_paths_follow_directory_moves(tmp_path, monkeypatch):
+    source = tmp_path / 'app/src/main/java/com/foo/app'
+    source.mkdir(parents=True)
+    (source / 'Main.kt').write_text('package com.foo.app\n', encoding='utf-8')
+    (tmp_path / 'README.txt').write_text('no package here\n', encoding='utf-8')
+    index = ProjectIndex.build(tmp_path)
+
+    plan = RewritePlan(package_rules(OLD_PACKAGE, NEW_PACKAGE) + bulk_package_rules(OLD_PACKAGE, NEW_PACKAGE))
+    result = plan.apply(index)
+    old_rel = 'app/src/main/java/com/foo/app/Main.kt'
+    assert list(result.changes) == [old_rel]
+    assert result.changed_files(STEP_PACKAGE) == [index.path(old_rel)]
+
+    # 경로가 바뀌지 않으면 인덱스를 다시 순회하지 않음
+    with monkeypatch.context() as patch:
+        patch.setattr(index, 'records', lambda *args: pytest.fail('index walked again'))
+        assert list(result.changes) == [old_rel]
+        assert result.changed_files(STEP_PACKAGE) == [index.path(old_rel)]
+
+    index.move_tree(tmp_path / 'app/src/main/java/com/foo/app', tmp_path / 'app/src/main/java/org/bar/newapp')
+    new_rel = 'app/src/main/java/org/bar/newapp/Main.kt'
+    assert list(result.changes) == [new_rel]
+    assert result.changed_files(STEP_PACKAGE) == [index.path(new_rel)]
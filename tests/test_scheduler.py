@@ -0,0 +1,45 @@
+"""
+단계 스케줄러 확인
+"""
+import threading
+
+from backend.scheduler import Step, run_steps
+from backend.utils.project_index import ROLE_GRADLE, ROLE_TEXT
+
+
+def test_independent_steps_overlap():
+    # 두 단계가 동시에 실행되어야만 서로 기다림이 풀림
+    barrier = threading.Barrier(2, timeout=5)
+    steps = [
+        Step('rewrite', lambda logs: barrier.wait(), reads=ROLE_TEXT, writes=ROLE_TEXT),
+        Step('render', lambda logs: barrier.wait()),
+    ]
+    assert set(run_steps(steps, max_parallel=2)) == {'rewrite', 'render'}
+
+
+def test_depends_and_conflicts_keep_order():
+    order = []
+    steps = [
+        Step('rewrite', lambda logs: order.append('rewrite'), reads=ROLE_TEXT, writes=ROLE_TEXT),
+        Step('version', lambda logs: order.append('version'), reads=ROLE_GRADLE),
+        Step('package', lambda logs: order.append('package'), ('version',)),
+    ]
+    run_steps(steps, max_parallel=4)
+    assert order == ['rewrite', 'version', 'package']
+
+
+def test_logs_follow_declaration_order():
+    release = threading.Event()
+    seen = []
+
+    def slow(logs):
+        release.wait(5)
+        logs.append('first')
+
+    def fast(logs):
+        logs.append('second')
+        release.set()
+
+    run_steps([Step('slow', slow), Step('fast', fast)],
+              on_logs=lambda step, logs: seen.extend(logs), max_parallel=2)
+    assert seen == ['first', 'second']
@@ -0,0 +1,244 @@
+"""
+ZIP 보조 함수 확인 (원시 멤버 복사, 스트리밍 출력, 병렬 압축 해제)
+"""
+import io
+import os
+import struct
+import threading
+import warnings
+import zipfile
+import zlib
+
+import pytest
+
+from backend.utils import zip_tools
+from backend.utils.zip_tools import ZipStream, ZipStreamClosed, copy_raw_member, extract_zip
+
+
+class _Unseekable(io.RawIOBase):
+    """seek/tell이 없는 쓰기 스트림 (zipfile이 data descriptor 방식으로 기록)"""
+
+    def __init__(self):
+        self.buffer = io.BytesIO()
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        return self.buffer.write(data)
+
+
+MEMBERS = {
+    'stored.txt': (b'stored member\n' * 100, zipfile.ZIP_STORED),
+    'deflated.txt': (b'deflated member\n' * 1000, zipfile.ZIP_DEFLATED),
+    'random.bin': (os.urandom(64 * 1024), zipfile.ZIP_DEFLATED),
+    'empty.txt': (b'', zipfile.ZIP_DEFLATED),
+}
+
+
+def _source_zip(seekable: bool) -> bytes:
+    target = io.BytesIO() if seekable else _Unseekable()
+    with zipfile.ZipFile(target, 'w') as zipf:
+        for name, (data, compression) in MEMBERS.items():
+            zipf.writestr(name, data, compress_type=compression)
+    return (target if seekable else target.buffer).getvalue()
+
+
+@pytest.mark.parametrize('zip64', [False, True], ids=['zip32', 'zip64'])
+@pytest.mark.parametrize('source_seekable', [True, False], ids=['source', 'source_descriptor'])
+@pytest.mark.parametrize('output_seekable', [True, False], ids=['file', 'stream'])
+def test_copy_raw_member_round_trip(monkeypatch, zip64, source_seekable, output_seekable):
+    if zip64:
+        # 4GB 멤버를 만들지 않고 ZIP64 경로를 타도록 한계를 낮춤 (헤더/중앙 디렉토리 모두 이 값을 사용)
+        monkeypatch.setattr(zipfile, 'ZIP64_LIMIT', 1024)
+    source = _source_zip(source_seekable)
+    output = io.BytesIO() if output_seekable else _Unseekable()
+
+    with zipfile.ZipFile(io.BytesIO(source)) as src, zipfile.ZipFile(output, 'w') as dest:
+        dest.writestr('before.txt', b'written normally')
+        for info in src.infolist():
+            copy_raw_member(src.fp, info, dest, f"copied/{info.filename}")
+        dest.writestr('after.txt', b'written normally')
+
+    data = (output if output_seekable else output.buffer).getvalue()
+    with zipfile.ZipFile(io.BytesIO(data)) as result:
+        assert result.testzip() is None
+        assert result.namelist() == ['before.txt'] + [f"copied/{name}" for name in MEMBERS] + ['after.txt']
+        for name, (content, compression) in MEMBERS.items():
+            info = result.getinfo(f"copied/{name}")
+            assert info.compress_type == compression
+            assert info.CRC == zlib.crc32(content)
+            assert info.flag_bits & 0x08 == 0
+            assert result.read(info) == content
+            if zip64 and len(content) > zipfile.ZIP64_LIMIT:
+                # 로컬 헤더의 크기는 ZIP64 확장 필드로 기록됨
+                header = struct.unpack(zipfile.structFileHeader,
+                                       data[info.header_offset:info.header_offset + zipfile.sizeFileHeader])
+                assert header[zipfile._FH_UNCOMPRESSED_SIZE] == 0xFFFFFFFF
+        assert result.read('after.txt') == b'written normally'
+
+
+def _write_zip_in_thread(stream: ZipStream) -> threading.Thread:
+    def run():
+        try:
+            with zipfile.ZipFile(stream, 'w') as zipf:
+                for name, (data, compression) in MEMBERS.items():
+                    zipf.writestr(name, data, compress_type=compression)
+        except ZipStreamClosed:
+            return
+        finally:
+            stream.close()
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread
+
+
+def test_zip_stream_chunks_and_tee_match(tmp_path, monkeypatch):
+    monkeypatch.setattr(zip_tools, 'STREAM_CHUNK_SIZE', 1024)
+    stream = ZipStream(max_pending=2)
+    tee_path = tmp_path / 'tee.zip'
+    stream.tee(str(tee_path))
+    thread = _write_zip_in_thread(stream)
+    streamed = b''.join(stream.chunks())
+    thread.join(5)
+
+    assert stream.started.result() is True
+    assert streamed == tee_path.read_bytes()
+    assert len(streamed) == stream.bytes_written
+    with zipfile.ZipFile(io.BytesIO(streamed)) as result:
+        assert result.testzip() is None
+        assert {name: result.read(name) for name in result.namelist()} == {
+            name: data for name, (data, _) in MEMBERS.items()
+        }
+
+
+def test_zip_stream_close_with_error_fails_receiver():
+    stream = ZipStream()
+    stream.write(b'partial')
+    stream.close('Job failed')
+    with pytest.raises(ZipStreamClosed, match='Job failed'):
+        list(stream.chunks())
+
+
+def test_zip_stream_not_started_when_closed_empty():
+    stream = ZipStream()
+    stream.close('Job failed')
+    assert stream.started.result() is False
+
+
+def test_zip_stream_receiver_abort_cancels_writer(monkeypatch):
+    monkeypatch.setattr(zip_tools, 'STREAM_CHUNK_SIZE', 1024)
+    monkeypatch.setattr(zip_tools, 'STREAM_POLL_SECONDS', 0.01)
+    stream = ZipStream(max_pending=1)
+    thread = _write_zip_in_thread(stream)
+    chunks = stream.chunks()
+    next(chunks)
+    chunks.close()  # 끝까지 읽지 않고 중단 (클라이언트 연결 끊김)
+    thread.join(5)
+
+    assert not thread.is_alive()
+    with pytest.raises(ZipStreamClosed):
+        stream.write(b'more')
+
+
+def test_zip_stream_stalled_receiver_times_out(monkeypatch):
+    monkeypatch.setattr(zip_tools, 'STREAM_CHUNK_SIZE', 4)
+    monkeypatch.setattr(zip_tools, 'STREAM_POLL_SECONDS', 0.01)
+    monkeypatch.setattr(zip_tools, 'STREAM_STALL_TIMEOUT', 0.05)
+    stream = ZipStream(max_pending=1)
+    stream.write(b'1234')  # 큐를 채움
+    with pytest.raises(ZipStreamClosed, match='stalled'):
+        stream.write(b'5678')
+
+
+def _project_zip(path, extra=()) -> str:
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')  # 같은 이름의 멤버 (Duplicate name)
+        with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zipf:
+            zipf.writestr('proj/settings.gradle', "rootProject.name = 'p'\n")
+            for number in range(300):
+                zipf.writestr(f"proj/app/src/main/java/com/foo/F{number}.kt", f"class F{number}\n" * 20)
+            zipf.writestr('proj/dup.txt', 'first')
+            zipf.writestr('proj/dup.txt', 'second')
+            for name, data in extra:
+                zipf.writestr(name, data)
+    return str(path)
+
+
+def _tree(root):
+    return {
+        os.path.relpath(os.path.join(directory, name), root): open(os.path.join(directory, name), 'rb').read()
+        for directory, _, names in os.walk(root) for name in names
+    }
+
+
+@pytest.fixture
+def opened_zips(monkeypatch):
+    """이후 열리는 ZipFile 목록"""
+    opened = []
+
+    class RecordingZipFile(zipfile.ZipFile):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            opened.append(self)
+
+    monkeypatch.setattr(zipfile, 'ZipFile', RecordingZipFile)
+    return opened
+
+
+UNSAFE_MEMBERS = [
+    ('../escape.txt', 'outside'),
+    ('/absolute.txt', 'absolute'),
+    ('proj/../proj/./normalized.txt', 'normalized'),
+]
+
+
+def test_parallel_extraction_matches_serial_and_zipfile(tmp_path):
+    zip_path = _project_zip(tmp_path / 'p.zip', UNSAFE_MEMBERS)
+    trees = {}
+    for workers in (1, 4):
+        target = tmp_path / f"workers{workers}"
+        target.mkdir()
+        project_root, _ = extract_zip(zip_path, str(target), workers=workers)
+        assert project_root == str(target / 'proj')
+        trees[workers] = _tree(target)
+    reference = tmp_path / 'reference'
+    with zipfile.ZipFile(zip_path) as zipf:
+        zipf.extractall(reference)
+
+    assert trees[1] == trees[4] == _tree(reference)
+    assert trees[4]['proj/dup.txt'.replace('/', os.sep)] == b'second'
+    # 위험한 멤버 이름도 압축 해제 디렉토리 안에만 기록됨
+    assert not (tmp_path / 'escape.txt').exists()
+    assert trees[4]['escape.txt'] == b'outside'
+    assert trees[4]['absolute.txt'] == b'absolute'
+
+
+def test_parallel_extraction_closes_worker_handles(tmp_path, opened_zips):
+    zip_path = _project_zip(tmp_path / 'p.zip')
+    opened_zips.clear()
+    target = tmp_path / 'out'
+    target.mkdir()
+    extract_zip(zip_path, str(target), workers=4)
+
+    assert len(opened_zips) > 1  # 압축 해제 대상 목록 + 워커별 핸들
+    assert all(handle.fp is None for handle in opened_zips)
+
+
+def test_parallel_extraction_error_closes_handles(tmp_path, opened_zips):
+    zip_path = tmp_path / 'p.zip'
+    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_STORED) as zipf:
+        zipf.writestr('proj/settings.gradle', 'x')
+        for number in range(200):
+            zipf.writestr(f"proj/f{number}.txt", f"content {number:05d}")
+    # 마지막 멤버의 내용을 바꿔 CRC 오류를 만듦
+    data = bytearray(zip_path.read_bytes())
+    offset = data.rindex(b'content 00199')
+    data[offset:offset + 13] = b'CONTENT 00199'
+    zip_path.write_bytes(bytes(data))
+
+    target = tmp_path / 'out'
+    target.mkdir()
+    with pytest.raises(zipfile.BadZipFile):
+        extract_zip(str(zip_path), str(target), workers=4)
+    assert all(handle.fp is None for handle in opened_zips)